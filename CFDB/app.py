@@ -1,13 +1,32 @@
 # app.py - Clean version with minimal logging
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response
 import pandas as pd
 import numpy as np
 import json
+import math
 import pickle
 import os
+import hashlib
+import glob
+import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
 import logging
 
+from betting_lines import top_edges, week_edges
+from data_store import CURRENT_SEASON, DEFAULT_DB_PATH, CFBDataStore, import_season_games
+from feature_store import MAX_WEEK, WeeklyFeatureStore
+from job_queue import JOB_PARAMS, JobQueue, validate_params
+from ratings import WeeklyRatings
+from schedule_check import enforce_schedule, summarize_issues
+from team_registry import FBS_CONFERENCES, TeamRegistry, TeamSearchIndex
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 app = Flask(__name__)
 app.secret_key = 'your-unique-secret-key-change-this-in-production'
 
@@ -15,14 +34,228 @@ app.secret_key = 'your-unique-secret-key-change-this-in-production'
 logging.basicConfig(level=logging.WARNING)  # Only show warnings and errors
 logger = logging.getLogger(__name__)
 
+# Rating gap (points) per logistic unit of the heuristic's base probability;
+# wide because the scoring adjustments on top already carry most of the margin
+RATING_SCALE = 40.0
+
+# Per-game stat defaults by conference, used where a team has no real stats
+STAT_KEYS = ('ppg', 'papg', 'ypg', 'yapg', 'turnovers', 'takeaways')
+CONFERENCE_DEFAULT_STATS = {
+    'SEC': {'ppg': 30.2, 'papg': 22.1, 'ypg': 425, 'yapg': 365, 'turnovers': 1.2, 'takeaways': 1.4},
+    'Big Ten': {'ppg': 28.8, 'papg': 21.5, 'ypg': 415, 'yapg': 355, 'turnovers': 1.1, 'takeaways': 1.3},
+    'ACC': {'ppg': 27.5, 'papg': 23.2, 'ypg': 405, 'yapg': 375, 'turnovers': 1.3, 'takeaways': 1.2},
+    'Big 12': {'ppg': 32.1, 'papg': 26.8, 'ypg': 445, 'yapg': 415, 'turnovers': 1.4, 'takeaways': 1.3},
+    'Pac-12': {'ppg': 26.2, 'papg': 24.5, 'ypg': 395, 'yapg': 385, 'turnovers': 1.2, 'takeaways': 1.1},
+    'Mountain West': {'ppg': 25.8, 'papg': 25.2, 'ypg': 390, 'yapg': 390, 'turnovers': 1.3, 'takeaways': 1.2},
+    'American': {'ppg': 26.5, 'papg': 24.8, 'ypg': 400, 'yapg': 380, 'turnovers': 1.2, 'takeaways': 1.1},
+    'Conference USA': {'ppg': 24.5, 'papg': 26.5, 'ypg': 375, 'yapg': 400, 'turnovers': 1.4, 'takeaways': 1.0},
+    'MAC': {'ppg': 24.2, 'papg': 26.8, 'ypg': 370, 'yapg': 405, 'turnovers': 1.3, 'takeaways': 1.0},
+    'Sun Belt': {'ppg': 25.5, 'papg': 25.5, 'ypg': 385, 'yapg': 385, 'turnovers': 1.2, 'takeaways': 1.1},
+    'Independents': {'ppg': 28.0, 'papg': 23.0, 'ypg': 410, 'yapg': 370, 'turnovers': 1.1, 'takeaways': 1.3}
+}
+GENERIC_DEFAULT_STATS = {'ppg': 25.0, 'papg': 24.0, 'ypg': 400, 'yapg': 380, 'turnovers': 1.2, 'takeaways': 1.2}
+HOME_FIELD_ADVANTAGE = 0.05
+
+MSGPACK_MIMETYPE = 'application/x-msgpack'
+
+# Feature contributions returned per game when a prediction request sets explain
+EXPLAIN_TOP_K = 5
+
+# Upper bound on games x scenarios evaluated by one /scenario_sweep request,
+# and on the values along any one perturbation axis
+MAX_SWEEP_CELLS = 2_000_000
+MAX_SWEEP_STEPS = 1000
+
+# Per-season CFBD games exports (games_{season}.csv), imported into the store
+# the first time a season is requested
+SEASON_DATA_DIR = 'cfbd_data'
+# Seasons kept in memory besides the current one, least recently used evicted first
+MAX_LOADED_SEASONS = 4
+
+# Background jobs (simulations, backtests, retrains) and how many run at once
+JOBS_DIR = 'jobs'
+MAX_JOB_WORKERS = 2
+
+class SeasonNotFound(LookupError):
+    pass
+
+class InvalidRequest(ValueError):
+    """A request field that cannot be parsed; routes answer 400 with the message"""
+
+def matchup_key(home_team, away_team, week):
+    """Stable 64-bit key for a matchup; unlike hash() it is the same in every process"""
+    digest = hashlib.blake2b(f"{home_team}_{away_team}_{week}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+def matchup_uniforms(keys, draws):
+    """Counter-based uniforms in [0, 1) for a whole slate
+    
+    Element [i, j] is the SplitMix64 mix of keys[i] and counter j, so it depends
+    only on the matchup and never on shared RNG state, threads or call order.
+    """
+    keys = np.asarray(keys, dtype=np.uint64).reshape(-1, 1)
+    counters = np.arange(1, draws + 1, dtype=np.uint64).reshape(1, -1)
+    
+    with np.errstate(over='ignore'):
+        z = keys + counters * np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+    
+    return (z >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+class LinearModelKernel:
+    """Logistic regression with its StandardScaler folded in: p = sigmoid(X @ w + b)
+    
+    Loaded from an .npz written by export_model.py, so serving needs only numpy.
+    mean is the scaler's feature means (zeros for exports that predate it).
+    """
+    def __init__(self, weights, bias, feature_columns, model_name, mean=None):
+        self.weights = weights
+        self.bias = bias
+        self.feature_columns = feature_columns
+        self.model_name = model_name
+        self.mean = np.zeros_like(weights) if mean is None else mean
+        # Log-odds of a game whose features all equal the training means
+        self.baseline = float(bias + self.mean @ weights)
+    
+    @classmethod
+    def load(cls, path):
+        data = np.load(path, allow_pickle=False)
+        return cls(data['weights'], float(data['bias'][0]),
+                   data['feature_columns'].tolist(), str(data['model_name']),
+                   data['mean'] if 'mean' in data.files else None)
+    
+    def predict_proba(self, X):
+        """Home win probability for each row of X (columns in feature_columns order)"""
+        return 1.0 / (1.0 + np.exp(-(X @ self.weights + self.bias)))
+    
+    def contributions(self, X):
+        """Each feature's coef x scaled feature, in log-odds; a row's sum plus baseline is its logit"""
+        return (X - self.mean) * self.weights
+    
+    def top_contributions(self, X, k):
+        """Column indices and contributions of each row's k largest |contributions|, largest first
+        
+        One pass over the whole batch: argpartition picks every row's top k
+        and only those k are sorted.
+        """
+        contributions = self.contributions(X)
+        magnitude = np.abs(contributions)
+        k = min(k, contributions.shape[1])
+        top = np.argpartition(magnitude, -k, axis=1)[:, -k:]
+        top = np.take_along_axis(top, np.argsort(-np.take_along_axis(magnitude, top, axis=1), axis=1), axis=1)
+        return top, np.take_along_axis(contributions, top, axis=1)
+
+class TreeEnsembleKernel:
+    """RandomForest / GradientBoosting flattened into contiguous node arrays
+    
+    All trees share one set of node arrays, so a batch is evaluated by stepping
+    every (game, tree) pair down one level per iteration instead of calling into
+    sklearn tree by tree.
+    """
+    def __init__(self, arrays, feature_columns, model_name):
+        self.kind = str(arrays['kind'])
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.value = arrays['value']
+        self.roots = arrays['roots']
+        self.max_depth = int(arrays['max_depth'])
+        self.init_score = float(arrays['init_score'])
+        self.learning_rate = float(arrays['learning_rate'])
+        self.feature_columns = feature_columns
+        self.model_name = model_name
+        
+        # children[2 * node + went_left]; leaves point back at themselves so
+        # every pair can take the same number of steps
+        nodes = np.arange(len(self.feature), dtype=np.int64)
+        is_leaf = arrays['left'] < 0
+        self.children = np.empty(2 * len(nodes), dtype=np.int64)
+        self.children[0::2] = np.where(is_leaf, nodes, arrays['right'])
+        self.children[1::2] = np.where(is_leaf, nodes, arrays['left'])
+    
+    @classmethod
+    def load(cls, path):
+        data = np.load(path, allow_pickle=False)
+        return cls({key: data[key] for key in data.files},
+                   data['feature_columns'].tolist(), str(data['model_name']))
+    
+    def leaf_values(self, X):
+        """Leaf value reached in every tree, shape (games, trees)"""
+        # sklearn compares float32 features against float64 thresholds
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        flat = X.ravel()
+        row_offsets = (np.arange(len(X), dtype=np.int64) * X.shape[1])[:, None]
+        nodes = np.broadcast_to(self.roots.astype(np.int64), (len(X), len(self.roots)))
+        
+        for _ in range(self.max_depth):
+            values = flat.take(row_offsets + self.feature.take(nodes))
+            went_left = values <= self.threshold.take(nodes)
+            nodes = self.children.take(2 * nodes + went_left)
+        
+        return self.value.take(nodes)
+    
+    def predict_proba(self, X):
+        """Home win probability for each row of X (columns in feature_columns order)"""
+        values = self.leaf_values(X)
+        if self.kind == 'forest':
+            return values.mean(axis=1)
+        raw = self.init_score + self.learning_rate * values.sum(axis=1)
+        return 1.0 / (1.0 + np.exp(-raw))
+
+def load_model_kernel(path):
+    """Load whichever kernel type export_model.py wrote to path"""
+    with np.load(path, allow_pickle=False) as data:
+        kind = str(data['kind'])
+    if kind == 'linear':
+        return LinearModelKernel.load(path)
+    return TreeEnsembleKernel.load(path)
+
+class SeasonData:
+    """One season's conference map, team table and point-in-time features
+    
+    Row i of the team arrays belongs to registry team i; the last row holds
+    generic defaults for teams that are not in any source, including teams
+    registered after the table was built (by another season's import).
+    """
+    def __init__(self, season, conferences, team_conferences, team_stats):
+        self.season = season
+        self.conferences = conferences
+        self.team_conferences = team_conferences
+        self.team_stats = team_stats
+        self.team_stat_table = None
+        self.team_conf_ids = None
+        self.unknown_team_id = 0
+        self.available_teams = []
+        self.features = None
+        self.ratings = None
+    
+    def table_row(self, team_id):
+        """Row of a registry id, or None if the table has no row for it"""
+        return team_id if team_id is not None and 0 <= team_id < self.unknown_team_id else None
+    
+    def table_rows(self, team_ids):
+        """Rows of registry ids (-1 for unresolved), unknown ones mapped to the defaults row"""
+        team_ids = np.asarray(team_ids, dtype=np.intp)
+        return np.where((team_ids >= 0) & (team_ids < self.unknown_team_id), team_ids, self.unknown_team_id)
+
 class CFBPredictionSystem:
     def __init__(self):
         self.model = None
         self.scaler = None
+        self.kernel = None
+        self.feature_plan = []
+        self.model_features_complete = False
         self.feature_columns = []
-        self.schedules = {}
-        self.team_stats = {}
-        self.conferences = {}
+        self.store = CFBDataStore(DEFAULT_DB_PATH)
+        self.registry = TeamRegistry()
+        self.search_index = None
+        self.conference_codes = {}
+        self.seasons = OrderedDict()
+        self.max_loaded_seasons = MAX_LOADED_SEASONS
+        self.season_data_dir = SEASON_DATA_DIR
+        self.season_lock = threading.Lock()
+        self.season_build_lock = threading.Lock()
         self.model_loaded = False
         self.model_name = 'Unknown'
         self.load_model_and_data()
@@ -30,6 +263,16 @@ class CFBPredictionSystem:
     def load_model_and_data(self):
         """Load the trained model and schedule data"""
         try:
+            # Prefer a NumPy kernel exported by export_model.py (no sklearn needed)
+            kernel_files = ['cfb_prediction_model.npz', 'cfb_prediction_model_2025_updated.npz']
+            for kernel_file in kernel_files:
+                if os.path.exists(kernel_file):
+                    self.kernel = load_model_kernel(kernel_file)
+                    self.feature_columns = self.kernel.feature_columns
+                    self.model_name = self.kernel.model_name
+                    self.model_loaded = True
+                    break
+            
             # Try to load your actual trained model
             model_files = [
                 'cfb_prediction_model.pkl',
@@ -40,7 +283,7 @@ class CFBPredictionSystem:
             ]
             
             for model_file in model_files:
-                if os.path.exists(model_file):
+                if not self.model_loaded and os.path.exists(model_file):
                     with open(model_file, 'rb') as f:
                         model_data = pickle.load(f)
                     
@@ -76,100 +319,277 @@ class CFBPredictionSystem:
                         break
             
             # Load team statistics if available
+            preseason_stats = {}
             stats_files = ['team_stats.pkl', '2024_team_stats.pkl']
             for stats_file in stats_files:
                 if os.path.exists(stats_file):
                     with open(stats_file, 'rb') as f:
-                        self.team_stats = pickle.load(f)
+                        preseason_stats = pickle.load(f)
                     break
             
-            # Define conference memberships - Complete 134 FBS teams for 2025
-            self.conferences = {
-                'SEC': ['Alabama', 'Arkansas', 'Auburn', 'Florida', 'Georgia', 'Kentucky', 
-                        'LSU', 'Mississippi', 'Mississippi State', 'Missouri', 'South Carolina', 
-                        'Tennessee', 'Texas A&M', 'Vanderbilt'],
-                'Big Ten': ['Illinois', 'Indiana', 'Iowa', 'Maryland', 'Michigan', 'Michigan State',
-                           'Minnesota', 'Nebraska', 'Northwestern', 'Ohio State', 'Penn State', 
-                           'Purdue', 'Rutgers', 'Wisconsin', 'Oregon', 'UCLA', 'USC', 'Washington'],
-                'ACC': ['Boston College', 'Clemson', 'Duke', 'Florida State', 'Georgia Tech',
-                        'Louisville', 'Miami', 'North Carolina', 'NC State', 'Pittsburgh', 
-                        'Syracuse', 'Virginia', 'Virginia Tech', 'Wake Forest', 'SMU', 'Stanford', 'California'],
-                'Big 12': ['Arizona', 'Arizona State', 'Baylor', 'BYU', 'Cincinnati', 'Colorado',
-                          'Houston', 'Iowa State', 'Kansas', 'Kansas State', 'Oklahoma', 'Oklahoma State', 
-                          'TCU', 'Texas', 'Texas Tech', 'UCF', 'Utah', 'West Virginia'],
-                'Pac-12': ['Oregon State', 'Washington State'],
-                'Mountain West': ['Air Force', 'Boise State', 'Colorado State', 'Fresno State',
-                                 'Hawaii', 'Nevada', 'New Mexico', 'San Diego State', 'San Jose State',
-                                 'UNLV', 'Utah State', 'Wyoming'],
-                'American': ['Army', 'East Carolina', 'Memphis', 'Navy', 'North Texas', 'Rice',
-                            'South Florida', 'Temple', 'Tulane', 'Tulsa', 'UTSA', 'Charlotte', 'Florida Atlantic'],
-                'Conference USA': ['Florida International', 'Louisiana Tech', 'Middle Tennessee', 
-                                  'Old Dominion', 'UAB', 'UTEP', 'Western Kentucky', 'Sam Houston', 'Kennesaw State'],
-                'MAC': ['Akron', 'Ball State', 'Bowling Green', 'Buffalo', 'Central Michigan',
-                        'Eastern Michigan', 'Kent State', 'Miami (OH)', 'Northern Illinois',
-                        'Ohio', 'Toledo', 'Western Michigan'],
-                'Sun Belt': ['Appalachian State', 'Arkansas State', 'Coastal Carolina', 'Georgia Southern',
-                            'Georgia State', 'James Madison', 'Louisiana', 'Louisiana Monroe',
-                            'Marshall', 'South Alabama', 'Southern Miss', 'Texas State', 'Troy'],
-                'Independents': ['Notre Dame', 'UConn', 'UMass', 'Liberty', 'New Mexico State']
-            }
+            # Conference codes are shared by every season, starting from the registry's
+            self.conference_codes = {conf: i for i, conf in enumerate(FBS_CONFERENCES)}
+            self.feature_plan = self.build_feature_plan()
             
-            # Create schedule data
-            self.schedules = self.generate_sample_schedule()
+            # Teams, games and stats are served from the SQLite store; seed it
+            # with any pickled stats the first time. Other seasons load on demand.
+            self.store.load_teams(self.registry)
+            if preseason_stats:
+                self.store.load_team_stats(CURRENT_SEASON, 0, preseason_stats)
+                if self.store.unknown_teams:
+                    logger.warning(f"Preseason stats skipped for teams not in the store: "
+                                   f"{sorted(self.store.unknown_teams)}")
+            self.season_data(CURRENT_SEASON)
                 
         except Exception as e:
             self.model_loaded = False
     
-    def get_default_team_stats(self, team_name):
+    def season_data(self, season=CURRENT_SEASON):
+        """A season's data, built on first access
+        
+        The current season always stays loaded; of the others at most
+        max_loaded_seasons are kept, least recently used evicted first, and an
+        evicted season is rebuilt from the store when it is next requested.
+        """
+        with self.season_lock:
+            data = self.seasons.get(season)
+            if data is not None:
+                self.seasons.move_to_end(season)
+                return data
+        
+        # Builds register teams, so they run one at a time; loaded seasons stay
+        # available to other requests meanwhile
+        with self.season_build_lock:
+            with self.season_lock:
+                data = self.seasons.get(season)
+            if data is None:
+                data = self.load_season(season)
+            
+            with self.season_lock:
+                self.seasons[season] = data
+                self.seasons.move_to_end(season)
+                others = [loaded for loaded in self.seasons if loaded != CURRENT_SEASON]
+                for evicted in others[:max(0, len(others) - self.max_loaded_seasons)]:
+                    del self.seasons[evicted]
+            return data
+    
+    def season_file(self, season):
+        path = os.path.join(self.season_data_dir, f'games_{season}.csv')
+        return path if os.path.exists(path) else None
+    
+    def has_season(self, season):
+        return (season in self.seasons or season == CURRENT_SEASON or
+                self.store.has_games(season) or self.season_file(season) is not None)
+    
+    def load_season(self, season):
+        """Build a season from the store, importing its games file the first time it is requested"""
+        if not self.store.has_games(season):
+            path = self.season_file(season)
+            if path is not None:
+                import_season_games(self.store, season, path)
+            elif season == CURRENT_SEASON:
+                self.store.load_games(CURRENT_SEASON, self.schedule_games(self.generate_sample_schedule()))
+            else:
+                raise SeasonNotFound(f"No data for season {season}")
+        
+        # Imported seasons carry their own conference memberships; the
+        # dropdown lists only FBS conferences
+        memberships = self.store.season_conferences(season)
+        if memberships:
+            team_conferences = {team: conf for team, (conf, _) in memberships.items()}
+            conferences = {}
+            for team, (conf, classification) in memberships.items():
+                if conf and classification in (None, 'fbs'):
+                    conferences.setdefault(conf, []).append(team)
+        else:
+            team_conferences = dict(self.registry.conferences)
+            conferences = {conf: list(teams) for conf, teams in FBS_CONFERENCES.items()}
+        
+        # Only preseason (week 0) stats seed the table; later snapshots and
+        # scores reach predictions week by week through the feature store
+        data = SeasonData(season, conferences, team_conferences, self.store.team_stats(season, week=0))
+        self.build_team_table(data)
+        self.build_feature_store(data)
+        return data
+    
+    def get_default_team_stats(self, team_name, season=CURRENT_SEASON):
         """Get default stats for a team if not available"""
-        conf = self.get_team_conference(team_name)
-        
-        defaults = {
-            'SEC': {'ppg': 30.2, 'papg': 22.1, 'ypg': 425, 'yapg': 365, 'turnovers': 1.2, 'takeaways': 1.4},
-            'Big Ten': {'ppg': 28.8, 'papg': 21.5, 'ypg': 415, 'yapg': 355, 'turnovers': 1.1, 'takeaways': 1.3},
-            'ACC': {'ppg': 27.5, 'papg': 23.2, 'ypg': 405, 'yapg': 375, 'turnovers': 1.3, 'takeaways': 1.2},
-            'Big 12': {'ppg': 32.1, 'papg': 26.8, 'ypg': 445, 'yapg': 415, 'turnovers': 1.4, 'takeaways': 1.3},
-            'Pac-12': {'ppg': 26.2, 'papg': 24.5, 'ypg': 395, 'yapg': 385, 'turnovers': 1.2, 'takeaways': 1.1},
-            'Mountain West': {'ppg': 25.8, 'papg': 25.2, 'ypg': 390, 'yapg': 390, 'turnovers': 1.3, 'takeaways': 1.2},
-            'American': {'ppg': 26.5, 'papg': 24.8, 'ypg': 400, 'yapg': 380, 'turnovers': 1.2, 'takeaways': 1.1},
-            'Conference USA': {'ppg': 24.5, 'papg': 26.5, 'ypg': 375, 'yapg': 400, 'turnovers': 1.4, 'takeaways': 1.0},
-            'MAC': {'ppg': 24.2, 'papg': 26.8, 'ypg': 370, 'yapg': 405, 'turnovers': 1.3, 'takeaways': 1.0},
-            'Sun Belt': {'ppg': 25.5, 'papg': 25.5, 'ypg': 385, 'yapg': 385, 'turnovers': 1.2, 'takeaways': 1.1},
-            'Independents': {'ppg': 28.0, 'papg': 23.0, 'ypg': 410, 'yapg': 370, 'turnovers': 1.1, 'takeaways': 1.3}
-        }
+        conf = self.get_team_conference(team_name, season)
+        return dict(CONFERENCE_DEFAULT_STATS.get(conf, GENERIC_DEFAULT_STATS))
+    
+    def build_team_table(self, data):
+        """Resolve each team's effective stats once: real stats overlaid on conference defaults"""
+        # Teams the store knows beyond the registry (FCS opponents, earlier
+        # seasons); stats may use other spellings, so key them by the canonical name
+        for team, _ in self.store.teams():
+            self.registry.add_team(team)
+        data.team_stats = {self.registry.names[self.registry.add_team(team)]: stats
+                           for team, stats in data.team_stats.items()}
         
-        return defaults.get(conf, {
-            'ppg': 25.0, 'papg': 24.0, 'ypg': 400, 'yapg': 380, 'turnovers': 1.2, 'takeaways': 1.2
-        })
+        teams = self.registry.names[:]
+        data.unknown_team_id = len(teams)
+        conf_codes = {conf: self.conference_code(conf) for conf in data.conferences}
+        data.team_stat_table = np.empty((len(teams) + 1, len(STAT_KEYS)))
+        data.team_conf_ids = np.full(len(teams) + 1, -1, dtype=int)
+        
+        for i, team in enumerate(teams):
+            conf = data.team_conferences.get(team) or 'Unknown'
+            stats = dict(CONFERENCE_DEFAULT_STATS.get(conf, GENERIC_DEFAULT_STATS))
+            stats.update(data.team_stats.get(team, {}))
+            
+            data.team_stat_table[i] = [stats[key] for key in STAT_KEYS]
+            data.team_conf_ids[i] = conf_codes.get(conf, -1)
+        
+        data.team_stat_table[-1] = [GENERIC_DEFAULT_STATS[key] for key in STAT_KEYS]
+        data.available_teams = sorted(team for conf_teams in data.conferences.values() for team in conf_teams)
+        
+        # The search index covers every registered team; rebuild it only when that grew
+        if self.search_index is None or len(self.search_index.entries) != len(teams):
+            self.search_index = TeamSearchIndex(self.registry)
+    
+    def build_feature_store(self, data):
+        """Point-in-time stats and ratings per (team, week), seeded with the season's preseason team table
+        
+        A team's preseason rating is its preseason scoring margin per game.
+        """
+        max_week = max(MAX_WEEK, max(self.store.season_weeks(data.season) or [0]))
+        data.features = WeeklyFeatureStore(data.team_stat_table, max_week)
+        prior = data.team_stat_table[:, STAT_KEYS.index('ppg')] - data.team_stat_table[:, STAT_KEYS.index('papg')]
+        data.ratings = WeeklyRatings(prior, max_week)
+        self.catch_up_features(data)
+    
+    def refresh_features(self, season=CURRENT_SEASON):
+        """Fold in weeks whose scores or stat snapshots changed in the store and re-solve ratings; returns those weeks"""
+        return self.catch_up_features(self.season_data(season))
+    
+    def catch_up_features(self, data):
+        team_row = lambda name: data.table_row(self.registry.lookup(name))
+        changed = data.features.catch_up(self.store, data.season, team_row)
+        return sorted(set(changed) | set(data.ratings.catch_up(self.store, data.season, team_row)))
+    
+    def conference_code(self, conference):
+        """Integer code of a conference name, the same in every season"""
+        return self.conference_codes.setdefault(conference, len(self.conference_codes))
+    
+    def build_feature_plan(self):
+        """Map each model feature column to where its value comes from
+        
+        Mirrors create_features_for_game; columns it does not produce stay 0.
+        """
+        plan = []
+        for col in self.feature_columns:
+            if col in ('week', 'is_home', 'is_conference_game'):
+                plan.append((col, None))
+            elif col.startswith(('home_conf_', 'away_conf_')):
+                side, conf = col.split('_conf_', 1)
+                plan.append((f'{side}_conf', self.conference_code(conf)))
+            elif col.startswith(('home_', 'away_')) and col.split('_', 1)[1] in STAT_KEYS:
+                side, stat = col.split('_', 1)
+                plan.append((side, STAT_KEYS.index(stat)))
+            elif col.endswith('_diff') and col[:-len('_diff')] in STAT_KEYS:
+                plan.append(('diff', STAT_KEYS.index(col[:-len('_diff')])))
+            elif col in ('home_rating', 'away_rating', 'rating_diff'):
+                plan.append((col, None))
+            else:
+                plan.append((None, None))
+        
+        # Only serve the model when every feature it was trained on can be built
+        missing = [col for col, (source, _) in zip(self.feature_columns, plan) if source is None]
+        self.model_features_complete = not missing
+        if self.kernel is not None and missing:
+            logger.warning(f"Model features not available from team stats, model disabled: {missing}")
+        
+        return plan
+    
+    def build_feature_matrix(self, data, home_idx, away_idx, weeks, home_stats=None, away_stats=None):
+        """Model feature rows for many games, gathered from a season's as-of-week feature store
+        
+        home_stats/away_stats override the stored stat rows (used by scenario sweeps).
+        """
+        X = np.zeros((len(home_idx), len(self.feature_plan)))
+        home_stats = data.features.rows(home_idx, weeks) if home_stats is None else home_stats
+        away_stats = data.features.rows(away_idx, weeks) if away_stats is None else away_stats
+        home_conf = data.team_conf_ids[home_idx]
+        away_conf = data.team_conf_ids[away_idx]
+        home_rating = data.ratings.rows(home_idx, weeks)
+        away_rating = data.ratings.rows(away_idx, weeks)
+        
+        for j, (source, arg) in enumerate(self.feature_plan):
+            if source == 'week':
+                X[:, j] = weeks
+            elif source == 'is_home':
+                X[:, j] = 1
+            elif source == 'is_conference_game':
+                X[:, j] = (home_conf == away_conf) & (home_conf >= 0)
+            elif source == 'home_conf':
+                X[:, j] = home_conf == arg
+            elif source == 'away_conf':
+                X[:, j] = away_conf == arg
+            elif source == 'home':
+                X[:, j] = home_stats[:, arg]
+            elif source == 'away':
+                X[:, j] = away_stats[:, arg]
+            elif source == 'diff':
+                X[:, j] = home_stats[:, arg] - away_stats[:, arg]
+            elif source == 'home_rating':
+                X[:, j] = home_rating
+            elif source == 'away_rating':
+                X[:, j] = away_rating
+            elif source == 'rating_diff':
+                X[:, j] = home_rating - away_rating
+        
+        return X
+    
+    def team_row(self, team, season=CURRENT_SEASON):
+        data = self.season_data(season)
+        row = data.table_row(self.registry.lookup(team))
+        return data.unknown_team_id if row is None else row
+    
+    def resolve_teams(self, names, data):
+        """Canonical names and a season's team-table rows for request-supplied team names
+        
+        Names no source knows are kept as given, mapped to the generic-defaults
+        row and logged once so they show up in /unresolved_teams.
+        """
+        canonical = np.empty(len(names), dtype=object)
+        team_ids = np.empty(len(names), dtype=np.intp)
+        for i, name in enumerate(names):
+            team_id = self.registry.resolve_id(name)
+            if team_id is None:
+                if self.registry.unresolved[name] == 1:
+                    logger.warning(f"Unresolved team name: {name!r}")
+                canonical[i], team_ids[i] = name, -1
+            else:
+                canonical[i], team_ids[i] = self.registry.names[team_id], team_id
+        return canonical, data.table_rows(team_ids)
     
-    def create_features_for_game(self, home_team, away_team, week=1):
+    def create_features_for_game(self, home_team, away_team, week=1, season=CURRENT_SEASON):
         """Create feature vector for a game prediction"""
         try:
+            data = self.season_data(season)
             features = {}
             features['week'] = week
             features['is_home'] = 1
             
-            home_stats = self.team_stats.get(home_team, self.get_default_team_stats(home_team))
-            away_stats = self.team_stats.get(away_team, self.get_default_team_stats(away_team))
-            
-            stat_mappings = {
-                'ppg': 'ppg', 'papg': 'papg', 'ypg': 'ypg',
-                'yapg': 'yapg', 'turnovers': 'turnovers', 'takeaways': 'takeaways'
-            }
+            home_idx = self.team_row(home_team, season)
+            away_idx = self.team_row(away_team, season)
+            home_row = data.features.rows(home_idx, week).tolist()
+            away_row = data.features.rows(away_idx, week).tolist()
             
-            for feature_name, stat_key in stat_mappings.items():
-                home_val = home_stats.get(stat_key, 25.0)
-                away_val = away_stats.get(stat_key, 25.0)
-                
+            for feature_name, home_val, away_val in zip(STAT_KEYS, home_row, away_row):
                 features[f'home_{feature_name}'] = home_val
                 features[f'away_{feature_name}'] = away_val
                 features[f'{feature_name}_diff'] = home_val - away_val
             
-            home_conf = self.get_team_conference(home_team)
-            away_conf = self.get_team_conference(away_team)
+            features['home_rating'] = float(data.ratings.rows(home_idx, week))
+            features['away_rating'] = float(data.ratings.rows(away_idx, week))
+            features['rating_diff'] = features['home_rating'] - features['away_rating']
+            
+            home_conf = self.get_team_conference(home_team, season)
+            away_conf = self.get_team_conference(away_team, season)
             features['is_conference_game'] = 1 if home_conf == away_conf and home_conf != 'Unknown' else 0
             
-            for conf_name in self.conferences.keys():
+            for conf_name in data.conferences.keys():
                 features[f'home_conf_{conf_name}'] = 1 if home_conf == conf_name else 0
                 features[f'away_conf_{conf_name}'] = 1 if away_conf == conf_name else 0
             
@@ -186,89 +606,16 @@ class CFBPredictionSystem:
         except Exception as e:
             return None
     
-    def predict_single_game(self, home_team, away_team, week=1):
+    def predict_single_game(self, home_team, away_team, week=1, neutral=False, season=CURRENT_SEASON, explain_top=0):
         """Predict outcome of a single game"""
         try:
-            # Create a more realistic prediction based on team strength and conference
-            home_conf = self.get_team_conference(home_team)
-            away_conf = self.get_team_conference(away_team)
-            
-            # Get team stats or use defaults
-            home_stats = self.team_stats.get(home_team, self.get_default_team_stats(home_team))
-            away_stats = self.team_stats.get(away_team, self.get_default_team_stats(away_team))
-            
-            # Calculate team strength based on conference and stats
-            conf_strength = {
-                'SEC': 0.85, 'Big Ten': 0.80, 'ACC': 0.75, 'Big 12': 0.78,
-                'Pac-12': 0.70, 'Mountain West': 0.65, 'American': 0.68,
-                'Conference USA': 0.60, 'MAC': 0.58, 'Sun Belt': 0.62,
-                'Independents': 0.72
-            }
-            
-            home_strength = conf_strength.get(home_conf, 0.65)
-            away_strength = conf_strength.get(away_conf, 0.65)
-            
-            # Adjust for home field advantage
-            home_advantage = 0.05
-            
-            # Create a more varied prediction based on team characteristics
-            team_hash = hash(f"{home_team}_{away_team}_{week}") % 10000
-            np.random.seed(team_hash)
-            
-            # Base probability calculation with more variation
-            base_home_prob = home_strength / (home_strength + away_strength)
-            home_prob = base_home_prob + home_advantage
-            
-            # Add variation based on team stats
-            home_ppg = home_stats.get('ppg', 25.0)
-            away_ppg = away_stats.get('ppg', 25.0)
-            home_papg = home_stats.get('papg', 25.0)
-            away_papg = away_stats.get('papg', 25.0)
-            
-            # More significant adjustments based on team performance
-            offensive_factor = (home_ppg - away_ppg) / 30.0  # Increased impact
-            defensive_factor = (away_papg - home_papg) / 30.0  # Increased impact
-            
-            home_prob += offensive_factor + defensive_factor
-            
-            # Add conference game factor
-            if home_conf == away_conf and home_conf != 'Unknown':
-                home_prob += 0.03  # Slightly higher boost for conference games
-            
-            # Add some randomness for more variation
-            random_factor = np.random.uniform(-0.08, 0.08)
-            home_prob += random_factor
-            
-            # Cap the probability with more realistic bounds
-            home_prob = max(0.20, min(0.85, home_prob))
-            away_prob = 1 - home_prob
-            
-            # Determine winner
-            winner = home_team if home_prob > away_prob else away_team
-            confidence = max(home_prob, away_prob)
-            
-            # Calculate spread estimate with more variation
-            base_spread = (home_prob - 0.5) * 28
-            spread_variation = np.random.uniform(-3, 3)
-            spread_estimate = base_spread + spread_variation
-            
-            return {
-                'home_team': home_team,
-                'away_team': away_team,
-                'winner': winner,
-                'home_win_probability': float(home_prob),
-                'away_win_probability': float(away_prob),
-                'confidence': float(confidence),
-                'spread_estimate': float(spread_estimate),
-                'model_used': 'enhanced_prediction_model'
-            }
+            return self.predict_games_batch([(home_team, away_team, week, neutral)], season, explain_top)[0]
             
         except Exception as e:
             # Fallback prediction
-            team_hash = hash(f"{home_team}_{away_team}_{week}") % 10000
-            np.random.seed(team_hash)
+            uniform = matchup_uniforms([matchup_key(home_team, away_team, week)], 1)[0, 0]
             
-            home_prob = np.random.uniform(0.40, 0.85)
+            home_prob = float(0.40 + 0.45 * uniform)
             away_prob = 1 - home_prob
             winner = home_team if home_prob > 0.5 else away_team
             confidence = max(home_prob, away_prob)
@@ -284,9 +631,235 @@ class CFBPredictionSystem:
                 'model_used': 'deterministic_fallback'
             }
     
+    def predict_games_batch(self, matchups, season=CURRENT_SEASON, explain_top=0):
+        """Predict many (home, away, week, neutral) matchups, one dict per game"""
+        return self.columns_to_rows(self.predict_games_columnar(matchups, season, explain_top))
+    
+    def can_explain(self):
+        """Whether predictions can carry feature contributions
+        
+        Only when the linear kernel is serving model_home_win_probability, i.e.
+        every feature it was trained on is built; a ranking over zero-filled
+        columns would explain a probability nobody was given.
+        """
+        return isinstance(self.kernel, LinearModelKernel) and self.model_features_complete
+    
+    def predict_games_columnar(self, matchups, season=CURRENT_SEASON, explain_top=0):
+        """Predict many (home, away, week, neutral) matchups of a season in one vectorized pass
+        
+        Returns parallel arrays keyed by field name instead of one dict per game.
+        With explain_top and the linear kernel, each game's explain_top largest
+        feature contributions (log-odds, largest magnitude first) come back as
+        (games, explain_top) arrays of feature names, values and contributions
+        to the model_home_win_probability served with them.
+        """
+        data = self.season_data(season)
+        home_teams, home_idx = self.resolve_teams([matchup[0] for matchup in matchups], data)
+        away_teams, away_idx = self.resolve_teams([matchup[1] for matchup in matchups], data)
+        weeks = np.array([int(matchup[2]) if len(matchup) > 2 else 1 for matchup in matchups], dtype=int)
+        neutral = np.array([bool(matchup[3]) if len(matchup) > 3 else False for matchup in matchups], dtype=bool)
+        
+        prob_noise, spread_noise = self.matchup_noise(home_teams, away_teams, weeks)
+        home_prob, spread = self.score_matchups(data, home_idx, away_idx, weeks, neutral, prob_noise, spread_noise)
+        away_prob = 1 - home_prob
+        
+        columns = {
+            'home_team': home_teams,
+            'away_team': away_teams,
+            'week': weeks,
+            'neutral': neutral,
+            'winner': np.where(home_prob > away_prob, home_teams, away_teams),
+            'home_win_probability': home_prob,
+            'away_win_probability': away_prob,
+            'confidence': np.maximum(home_prob, away_prob),
+            'spread_estimate': spread,
+            'model_used': 'enhanced_prediction_model'
+        }
+        
+        # Trained model's view of the same games, when an exported kernel is loaded
+        if self.kernel is not None and self.model_features_complete:
+            X = self.build_feature_matrix(data, home_idx, away_idx, weeks)
+            columns['model_home_win_probability'] = self.kernel.predict_proba(X)
+            
+            if explain_top and self.can_explain():
+                top, contributions = self.kernel.top_contributions(X, explain_top)
+                columns['explanation_features'] = np.asarray(self.feature_columns, dtype=object)[top]
+                columns['explanation_values'] = np.take_along_axis(X, top, axis=1)
+                columns['explanation_contributions'] = contributions
+        
+        return columns
+    
+    def score_matchups(self, data, home_idx, away_idx, weeks, neutral, prob_noise, spread_noise, margin_shift=0.0):
+        """Heuristic home win probability and spread from the two teams' ratings
+        
+        Ratings are already scoring margins per game (seeded with ppg - papg),
+        so scoring stats are not added on top. margin_shift (home points minus
+        away points per game, e.g. from a scenario's stat perturbations) moves
+        the rating gap and may carry leading scenario axes; everything else
+        broadcasts over it.
+        """
+        conf_id = data.team_conf_ids
+        
+        # Base probability from the as-of-week rating gap plus home field advantage
+        rating_gap = data.ratings.rows(home_idx, weeks) - data.ratings.rows(away_idx, weeks) + margin_shift
+        home_prob = 1.0 / (1.0 + np.exp(-rating_gap / RATING_SCALE))
+        home_prob = home_prob + np.where(neutral, 0.0, HOME_FIELD_ADVANTAGE)
+        
+        # Conference game factor
+        same_conf = (conf_id[home_idx] == conf_id[away_idx]) & (conf_id[home_idx] >= 0)
+        home_prob += np.where(same_conf, 0.03, 0.0)
+        
+        home_prob += prob_noise
+        
+        home_prob = np.clip(home_prob, 0.20, 0.85)
+        return home_prob, (home_prob - 0.5) * 28 + spread_noise
+    
+    def scenario_shape(self, perturbations):
+        """Number of values along each perturbation axis, checked without building anything
+        
+        Raises ValueError for unknown perturbations and axes outside 1..MAX_SWEEP_STEPS.
+        """
+        shape = {}
+        for name, values in perturbations.items():
+            side, _, stat = name.partition('_')
+            if side not in ('home', 'away') or stat not in STAT_KEYS:
+                raise ValueError(f"Unknown perturbation '{name}', expected home_/away_ + one of {', '.join(STAT_KEYS)}")
+            if isinstance(values, dict):
+                if 'min' not in values or 'max' not in values:
+                    raise ValueError(f"'{name}' needs min and max")
+                float(values['min']), float(values['max'])
+                steps = int(values.get('steps', 5))
+            else:
+                steps = len(values) if isinstance(values, list) else 1
+            if not 1 <= steps <= MAX_SWEEP_STEPS:
+                raise ValueError(f"'{name}' has {steps} values, expected 1 to {MAX_SWEEP_STEPS}")
+            shape[name] = steps
+        return shape
+    
+    def scenario_grid(self, perturbations):
+        """Expand {'home_ppg': [-7, 0, 7], 'away_papg': {'min': -5, 'max': 5, 'steps': 11}, ...}
+        
+        Returns the axes (name -> values) and the stat deltas of every grid point
+        as an array of shape (scenarios, 2, len(STAT_KEYS)), home first.
+        """
+        self.scenario_shape(perturbations)
+        axes = {}
+        for name, values in perturbations.items():
+            if isinstance(values, dict):
+                values = np.linspace(float(values['min']), float(values['max']), int(values.get('steps', 5)))
+            axes[name] = np.atleast_1d(np.asarray(values, dtype=float))
+        
+        grids = np.meshgrid(*axes.values(), indexing='ij') if axes else []
+        deltas = np.zeros((int(np.prod([len(values) for values in axes.values()])), 2, len(STAT_KEYS)))
+        for name, grid in zip(axes, grids):
+            side, _, stat = name.partition('_')
+            deltas[:, 0 if side == 'home' else 1, STAT_KEYS.index(stat)] += grid.ravel()
+        
+        return axes, deltas
+    
+    def predict_scenarios(self, matchups, perturbations, season=CURRENT_SEASON):
+        """Evaluate every game under every point of a stat-perturbation grid at once
+        
+        Returns the axes, the game identities and (games, scenarios) arrays of
+        home win probability and spread. The matchup noise is held fixed per
+        game, so the surface reflects only the perturbations. Perturbed stats
+        are floored at zero.
+        """
+        data = self.season_data(season)
+        home_teams, home_idx = self.resolve_teams([matchup[0] for matchup in matchups], data)
+        away_teams, away_idx = self.resolve_teams([matchup[1] for matchup in matchups], data)
+        weeks = np.array([int(matchup[2]) if len(matchup) > 2 else 1 for matchup in matchups], dtype=int)
+        neutral = np.array([bool(matchup[3]) if len(matchup) > 3 else False for matchup in matchups], dtype=bool)
+        
+        axes, deltas = self.scenario_grid(perturbations)
+        
+        # (scenarios, games, stats)
+        home_base = data.features.rows(home_idx, weeks)
+        away_base = data.features.rows(away_idx, weeks)
+        home_stats = np.maximum(home_base[None, :, :] + deltas[:, None, 0, :], 0.0)
+        away_stats = np.maximum(away_base[None, :, :] + deltas[:, None, 1, :], 0.0)
+        
+        # The heuristic sees a perturbation as the change in each side's scoring margin
+        ppg, papg = STAT_KEYS.index('ppg'), STAT_KEYS.index('papg')
+        home_change = home_stats - home_base
+        away_change = away_stats - away_base
+        margin_shift = ((home_change[..., ppg] - home_change[..., papg]) -
+                        (away_change[..., ppg] - away_change[..., papg]))
+        
+        prob_noise, spread_noise = self.matchup_noise(home_teams, away_teams, weeks)
+        home_prob, spread = self.score_matchups(data, home_idx, away_idx, weeks, neutral, prob_noise, spread_noise,
+                                                margin_shift)
+        
+        result = {
+            'axes': axes,
+            'home_team': home_teams,
+            'away_team': away_teams,
+            'week': weeks,
+            'home_win_probability': home_prob.T,
+            'spread_estimate': spread.T
+        }
+        
+        if self.kernel is not None and self.model_features_complete:
+            scenarios = len(deltas)
+            X = self.build_feature_matrix(data, np.tile(home_idx, scenarios), np.tile(away_idx, scenarios),
+                                          np.tile(weeks, scenarios),
+                                          home_stats.reshape(-1, len(STAT_KEYS)),
+                                          away_stats.reshape(-1, len(STAT_KEYS)))
+            result['model_home_win_probability'] = self.kernel.predict_proba(X).reshape(scenarios, -1).T
+        
+        return result
+    
+    def matchup_noise(self, home_teams, away_teams, weeks):
+        """Probability and spread noise for each game, keyed by the matchup"""
+        keys = [matchup_key(home_team, away_team, week)
+                for home_team, away_team, week in zip(home_teams, away_teams, weeks)]
+        uniforms = matchup_uniforms(keys, 2)
+        
+        prob_noise = -0.08 + 0.16 * uniforms[:, 0]
+        spread_noise = -3.0 + 6.0 * uniforms[:, 1]
+        return prob_noise, spread_noise
+    
+    @staticmethod
+    def columns_to_rows(columns):
+        """Convert columnar batch output to the per-game dicts the routes return"""
+        rows = [
+            {
+                'home_team': home_team,
+                'away_team': away_team,
+                'winner': winner,
+                'home_win_probability': home_prob,
+                'away_win_probability': away_prob,
+                'confidence': confidence,
+                'spread_estimate': spread,
+                'model_used': columns['model_used']
+            }
+            for home_team, away_team, winner, home_prob, away_prob, confidence, spread in zip(
+                columns['home_team'].tolist(),
+                columns['away_team'].tolist(),
+                columns['winner'].tolist(),
+                columns['home_win_probability'].tolist(),
+                columns['away_win_probability'].tolist(),
+                columns['confidence'].tolist(),
+                columns['spread_estimate'].tolist()
+            )
+        ]
+        
+        if 'model_home_win_probability' in columns:
+            for row, model_prob in zip(rows, columns['model_home_win_probability'].tolist()):
+                row['model_home_win_probability'] = model_prob
+        
+        if 'explanation_features' in columns:
+            for row, features, values, contributions in zip(rows, columns['explanation_features'].tolist(),
+                                                             columns['explanation_values'].tolist(),
+                                                             columns['explanation_contributions'].tolist()):
+                row['explanation'] = {'features': features, 'values': values, 'contributions': contributions}
+        
+        return rows
+    
     def generate_sample_schedule(self):
         """Generate real 2025 college football schedules"""
         schedules = {}
+        conferences = {conf: list(teams) for conf, teams in FBS_CONFERENCES.items()}
         
         # Real 2025 Week 1 games - Non-conference games
         week1_games = [
@@ -397,7 +970,7 @@ class CFBPredictionSystem:
         
         # Initialize all teams from conferences
         all_teams = set()
-        for conf_teams in self.conferences.values():
+        for conf_teams in conferences.values():
             all_teams.update(conf_teams)
         
         # Add FCS and other teams (excluding teams already in conferences)
@@ -429,30 +1002,35 @@ class CFBPredictionSystem:
         
         all_teams.update(additional_teams)
         
-        # Initialize schedules for ALL teams
-        for team in all_teams:
+        # Initialize schedules for ALL teams (sorted so every process builds the same schedule)
+        for team in sorted(all_teams):
             schedules[team] = []
+        # Each listing carries its generation slot so real games outrank later filler
+        slot = 0
         
         # Add Week 1 games
         for home_team, away_team in week1_games:
             if home_team in schedules:
-                schedules[home_team].append(('Week 1', away_team, True))
+                schedules[home_team].append(('Week 1', away_team, True, slot))
             if away_team in schedules:
-                schedules[away_team].append(('Week 1', home_team, False))
+                schedules[away_team].append(('Week 1', home_team, False, slot))
+            slot += 1
         
         # Add Week 2 games
         for home_team, away_team in week2_games:
             if home_team in schedules:
-                schedules[home_team].append(('Week 2', away_team, True))
+                schedules[home_team].append(('Week 2', away_team, True, slot))
             if away_team in schedules:
-                schedules[away_team].append(('Week 2', home_team, False))
+                schedules[away_team].append(('Week 2', home_team, False, slot))
+            slot += 1
         
         # Add Week 3 games
         for home_team, away_team in week3_games:
             if home_team in schedules:
-                schedules[home_team].append(('Week 3', away_team, True))
+                schedules[home_team].append(('Week 3', away_team, True, slot))
             if away_team in schedules:
-                schedules[away_team].append(('Week 3', home_team, False))
+                schedules[away_team].append(('Week 3', home_team, False, slot))
+            slot += 1
         
         # Generate placeholder games for remaining weeks (4-12)
         # Include some conference games to make predictions more interesting
@@ -461,16 +1039,16 @@ class CFBPredictionSystem:
             week_games = []
             
             # Add some conference games for each conference
-            for conf_name, teams in self.conferences.items():
+            for conf_name, teams in conferences.items():
                 if len(teams) >= 2:
                     # Create 2-3 conference games per conference per week
                     num_conference_games = min(3, len(teams) // 2)
-                    random.seed(week * 100 + hash(conf_name))
+                    random.seed(f"{week}_{conf_name}")
                     shuffled_teams = teams.copy()
                     random.shuffle(shuffled_teams)
                     
                     for i in range(0, len(shuffled_teams) - 1, 2):
-                        if len(week_games) >= num_conference_games * len(self.conferences):
+                        if len(week_games) >= num_conference_games * len(conferences):
                             break
                         home_team = shuffled_teams[i]
                         away_team = shuffled_teams[i + 1]
@@ -478,7 +1056,7 @@ class CFBPredictionSystem:
             
             # Add some non-conference games to fill out the schedule
             all_fbs_teams = []
-            for conf_name, teams in self.conferences.items():
+            for conf_name, teams in conferences.items():
                 all_fbs_teams.extend(teams)
             
             # Add additional teams for non-conference games
@@ -522,178 +1100,731 @@ class CFBPredictionSystem:
             
             for home_team, away_team in week_games:
                 if home_team in schedules and away_team in schedules:
-                    schedules[home_team].append((f'Week {week}', away_team, True))
-                    schedules[away_team].append((f'Week {week}', home_team, False))
+                    schedules[home_team].append((f'Week {week}', away_team, True, slot))
+                    schedules[away_team].append((f'Week {week}', home_team, False, slot))
+                    slot += 1
         
         return schedules
     
-    def get_available_teams(self):
-        # Only return FBS teams (teams that are in conferences)
-        fbs_teams = set()
-        for conference_teams in self.conferences.values():
-            fbs_teams.update(conference_teams)
-        return sorted(list(fbs_teams))
+    def get_available_seasons(self):
+        """Seasons in the store plus seasons with a games file waiting to be imported"""
+        seasons = set(self.store.seasons()) | {CURRENT_SEASON}
+        for path in glob.glob(os.path.join(self.season_data_dir, 'games_*.csv')):
+            match = re.fullmatch(r'games_(\d{4})\.csv', os.path.basename(path))
+            if match:
+                seasons.add(int(match.group(1)))
+        return sorted(seasons)
+    
+    def get_available_teams(self, season=CURRENT_SEASON):
+        # Only return FBS teams (teams that are in conferences), sorted at load
+        return self.season_data(season).available_teams
     
-    def get_available_weeks(self):
-        return [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12]
+    def get_available_weeks(self, season=CURRENT_SEASON):
+        self.season_data(season)
+        return self.store.season_weeks(season)
     
-    def get_available_conferences(self):
-        return list(self.conferences.keys())
+    def get_available_conferences(self, season=CURRENT_SEASON):
+        return list(self.season_data(season).conferences.keys())
     
-    def get_week_matchups(self, week):
-        matchups = []
-        processed_games = set()
+    def get_week_matchups(self, week, conference=None, season=CURRENT_SEASON):
+        return list(self.iter_week_matchups(week, conference, season))
+    
+    def iter_week_matchups(self, week, conference=None, season=CURRENT_SEASON):
+        """Yield the week's matchups one at a time (games between one conference's teams if given)"""
+        self.season_data(season)
+        for game in self.store.week_games(season, week, conference):
+            yield {
+                'home_team': game['home_team'],
+                'away_team': game['away_team'],
+                'week': week
+            }
+    
+    def schedule_games(self, schedules):
+        """Flatten generate_sample_schedule output to canonical (week, home, away) games
         
-        for team, schedule in self.schedules.items():
-            for week_info, opponent, is_home in schedule:
-                week_num = int(week_info.split()[1])
-                
-                if week_num == week:
-                    game_key = tuple(sorted([team, opponent]))
-                    if game_key not in processed_games:
-                        if is_home:
-                            matchups.append({
-                                'home_team': team,
-                                'away_team': opponent,
-                                'week': week
-                            })
-                        processed_games.add(game_key)
-        
-        return matchups
-    
-    def get_team_conference(self, team):
-        for conf_name, teams in self.conferences.items():
-            if team in teams:
-                return conf_name
-        return 'Unknown'
+        Each game is listed from both sides; it is taken from the home side only.
+        Listings are put back in generation order (real games before the filler
+        added after them), and the schedule check then drops double bookings,
+        duplicates and rematches, keeping the first listing.
+        """
+        listings = []
+        for team, schedule in schedules.items():
+            for week_info, opponent, is_home, slot in schedule:
+                if is_home:
+                    listings.append({'week': int(week_info.split()[1]), 'slot': slot,
+                                     'home': self.registry.canonical_name(team),
+                                     'away': self.registry.canonical_name(opponent)})
+        listings.sort(key=lambda game: (game['week'], game['slot']))
+        games, issues = enforce_schedule(listings, 'the sample schedule', self.registry, verbose=False)
+        if issues:
+            logger.warning(f"Sample schedule repaired: {summarize_issues(issues)}")
+        return [(game['week'], game['home'], game['away']) for game in games]
+    
+    def season_game_probabilities(self, season=CURRENT_SEASON):
+        """Every game of the season with its home win probability, predicted in one batch"""
+        matchups = [(game['home_team'], game['away_team'], week)
+                    for week in self.get_available_weeks(season)
+                    for game in self.iter_week_matchups(week, season=season)]
+        if not matchups:
+            return []
+        columns = self.predict_games_columnar(matchups, season)
+        return [{'home_team': home, 'away_team': away, 'week': int(week), 'home_win_probability': float(prob)}
+                for home, away, week, prob in zip(columns['home_team'], columns['away_team'],
+                                                  columns['week'], columns['home_win_probability'])]
+    
+    def iter_slate_predictions(self, weeks, batch_size=16, season=CURRENT_SEASON, explain_top=0):
+        """Yield predictions for the given weeks in batches as they are computed"""
+        for week in weeks:
+            matchups = []
+            for game in self.iter_week_matchups(week, season=season):
+                matchups.append((game['home_team'], game['away_team'], week))
+                if len(matchups) >= batch_size:
+                    yield self.predict_week_batch(matchups, week, season, explain_top)
+                    matchups = []
+            if matchups:
+                yield self.predict_week_batch(matchups, week, season, explain_top)
+    
+    def predict_week_batch(self, matchups, week, season=CURRENT_SEASON, explain_top=0):
+        predictions = self.predict_games_batch(matchups, season, explain_top)
+        for prediction in predictions:
+            prediction['week'] = week
+        return predictions
+    
+    def get_team_conference(self, team, season=CURRENT_SEASON):
+        team_id = self.registry.lookup(team)
+        if team_id is None:
+            return 'Unknown'
+        return self.season_data(season).team_conferences.get(self.registry.names[team_id]) or 'Unknown'
+
+    def team_ratings(self, data):
+        """Current rating of every team-table row, solved from all results so far"""
+        return data.ratings.latest()
+    
+    def team_season_outlook(self, team, season=CURRENT_SEASON):
+        """A team's whole season: results so far, odds for every game, expected wins and schedule strength
+        
+        The team's games come from the store's per-team index and are predicted
+        in one batch. Strength of schedule is the mean current rating of the
+        opponents played and still to play. Returns None for an unknown team.
+        """
+        data = self.season_data(season)
+        team_id = self.registry.lookup(team)
+        if team_id is None:
+            return None
+        team = self.registry.names[team_id]
+        games = self.store.team_games(team, season)
+        
+        outlook = {
+            'team': team,
+            'season': season,
+            'conference': self.get_team_conference(team, season),
+            'record': {'wins': 0, 'losses': 0},
+            'expected_wins': 0.0,
+            'expected_losses': 0.0,
+            'strength_of_schedule': {'played': None, 'remaining': None, 'overall': None},
+            'games': []
+        }
+        if not games:
+            return outlook
+        
+        columns = self.predict_games_columnar(
+            [(game['home_team'], game['away_team'], game['week'], game['neutral']) for game in games], season)
+        is_home = columns['home_team'] == team
+        win_prob = np.where(is_home, columns['home_win_probability'], columns['away_win_probability'])
+        spread = np.where(is_home, columns['spread_estimate'], -columns['spread_estimate'])
+        opponents = np.where(is_home, columns['away_team'], columns['home_team'])
+        _, opponent_rows = self.resolve_teams(opponents, data)
+        
+        home_points = np.array([game['home_points'] for game in games], dtype=float)
+        away_points = np.array([game['away_points'] for game in games], dtype=float)
+        played = ~np.isnan(home_points) & ~np.isnan(away_points)
+        points_for = np.where(is_home, home_points, away_points)
+        points_against = np.where(is_home, away_points, home_points)
+        won = played & (points_for > points_against)
+        
+        opponent_rating = self.team_ratings(data)[opponent_rows]
+        def mean_rating(mask):
+            return round(float(opponent_rating[mask].mean()), 2) if mask.any() else None
+        
+        wins = int(won.sum())
+        expected_wins = wins + float(win_prob[~played].sum())
+        outlook.update({
+            'record': {'wins': wins, 'losses': int(played.sum()) - wins},
+            'expected_wins': round(expected_wins, 2),
+            'expected_losses': round(len(games) - expected_wins, 2),
+            'strength_of_schedule': {'played': mean_rating(played), 'remaining': mean_rating(~played),
+                                     'overall': mean_rating(np.ones(len(games), dtype=bool))}
+        })
+        
+        for i, game in enumerate(games):
+            row = {
+                'week': game['week'],
+                'opponent': opponents[i],
+                'location': 'neutral' if game['neutral'] else ('home' if is_home[i] else 'away'),
+                'win_probability': float(win_prob[i]),
+                'spread_estimate': float(spread[i]),
+                'opponent_rating': round(float(opponent_rating[i]), 2),
+                'played': bool(played[i])
+            }
+            if played[i]:
+                row.update(points_for=float(points_for[i]), points_against=float(points_against[i]), won=bool(won[i]))
+            outlook['games'].append(row)
+        return outlook
 
 # Initialize the prediction system
 predictor = CFBPredictionSystem()
+jobs = JobQueue(JOBS_DIR, MAX_JOB_WORKERS)
+
+def ndjson_response(batches):
+    """Stream batches of predictions as newline-delimited JSON"""
+    def generate():
+        for batch in batches:
+            yield ''.join(json.dumps(prediction) + '\n' for prediction in batch)
+    
+    return Response(generate(), mimetype='application/x-ndjson')
+
+def request_body():
+    """The posted JSON object ({} when the body is empty or not JSON)"""
+    data = request.get_json(silent=True)
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise InvalidRequest('Request body must be a JSON object')
+    return data
+
+def parse_int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise InvalidRequest(f'{name} must be an integer, got {value!r}') from None
+
+def request_int(data, name, default):
+    """Integer field from the JSON body or the query string"""
+    return parse_int(data.get(name, request.args.get(name, default)), name)
+
+def wants_stream(data):
+    stream = data.get('stream', request.args.get('stream', False))
+    return str(stream).lower() in ('1', 'true', 'yes')
+
+def requested_explanations(data):
+    """Feature contributions to return per game: explain_top (default EXPLAIN_TOP_K) if explain is set, else 0"""
+    explain = data.get('explain', request.args.get('explain', False))
+    if str(explain).lower() not in ('1', 'true', 'yes'):
+        return 0
+    return max(1, request_int(data, 'explain_top', EXPLAIN_TOP_K))
+
+def explanations_unavailable():
+    return jsonify({'error': 'Explanations need the linear model kernel (export_model.py) served with '
+                               'every feature it was trained on built'}), 400
+
+def request_season(data=None):
+    """season from the JSON body or the query string (default: the current season)"""
+    return request_int(data or {}, 'season', CURRENT_SEASON)
+
+def season_not_found(season):
+    return jsonify({'error': f'No data for season {season}'}), 404
+
+def invalid_request(error):
+    return jsonify({'error': str(error)}), 400
 
 @app.route('/')
 def index():
     try:
-        teams = predictor.get_available_teams()
-        weeks = predictor.get_available_weeks()
-        conferences = predictor.get_available_conferences()
+        season = request_season()
+        if not predictor.has_season(season):
+            season = CURRENT_SEASON
+        teams = predictor.get_available_teams(season)
+        weeks = predictor.get_available_weeks(season)
+        conferences = predictor.get_available_conferences(season)
         
         return render_template('index.html', 
                              teams=teams, 
                              weeks=weeks, 
-                             conferences=conferences)
+                             conferences=conferences,
+                             season=season,
+                             seasons=predictor.get_available_seasons())
     except Exception as e:
         return f"<h1>Error</h1><p>{str(e)}</p>"
 
+@app.route('/seasons')
+def seasons():
+    """Seasons that can be requested, and the ones currently held in memory"""
+    try:
+        return jsonify({
+            'current_season': CURRENT_SEASON,
+            'seasons': predictor.get_available_seasons(),
+            'loaded': list(predictor.seasons)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/get_week_matchups/<int:week>')
 def get_week_matchups(week):
     try:
-        matchups = predictor.get_week_matchups(week)
-        return jsonify({'matchups': matchups})
+        season = request_season()
+        if not predictor.has_season(season):
+            return season_not_found(season)
+        matchups = predictor.get_week_matchups(week, season=season)
+        return jsonify({'season': season, 'matchups': matchups})
+    except InvalidRequest as e:
+        return invalid_request(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/get_all_teams')
 def get_all_teams():
     try:
-        teams = predictor.get_available_teams()
-        return jsonify({'teams': teams})
+        season = request_season()
+        if not predictor.has_season(season):
+            return season_not_found(season)
+        teams = predictor.get_available_teams(season)
+        return jsonify({'season': season, 'teams': teams})
+    except InvalidRequest as e:
+        return invalid_request(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/get_available_weeks')
+def get_available_weeks():
+    try:
+        season = request_season()
+        if not predictor.has_season(season):
+            return season_not_found(season)
+        return jsonify({'season': season, 'weeks': predictor.get_available_weeks(season),
+                        'conferences': predictor.get_available_conferences(season)})
+    except InvalidRequest as e:
+        return invalid_request(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/search_teams')
+def search_teams():
+    try:
+        query = request.args.get('q', '')
+        limit = request.args.get('limit', 10, type=int)
+        return jsonify({'query': query, 'matches': predictor.search_index.search(query, limit)})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/unresolved_teams')
+def unresolved_teams():
+    """Team names requested since startup that no source or alias knows"""
+    return jsonify({'unresolved': predictor.registry.unresolved_report()})
+
 @app.route('/predict_single', methods=['POST'])
 def predict_single():
     try:
-        data = request.get_json()
+        data = request_body()
         home_team = data.get('home_team')
         away_team = data.get('away_team')
-        week = int(data.get('week', 1))
+        week = request_int(data, 'week', 1)
+        season = request_season(data)
+        explain_top = requested_explanations(data)
         
-        if not home_team or not away_team:
+        if not (isinstance(home_team, str) and home_team and isinstance(away_team, str) and away_team):
             return jsonify({'error': 'Both teams must be selected'}), 400
+        if not predictor.has_season(season):
+            return season_not_found(season)
+        if explain_top and not predictor.can_explain():
+            return explanations_unavailable()
         
-        prediction = predictor.predict_single_game(home_team, away_team, week)
+        prediction = predictor.predict_single_game(home_team, away_team, week, season=season,
+                                                   explain_top=explain_top)
         
         if prediction:
             return jsonify(prediction)
         else:
             return jsonify({'error': 'Prediction failed'}), 500
             
+    except InvalidRequest as e:
+        return invalid_request(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/predict_conference', methods=['POST'])
 def predict_conference():
     try:
-        data = request.get_json()
+        data = request_body()
         conference = data.get('conference')
-        week = int(data.get('week', 1))
+        week = request_int(data, 'week', 1)
+        season = request_season(data)
+        explain_top = requested_explanations(data)
         
         if not conference:
             return jsonify({'error': 'Conference must be selected'}), 400
+        if not predictor.has_season(season):
+            return season_not_found(season)
+        if explain_top and not predictor.can_explain():
+            return explanations_unavailable()
         
         # Get all teams in the conference
-        conference_teams = predictor.conferences.get(conference, [])
+        conference_teams = predictor.season_data(season).conferences.get(conference, [])
         if not conference_teams:
             return jsonify({'error': f'No teams found for conference: {conference}'}), 400
         
-        # Get week matchups
-        week_matchups = predictor.get_week_matchups(week)
-        
-        # Filter for conference games
-        conference_games = []
+        # Conference games of the week (an indexed query on the store)
+        conference_games = predictor.get_week_matchups(week, conference, season)
         
-        for matchup in week_matchups:
-            home_team = matchup['home_team']
-            away_team = matchup['away_team']
-            
-            if home_team in conference_teams and away_team in conference_teams:
-                conference_games.append(matchup)
-        
-        # Make predictions for each conference game
-        predictions = []
-        for game in conference_games:
-            prediction = predictor.predict_single_game(
-                game['home_team'], 
-                game['away_team'], 
-                week
-            )
-            if prediction:
-                predictions.append(prediction)
+        # Predict the conference slate in one batch
+        predictions = predictor.predict_games_batch(
+            [(game['home_team'], game['away_team'], week) for game in conference_games], season, explain_top)
         
         return jsonify({
+            'season': season,
             'conference': conference,
             'week': week,
             'predictions': predictions
         })
         
+    except InvalidRequest as e:
+        return invalid_request(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/predict_all_games', methods=['POST'])
 def predict_all_games():
     try:
-        data = request.get_json()
-        week = int(data.get('week', 1))
+        data = request_body()
+        week = request_int(data, 'week', 1)
+        season = request_season(data)
+        explain_top = requested_explanations(data)
+        if not predictor.has_season(season):
+            return season_not_found(season)
+        if explain_top and not predictor.can_explain():
+            return explanations_unavailable()
+        
+        if wants_stream(data):
+            batch_size = request_int(data, 'batch_size', 16)
+            return ndjson_response(predictor.iter_slate_predictions([week], batch_size, season, explain_top))
         
         # Get all week matchups
-        week_matchups = predictor.get_week_matchups(week)
-        
-        # Make predictions for each game
-        predictions = []
-        for game in week_matchups:
-            prediction = predictor.predict_single_game(
-                game['home_team'], 
-                game['away_team'], 
-                week
-            )
-            if prediction:
-                predictions.append(prediction)
+        week_matchups = predictor.get_week_matchups(week, season=season)
+        
+        # Predict the whole slate in one batch
+        predictions = predictor.predict_games_batch(
+            [(game['home_team'], game['away_team'], week) for game in week_matchups], season, explain_top)
         
         return jsonify({
+            'season': season,
             'week': week,
             'predictions': predictions
         })
         
+    except InvalidRequest as e:
+        return invalid_request(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def parse_matchup(game):
+    """Accept a matchup as a dict or a [home, away, week, neutral] list; raises InvalidRequest otherwise"""
+    if isinstance(game, dict):
+        home_team, away_team = game.get('home_team'), game.get('away_team')
+        week, neutral = game.get('week', 1), game.get('neutral', False)
+    elif isinstance(game, (list, tuple)) and 2 <= len(game) <= 4:
+        home_team, away_team = game[0], game[1]
+        week = game[2] if len(game) > 2 else 1
+        neutral = game[3] if len(game) > 3 else False
+    else:
+        raise InvalidRequest(f'Malformed game {game!r}: expected an object or a [home_team, away_team, week, neutral] list')
+    
+    if not (isinstance(home_team, str) and home_team and isinstance(away_team, str) and away_team):
+        raise InvalidRequest(f'Every game needs a home_team and away_team, got {game!r}')
+    return (home_team, away_team, parse_int(week, 'week'), bool(neutral))
+
+def parse_score(game, week):
+    """(week, home, away, home_points, away_points) of a posted final score; raises InvalidRequest if malformed"""
+    try:
+        return (week, game['home_team'], game['away_team'], float(game['home_points']), float(game['away_points']))
+    except (TypeError, KeyError, ValueError):
+        raise InvalidRequest(f'Malformed score {game!r}: expected home_team, away_team, home_points '
+                             f'and away_points') from None
+
+def columns_to_lists(columns):
+    return {key: value.tolist() if isinstance(value, np.ndarray) else value
+            for key, value in columns.items()}
+
+@app.route('/predict_batch', methods=['POST'])
+def predict_batch():
+    """Predict many matchups in one request
+    
+    format: 'rows' (default, one dict per game), 'columnar' (parallel arrays)
+    or 'msgpack' (columnar arrays encoded as MessagePack). MessagePack request
+    bodies are accepted with the application/x-msgpack content type. With
+    explain (and optionally explain_top), each game also carries its largest
+    feature contributions from the linear model.
+    """
+    try:
+        if request.mimetype == MSGPACK_MIMETYPE:
+            if msgpack is None:
+                return jsonify({'error': 'msgpack is not installed'}), 415
+            data = msgpack.unpackb(request.get_data())
+            if not isinstance(data, dict):
+                raise InvalidRequest('Request body must be a MessagePack map')
+        else:
+            data = request_body()
+        
+        games = data.get('games') or []
+        output_format = data.get('format', 'rows')
+        season = request_season(data)
+        explain_top = requested_explanations(data)
+        
+        if not games:
+            return jsonify({'error': 'No games provided'}), 400
+        if not predictor.has_season(season):
+            return season_not_found(season)
+        if explain_top and not predictor.can_explain():
+            return explanations_unavailable()
+        
+        matchups = [parse_matchup(game) for game in games]
+        
+        columns = predictor.predict_games_columnar(matchups, season, explain_top)
+        
+        if output_format == 'columnar':
+            return jsonify({'count': len(matchups), 'columns': columns_to_lists(columns)})
+        
+        if output_format == 'msgpack':
+            if msgpack is None:
+                return jsonify({'error': 'msgpack is not installed'}), 415
+            body = msgpack.packb({'count': len(matchups), 'columns': columns_to_lists(columns)})
+            return Response(body, mimetype=MSGPACK_MIMETYPE)
+        
+        return jsonify({'predictions': predictor.columns_to_rows(columns)})
+        
+    except InvalidRequest as e:
+        return invalid_request(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/scenario_sweep', methods=['POST'])
+def scenario_sweep():
+    """Evaluate a matchup (or a whole week) under a grid of stat perturbations
+    
+    Body: home_team/away_team[/neutral] or games, or just week for the full
+    slate, plus perturbations such as {"home_ppg": [-7, 0, 7],
+    "away_turnovers": {"min": -1, "max": 1, "steps": 5}}. Each game's
+    surfaces have one dimension per entry of the returned axes list.
+    """
+    try:
+        data = request_body()
+        week = request_int(data, 'week', 1)
+        perturbations = data.get('perturbations') or {}
+        season = request_season(data)
+        if not isinstance(perturbations, dict):
+            raise InvalidRequest('perturbations must be an object of name: values')
+        if not predictor.has_season(season):
+            return season_not_found(season)
+        
+        if data.get('games'):
+            matchups = [parse_matchup(game) for game in data['games']]
+        elif data.get('home_team') and data.get('away_team'):
+            matchups = [parse_matchup(data)]
+        else:
+            matchups = [(game['home_team'], game['away_team'], week)
+                        for game in predictor.get_week_matchups(week, season=season)]
+        
+        if not matchups:
+            return jsonify({'error': f'No games found for week {week}'}), 400
+        
+        # Size the grid from the specs alone so oversized requests are rejected before any allocation
+        try:
+            steps = predictor.scenario_shape(perturbations)
+        except (ValueError, KeyError, TypeError) as e:
+            return jsonify({'error': str(e)}), 400
+        
+        scenarios = math.prod(steps.values())
+        if scenarios * len(matchups) > MAX_SWEEP_CELLS:
+            return jsonify({'error': f'{scenarios} scenarios x {len(matchups)} games exceeds {MAX_SWEEP_CELLS} evaluations'}), 400
+        
+        result = predictor.predict_scenarios(matchups, perturbations, season)
+        shape = [len(matchups)] + list(steps.values())
+        
+        response = {
+            'axes': [{'name': name, 'values': values.tolist()} for name, values in result['axes'].items()],
+            'scenarios': scenarios,
+            'games': [{'home_team': home_team, 'away_team': away_team, 'week': game_week}
+                      for home_team, away_team, game_week in zip(result['home_team'].tolist(),
+                                                                 result['away_team'].tolist(),
+                                                                 result['week'].tolist())]
+        }
+        for key in ('home_win_probability', 'spread_estimate', 'model_home_win_probability'):
+            if key in result:
+                response[key] = result[key].reshape(shape).tolist()
+        
+        if data.get('format') == 'msgpack':
+            if msgpack is None:
+                return jsonify({'error': 'msgpack is not installed'}), 415
+            return Response(msgpack.packb(response), mimetype=MSGPACK_MIMETYPE)
+        
+        return jsonify(response)
+        
+    except InvalidRequest as e:
+        return invalid_request(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/record_results', methods=['POST'])
+def record_results():
+    """Store final scores for a week and fold them into the point-in-time features
+    
+    Scores that match no scheduled game (unknown or swapped teams) are listed
+    as unmatched; 422 if none match.
+    """
+    try:
+        data = request_body()
+        week = request_int(data, 'week', 0)
+        games = data.get('games', [])
+        season = request_season(data)
+        if not week or not games:
+            return jsonify({'error': 'week and games are required'}), 400
+        if not isinstance(games, list):
+            raise InvalidRequest('games must be a list of final scores')
+        if not predictor.has_season(season):
+            return season_not_found(season)
+        
+        scores = [parse_score(game, week) for game in games]
+        matched = predictor.store.record_scores(season, scores)
+        unmatched = [{'home_team': home_team, 'away_team': away_team}
+                     for (_, home_team, away_team, _, _), count in zip(scores, matched) if not count]
+        if len(unmatched) == len(scores):
+            return jsonify({'error': f'No week {week} game matches any posted home/away pairing',
+                            'recorded': 0, 'unmatched': unmatched}), 422
+        
+        return jsonify({'recorded': len(scores) - len(unmatched), 'unmatched': unmatched,
+                        'weeks_refreshed': predictor.refresh_features(season)})
+    except InvalidRequest as e:
+        return invalid_request(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/betting_edges')
+def betting_edges():
+    """Largest model-vs-market edges across ingested betting lines for a week or season"""
+    try:
+        season = request_season()
+        week = request.args.get('week', type=int)
+        limit = request.args.get('limit', 25, type=int)
+        min_edge = request.args.get('min_edge', 0.0, type=float)
+        sort = request.args.get('sort', 'expected_value')
+        if sort not in ('expected_value', 'probability_edge', 'spread_edge'):
+            return jsonify({'error': f'Unknown sort: {sort}'}), 400
+        if not predictor.has_season(season):
+            return season_not_found(season)
+        
+        columns = week_edges(predictor, predictor.store, season, week)
+        return jsonify({
+            'season': season,
+            'week': week,
+            'lines_compared': len(columns.get('provider', [])),
+            'edges': top_edges(columns, limit, sort, min_edge)
+        })
+    except InvalidRequest as e:
+        return invalid_request(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/predict_season', methods=['GET', 'POST'])
+def predict_season():
+    """Stream predictions for every week of the season as NDJSON (with explain, plus feature contributions)"""
+    try:
+        data = request_body()
+        season = request_season(data)
+        if not predictor.has_season(season):
+            return season_not_found(season)
+        weeks = data.get('weeks') or predictor.get_available_weeks(season)
+        if not isinstance(weeks, list):
+            raise InvalidRequest('weeks must be a list of integers')
+        weeks = [parse_int(week, 'weeks') for week in weeks]
+        batch_size = request_int(data, 'batch_size', 16)
+        explain_top = requested_explanations(data)
+        if explain_top and not predictor.can_explain():
+            return explanations_unavailable()
+        
+        return ndjson_response(predictor.iter_slate_predictions(weeks, batch_size, season, explain_top))
+        
+    except InvalidRequest as e:
+        return invalid_request(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/team/<path:name>/season')
+def team_season(name):
+    """One team's season outlook: per-game odds, expected wins and strength of schedule"""
+    try:
+        season = request_season()
+        if not predictor.has_season(season):
+            return season_not_found(season)
+        outlook = predictor.team_season_outlook(name, season)
+        if outlook is None:
+            return jsonify({'error': f'Unknown team {name}'}), 404
+        return jsonify(outlook)
+    except InvalidRequest as e:
+        return invalid_request(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue a season_simulation, backtest or retrain job; an identical active job is reused"""
+    try:
+        data = request_body()
+        kind = data.get('kind')
+        params = data.get('params') or {}
+        inputs = None
+        # Reject bad parameters before any probabilities are computed for them
+        if kind in JOB_PARAMS:
+            validate_params(kind, params)
+        
+        if kind == 'season_simulation':
+            params['season'] = request_season(params)
+            if not predictor.has_season(params['season']):
+                return season_not_found(params['season'])
+            # Probabilities come from the loaded model; the worker only simulates
+            inputs = {'games': predictor.season_game_probabilities(params['season'])}
+        
+        job, created = jobs.submit(kind, params, request_int(data, 'priority', 0), inputs)
+        return jsonify({**job, 'deduplicated': not created}), 202
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/jobs')
+def list_jobs():
+    try:
+        return jsonify({'jobs': jobs.list(request.args.get('status'))})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    try:
+        job = jobs.status(job_id)
+        if job is None:
+            return jsonify({'error': f'Unknown job {job_id}'}), 404
+        return jsonify(job)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    try:
+        job = jobs.status(job_id)
+        if job is None:
+            return jsonify({'error': f'Unknown job {job_id}'}), 404
+        if job['status'] != 'done':
+            return jsonify({'error': f"Job {job_id} is {job['status']}", 'job': job}), 409
+        return jsonify({'job': job, 'result': jobs.result(job_id)})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    try:
+        job = jobs.cancel(job_id)
+        if job is None:
+            return jsonify({'error': f'Unknown job {job_id}'}), 404
+        return jsonify(job)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Walk-forward backtester for the candidate prediction models
+
+Replays each historical season week by week: every model is trained on the
+games played before week N (earlier seasons plus earlier weeks of the same
+season) and then predicts week N. Team features are season-to-date averages
+as they stood before each game, so no result leaks into its own prediction.
+
+Seasons are distributed across a process pool. The feature matrix is built
+once, saved as .npy files and memory-mapped by every worker.
+
+Usage: python3 backtest.py --years 2020 2021 2022 2023 2024 [--models logistic random_forest]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = 'cfbd_data'
+FEATURE_NAMES = ['home_ppg', 'home_papg', 'away_ppg', 'away_papg',
+                 'ppg_diff', 'papg_diff', 'margin_diff', 'neutral_site']
+LEAGUE_AVERAGE_POINTS = 28.0
+LOG_LOSS_EPSILON = 1e-15
+
+def make_model(name):
+    """Candidate models, configured as in train_models_new_approach"""
+    from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    if name == 'logistic':
+        return make_pipeline(StandardScaler(), LogisticRegression(random_state=42, max_iter=1000))
+    if name == 'random_forest':
+        return RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42)
+    if name == 'gradient_boosting':
+        return GradientBoostingClassifier(n_estimators=100, max_depth=6, random_state=42)
+    raise ValueError(f"Unknown model: {name}")
+
+MODEL_NAMES = ['logistic', 'random_forest', 'gradient_boosting']
+
+def load_games(years, data_dir=DATA_DIR):
+    """Load completed games from games_{year}.csv (CFBD export, either column style)
+
+    Postseason weeks are numbered after the last regular-season week.
+    """
+    frames = []
+    for year in years:
+        path = os.path.join(data_dir, f'games_{year}.csv')
+        if not os.path.exists(path):
+            print(f"✗ {path} not found")
+            continue
+
+        df = pd.read_csv(path)
+        df = df.rename(columns={
+            'homeTeam': 'home_team', 'awayTeam': 'away_team',
+            'homePoints': 'home_points', 'awayPoints': 'away_points',
+            'neutralSite': 'neutral_site', 'seasonType': 'season_type'
+        })
+        df['season'] = year
+        if 'neutral_site' not in df.columns:
+            df['neutral_site'] = False
+
+        # CFBD numbers postseason weeks from 1 again; move them after the
+        # regular season (as data_store.read_cfbd_games does) so bowl results
+        # never count toward early-season features
+        if 'season_type' in df.columns:
+            postseason = df['season_type'] == 'postseason'
+            last_regular_week = int(df.loc[~postseason, 'week'].max()) if (~postseason).any() else 0
+            df.loc[postseason, 'week'] += last_regular_week
+        frames.append(df[['season', 'week', 'home_team', 'away_team',
+                          'home_points', 'away_points', 'neutral_site']])
+        print(f"✓ Loaded games for {year}: {len(df)} rows")
+
+    if not frames:
+        return pd.DataFrame()
+
+    games = pd.concat(frames, ignore_index=True).dropna(subset=['home_points', 'away_points'])
+    return games.sort_values(['season', 'week'], kind='stable').reset_index(drop=True)
+
+def build_features(games):
+    """Point-in-time features for every game, in one pass over the schedule
+
+    Each team's points for/against are accumulated week by week; a game's
+    features use only the totals from before its week. Teams with no games yet
+    this season start from their previous season's averages.
+    """
+    teams = pd.Index(pd.unique(pd.concat([games['home_team'], games['away_team']])))
+    home = teams.get_indexer(games['home_team'])
+    away = teams.get_indexer(games['away_team'])
+    home_points = games['home_points'].to_numpy(dtype=float)
+    away_points = games['away_points'].to_numpy(dtype=float)
+    seasons = games['season'].to_numpy()
+    weeks = games['week'].to_numpy()
+
+    features = np.empty((len(games), len(FEATURE_NAMES)))
+    prior_for = np.full(len(teams), LEAGUE_AVERAGE_POINTS)
+    prior_against = np.full(len(teams), LEAGUE_AVERAGE_POINTS)
+
+    for season in np.unique(seasons):
+        points_for = np.zeros(len(teams))
+        points_against = np.zeros(len(teams))
+        played = np.zeros(len(teams))
+
+        season_rows = np.flatnonzero(seasons == season)
+        for week in np.unique(weeks[season_rows]):
+            rows = season_rows[weeks[season_rows] == week]
+            h, a = home[rows], away[rows]
+
+            with np.errstate(invalid='ignore', divide='ignore'):
+                ppg = np.where(played > 0, points_for / played, prior_for)
+                papg = np.where(played > 0, points_against / played, prior_against)
+
+            features[rows, 0] = ppg[h]
+            features[rows, 1] = papg[h]
+            features[rows, 2] = ppg[a]
+            features[rows, 3] = papg[a]
+
+            # Apply this week's results only after its features are taken
+            np.add.at(points_for, h, home_points[rows])
+            np.add.at(points_for, a, away_points[rows])
+            np.add.at(points_against, h, away_points[rows])
+            np.add.at(points_against, a, home_points[rows])
+            np.add.at(played, h, 1)
+            np.add.at(played, a, 1)
+
+        has_games = played > 0
+        prior_for[has_games] = points_for[has_games] / played[has_games]
+        prior_against[has_games] = points_against[has_games] / played[has_games]
+
+    features[:, 4] = features[:, 0] - features[:, 2]
+    features[:, 5] = features[:, 1] - features[:, 3]
+    features[:, 6] = (features[:, 0] - features[:, 1]) - (features[:, 2] - features[:, 3])
+    features[:, 7] = games['neutral_site'].astype(bool).to_numpy(dtype=float)
+
+    labels = (home_points > away_points).astype(np.int8)
+    return features, labels
+
+def score(probabilities, labels):
+    """Accuracy, Brier score and log-loss of home-win probabilities"""
+    clipped = np.clip(probabilities, LOG_LOSS_EPSILON, 1 - LOG_LOSS_EPSILON)
+    return {
+        'accuracy': float(np.mean((probabilities > 0.5) == (labels == 1))),
+        'brier': float(np.mean((probabilities - labels) ** 2)),
+        'log_loss': float(-np.mean(labels * np.log(clipped) + (1 - labels) * np.log(1 - clipped)))
+    }
+
+def backtest_season(season, paths, model_names, min_train_games):
+    """Replay one season week by week for every model (runs in a worker process)"""
+    features = np.load(paths['features'], mmap_mode='r')
+    labels = np.load(paths['labels'], mmap_mode='r')
+    seasons = np.load(paths['seasons'], mmap_mode='r')
+    weeks = np.load(paths['weeks'], mmap_mode='r')
+
+    start = time.perf_counter()
+    rows = []
+    predict_seconds = {name: 0.0 for name in model_names}
+    predicted_games = 0
+
+    season_weeks = np.unique(weeks[seasons == season])
+    for week in season_weeks:
+        test = (seasons == season) & (weeks == week)
+        train = (seasons < season) | ((seasons == season) & (weeks < week))
+        y_train = labels[train]
+
+        # Need enough history (and both outcomes) before a model can be fit
+        if train.sum() < min_train_games or len(np.unique(y_train)) < 2:
+            continue
+
+        X_train = features[train]
+        X_test = features[test]
+        y_test = np.asarray(labels[test], dtype=float)
+        predicted_games += len(y_test)
+
+        for name in model_names:
+            model = make_model(name)
+            model.fit(X_train, y_train)
+
+            predict_start = time.perf_counter()
+            probabilities = model.predict_proba(X_test)[:, 1]
+            predict_seconds[name] += time.perf_counter() - predict_start
+
+            rows.append({'season': int(season), 'week': int(week), 'model': name,
+                         'games': int(len(y_test)), **score(probabilities, y_test)})
+
+    return {
+        'season': int(season),
+        'rows': rows,
+        'wall_seconds': time.perf_counter() - start,
+        'predicted_games': predicted_games,
+        'predict_seconds': predict_seconds
+    }
+
+def run_backtest(games, model_names=MODEL_NAMES, min_train_games=200, workers=None, progress=None):
+    """Backtest every season in games across a process pool
+
+    progress(seasons_done, seasons_total) is called as each season finishes;
+    if it raises, seasons that have not started are cancelled.
+    """
+    features, labels = build_features(games)
+
+    with tempfile.TemporaryDirectory(prefix='cfb_backtest_') as tmp_dir:
+        paths = {}
+        for name, array in (('features', features), ('labels', labels),
+                            ('seasons', games['season'].to_numpy()), ('weeks', games['week'].to_numpy())):
+            paths[name] = os.path.join(tmp_dir, f'{name}.npy')
+            np.save(paths[name], np.ascontiguousarray(array))
+
+        seasons = sorted(games['season'].unique())
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(backtest_season, season, paths, model_names, min_train_games)
+                       for season in seasons]
+            try:
+                for done, _ in enumerate(as_completed(futures), 1):
+                    if progress:
+                        progress(done, len(futures))
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+            return [future.result() for future in futures]
+
+def summarize(season_results):
+    """Per-week metrics as a DataFrame, plus per-model totals and throughput"""
+    weekly = pd.DataFrame([row for result in season_results for row in result['rows']])
+
+    print("\n📊 BACKTEST SUMMARY")
+    print("=" * 60)
+    if weekly.empty:
+        print("No weeks had enough prior games to train on")
+        return weekly
+
+    for name, model_rows in weekly.groupby('model'):
+        weights = model_rows['games']
+        print(f"{name:>18}: accuracy {np.average(model_rows['accuracy'], weights=weights):.3f}  "
+              f"brier {np.average(model_rows['brier'], weights=weights):.3f}  "
+              f"log-loss {np.average(model_rows['log_loss'], weights=weights):.3f}")
+
+    print("\n⏱️  THROUGHPUT")
+    for result in season_results:
+        rates = ', '.join(
+            f"{name} {result['predicted_games'] / seconds:,.0f} games/s"
+            for name, seconds in result['predict_seconds'].items() if seconds > 0
+        )
+        print(f"  {result['season']}: {result['wall_seconds']:.2f}s wall, "
+              f"{result['predicted_games']} games predicted ({rates})")
+
+    return weekly
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of candidate models")
+    parser.add_argument('--years', type=int, nargs='+', default=[2020, 2021, 2022, 2023, 2024])
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--models', nargs='+', default=MODEL_NAMES, choices=MODEL_NAMES)
+    parser.add_argument('--min-train-games', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default=os.path.join(DATA_DIR, 'backtest_results.csv'))
+    args = parser.parse_args()
+
+    games = load_games(args.years, args.data_dir)
+    if games.empty:
+        print("❌ No games data available!")
+    else:
+        start = time.perf_counter()
+        results = run_backtest(games, args.models, args.min_train_games, args.workers)
+        weekly = summarize(results)
+        if not weekly.empty:
+            weekly.to_csv(args.output, index=False)
+            print(f"\n✅ Saved per-week results to {args.output}")
+        print(f"Total wall time: {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Flask predictor's hot paths
+
+Run from the CFDB directory: python3 benchmark_predictions.py
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+
+from app import predictor, CONFERENCE_DEFAULT_STATS, CURRENT_SEASON, GENERIC_DEFAULT_STATS, STAT_KEYS, LinearModelKernel
+from ratings import WeeklyRatings, solve_ratings
+
+current = predictor.season_data()
+
+def measure(fn, repeats=2000):
+    """Return (microseconds per call, peak bytes allocated by one call)"""
+    fn()
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeats * 1e6
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+def legacy_default_stats(team_name):
+    """The old get_default_team_stats: linear conference scan plus an 11-entry dict rebuild"""
+    conf = 'Unknown'
+    for conf_name, teams in current.conferences.items():
+        if team_name in teams:
+            conf = conf_name
+            break
+
+    defaults = {name: dict(stats) for name, stats in CONFERENCE_DEFAULT_STATS.items()}
+    return defaults.get(conf, dict(GENERIC_DEFAULT_STATS))
+
+def legacy_team_lookup(home_team, away_team):
+    # The .get() default is evaluated even when the team has real stats
+    home_stats = current.team_stats.get(home_team, legacy_default_stats(home_team))
+    away_stats = current.team_stats.get(away_team, legacy_default_stats(away_team))
+    return [home_stats.get(key, 25.0) for key in STAT_KEYS], [away_stats.get(key, 25.0) for key in STAT_KEYS]
+
+def table_team_lookup(home_team, away_team):
+    table = current.team_stat_table
+    return table[predictor.team_row(home_team)], table[predictor.team_row(away_team)]
+
+def benchmark_team_lookup():
+    print("📊 Team stats lookup per prediction (two teams)")
+    home_team, away_team = 'Utah', 'UT Martin'
+
+    legacy_us, legacy_bytes = measure(lambda: legacy_team_lookup(home_team, away_team))
+    table_us, table_bytes = measure(lambda: table_team_lookup(home_team, away_team))
+
+    print(f"  Dict defaults:  {legacy_us:8.2f} µs  {legacy_bytes:6d} bytes")
+    print(f"  Stats table:    {table_us:8.2f} µs  {table_bytes:6d} bytes")
+    print(f"  Speedup: {legacy_us / table_us:.1f}x")
+
+def benchmark_single_prediction():
+    print("\n🏈 predict_single_game")
+    elapsed, peak = measure(lambda: predictor.predict_single_game('Utah', 'BYU', 5))
+    print(f"  {elapsed:8.2f} µs  {peak:6d} bytes")
+
+def benchmark_week_slate():
+    print("\n📅 Full week slate")
+    matchups = [(game['home_team'], game['away_team'], 5) for game in predictor.get_week_matchups(5)]
+    elapsed, peak = measure(lambda: predictor.predict_games_batch(matchups), repeats=200)
+    print(f"  {len(matchups)} games: {elapsed:8.2f} µs  ({elapsed / len(matchups):.2f} µs/game)  {peak} bytes")
+
+def benchmark_scenario_sweep():
+    print("\n🎛️  Scenario sweep (full week x 1,000 scenarios)")
+    matchups = [(game['home_team'], game['away_team'], 5) for game in predictor.get_week_matchups(5)]
+    grid = {
+        'home_ppg': {'min': -10, 'max': 10, 'steps': 10},
+        'home_papg': {'min': -10, 'max': 10, 'steps': 10},
+        'away_turnovers': {'min': -1, 'max': 1, 'steps': 10},
+    }
+    elapsed, peak = measure(lambda: predictor.predict_scenarios(matchups, grid), repeats=20)
+    print(f"  {len(matchups) * 1000} evaluations: {elapsed / 1000:8.2f} ms  {peak} bytes")
+
+def benchmark_explanations():
+    # The shipped model's columns are not all built by the app, so serve a
+    # random linear kernel over the columns the app does build
+    print("\n🧾 Explanations, full week slate (linear kernel over the app's own features)")
+    saved = predictor.kernel, predictor.feature_columns, predictor.feature_plan, predictor.model_features_complete
+    columns = (['week', 'is_conference_game', 'home_rating', 'away_rating', 'rating_diff'] +
+               [f'{side}_{key}' for side in ('home', 'away') for key in STAT_KEYS] +
+               [f'{key}_diff' for key in STAT_KEYS])
+    rng = np.random.default_rng(42)
+    try:
+        predictor.kernel = LinearModelKernel(rng.normal(0, 0.05, len(columns)), 0.0, columns, 'benchmark',
+                                             rng.normal(0, 10, len(columns)))
+        predictor.feature_columns = columns
+        predictor.feature_plan = predictor.build_feature_plan()
+
+        matchups = [(game['home_team'], game['away_team'], 5) for game in predictor.get_week_matchups(5)]
+        for label, predict in (('columns', predictor.predict_games_columnar), ('rows', predictor.predict_games_batch)):
+            plain_us, _ = measure(lambda: predict(matchups), repeats=500)
+            explain_us, explain_bytes = measure(lambda: predict(matchups, explain_top=5), repeats=500)
+            print(f"  {len(matchups)} games as {label:<7}: plain {plain_us:8.2f} µs, top 5 explained "
+                  f"{explain_us:8.2f} µs  (+{(explain_us - plain_us) / plain_us:.0%})  {explain_bytes} bytes")
+    finally:
+        predictor.kernel, predictor.feature_columns, predictor.feature_plan, predictor.model_features_complete = saved
+
+def legacy_team_filter(query):
+    """The old path: rebuild and sort the FBS list, then substring-filter it client-side"""
+    fbs_teams = set()
+    for conference_teams in current.conferences.values():
+        fbs_teams.update(conference_teams)
+    return [team for team in sorted(fbs_teams) if query.lower() in team.lower()]
+
+def benchmark_team_search():
+    print("\n🔎 Team search")
+    for query in ('ohio', 'mississipi'):
+        legacy_us, _ = measure(lambda: legacy_team_filter(query))
+        index_us, index_bytes = measure(lambda: predictor.search_index.search(query))
+        print(f"  '{query}': list filter {legacy_us:8.2f} µs, index {index_us:8.2f} µs  {index_bytes} bytes")
+
+def benchmark_seasons():
+    print("\n🗓️  Season data: first access vs warm (week 5 slate)")
+    for season in predictor.get_available_seasons():
+        # Drop the season from memory so the first access rebuilds it
+        predictor.seasons.pop(season, None)
+        start = time.perf_counter()
+        matchups = [(game['home_team'], game['away_team'], 5)
+                    for game in predictor.get_week_matchups(5, season=season)]
+        predictor.predict_games_batch(matchups, season)
+        first_ms = (time.perf_counter() - start) * 1000
+
+        warm_us, _ = measure(lambda: predictor.predict_games_batch(
+            [(game['home_team'], game['away_team'], 5) for game in predictor.get_week_matchups(5, season=season)],
+            season), repeats=50)
+        print(f"  {season}: {len(matchups):3d} games  first {first_ms:8.1f} ms  warm {warm_us / 1000:6.2f} ms")
+
+    print(f"  Seasons in memory: {sorted(predictor.seasons)} "
+          f"(current + up to {predictor.max_loaded_seasons}, current season {CURRENT_SEASON})")
+
+def benchmark_team_outlooks():
+    print("\n📈 Team season outlook (every team, as for a standings page)")
+    teams = predictor.get_available_teams()
+    elapsed, peak = measure(lambda: [predictor.team_season_outlook(team) for team in teams], repeats=5)
+    print(f"  {len(teams)} teams: {elapsed / 1000:8.2f} ms  ({elapsed / len(teams):.0f} µs/team)  {peak} bytes")
+
+def synthetic_season(rng, teams=260, weeks=13, home_field=3.0):
+    """Random pairings each week, margins from a hidden strength plus home field and noise"""
+    strength = rng.normal(0, 10, teams)
+    games = []
+    for week in range(1, weeks + 1):
+        order = rng.permutation(teams)
+        home_idx, away_idx = order[::2], order[1::2]
+        margin = strength[home_idx] - strength[away_idx] + home_field + rng.normal(0, 14, len(home_idx))
+        games.append((week, home_idx, away_idx, np.round(margin), np.zeros(len(home_idx), dtype=bool)))
+    return strength, games
+
+def benchmark_ratings():
+    print("\n📐 Rating solver (10 synthetic seasons of 260 FBS + FCS teams)")
+    rng = np.random.default_rng(7)
+    seasons = [synthetic_season(rng) for _ in range(10)]
+
+    # One joint solve over the decade, one column per team-season
+    home_idx = np.concatenate([week[1] + 260 * i for i, (_, games) in enumerate(seasons) for week in games])
+    away_idx = np.concatenate([week[2] + 260 * i for i, (_, games) in enumerate(seasons) for week in games])
+    margin = np.concatenate([week[3] for _, games in seasons for week in games])
+    neutral = np.zeros(len(margin), dtype=bool)
+    elapsed, peak = measure(lambda: solve_ratings(home_idx, away_idx, margin, neutral, 2600), repeats=20)
+    ratings, home_field, iterations = solve_ratings(home_idx, away_idx, margin, neutral, 2600)
+    truth = np.concatenate([strength for strength, _ in seasons])
+    print(f"  Joint solve, {len(margin)} games: {elapsed / 1000:8.2f} ms  {iterations} iterations  {peak} bytes  "
+          f"(home field {home_field:.2f}, r={np.corrcoef(ratings, truth)[0, 1]:.3f})")
+
+    # Every week of every season: each week solved from scratch vs warm-started from the week before
+    def cold():
+        iterations = 0
+        for _, games in seasons:
+            for week in range(1, len(games) + 1):
+                played = games[:week]
+                iterations += solve_ratings(np.concatenate([game[1] for game in played]),
+                                            np.concatenate([game[2] for game in played]),
+                                            np.concatenate([game[3] for game in played]),
+                                            np.concatenate([game[4] for game in played]), 260)[2]
+        return iterations
+
+    def warm():
+        iterations = 0
+        for _, games in seasons:
+            weekly_ratings = WeeklyRatings(np.zeros(260), max_week=len(games) + 1)
+            for week, home_idx, away_idx, margin, neutral in games:
+                weekly_ratings.record_week(week, home_idx, away_idx, margin, neutral, refresh=False)
+            weekly_ratings.refresh(0)
+            iterations += int(weekly_ratings.iterations.sum())
+        return iterations
+
+    for label, solve in (('cold', cold), ('warm', warm)):
+        start = time.perf_counter()
+        iterations = solve()
+        print(f"  Weekly re-solves ({label}): {(time.perf_counter() - start) * 1000:8.2f} ms  {iterations} iterations")
+
+if __name__ == "__main__":
+    benchmark_team_lookup()
+    benchmark_single_prediction()
+    benchmark_week_slate()
+    benchmark_team_search()
+    benchmark_scenario_sweep()
+    benchmark_explanations()
+    benchmark_team_outlooks()
+    benchmark_ratings()
+    benchmark_seasons()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Betting-line ingestion and model-vs-market edge detection
+
+Line files dropped in lines/ (CSV, NDJSON, or a CFBD /lines JSON export) are
+read in chunks (a CFBD JSON export is streamed with ijson when it is
+installed; without it only files up to JSON_LOAD_MAX_BYTES are loaded, so
+convert larger exports to NDJSON or CSV), keyed to canonical (season, week, home, away) games and
+upserted into the SQLite store, one row per game and sportsbook. Files whose
+size and mtime are unchanged since the last ingest are skipped.
+
+compute_edges compares every line of a week or season against the model in
+one vectorized pass: de-vigged implied probabilities, probability edge,
+expected value per unit stake and spread edge in points.
+
+Usage: python3 betting_lines.py ingest [--dir lines] [--season 2025]
+       python3 betting_lines.py edges [--week 5] [--limit 20]
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+from data_store import CFDB_DIR, CURRENT_SEASON, DEFAULT_DB_PATH, CFBDataStore
+from team_registry import TeamRegistry
+
+LINES_DIR = os.path.join(CFDB_DIR, 'lines')
+CHUNK_ROWS = 50_000
+# Largest CFBD JSON export read whole when ijson is not installed
+JSON_LOAD_MAX_BYTES = 64 * 1024 * 1024
+
+# Standard deviation of college football final margins around the spread,
+# used to turn a spread into a win probability when there is no moneyline
+MARGIN_STDDEV = 13.5
+
+# CFBD (camelCase) and snake_case column names -> ingest column
+LINE_COLUMNS = {
+    'season': 'season', 'week': 'week',
+    'homeTeam': 'home_team', 'home_team': 'home_team',
+    'awayTeam': 'away_team', 'away_team': 'away_team',
+    'provider': 'provider', 'lineProvider': 'provider', 'line_provider': 'provider',
+    'spread': 'spread',
+    'overUnder': 'over_under', 'over_under': 'over_under',
+    'homeMoneyline': 'home_moneyline', 'home_moneyline': 'home_moneyline',
+    'awayMoneyline': 'away_moneyline', 'away_moneyline': 'away_moneyline',
+}
+NUMERIC_COLUMNS = ['spread', 'over_under', 'home_moneyline', 'away_moneyline']
+
+def read_line_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Yield DataFrames of at most chunk_rows lines from a CSV, NDJSON or CFBD JSON file"""
+    if path.endswith('.csv'):
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+    elif path.endswith(('.jsonl', '.ndjson')):
+        yield from pd.read_json(path, lines=True, chunksize=chunk_rows)
+    else:
+        # CFBD /lines responses nest one entry per provider under each game
+        rows = []
+        for game in read_json_games(path):
+            rows.extend({**{key: value for key, value in game.items() if key != 'lines'}, **line}
+                        for line in game.get('lines') or [])
+            if len(rows) >= chunk_rows:
+                yield pd.DataFrame(rows)
+                rows = []
+        if rows:
+            yield pd.DataFrame(rows)
+
+def read_json_games(path):
+    """Iterate the games of a CFBD JSON export, streaming it when ijson is available"""
+    if ijson is not None:
+        with open(path, 'rb') as file:
+            yield from ijson.items(file, 'item', use_float=True)
+        return
+
+    size = os.path.getsize(path)
+    if size > JSON_LOAD_MAX_BYTES:
+        raise ValueError(f"{path} is {size:,} bytes; install ijson to stream it, or convert it to NDJSON or CSV")
+    with open(path, 'r', encoding='utf-8') as file:
+        yield from json.load(file)
+
+def normalize_chunk(chunk, default_season):
+    """Rename to ingest columns and coerce types; rows without teams or a numeric week are dropped
+    
+    A blank or non-numeric season falls back to default_season.
+    """
+    chunk = chunk.rename(columns={col: LINE_COLUMNS[col] for col in chunk.columns if col in LINE_COLUMNS})
+    chunk = chunk.loc[:, ~chunk.columns.duplicated()]
+    chunk['season'] = pd.to_numeric(chunk['season'], errors='coerce') if 'season' in chunk.columns else np.nan
+    chunk['season'] = chunk['season'].fillna(default_season)
+    chunk['week'] = pd.to_numeric(chunk['week'], errors='coerce') if 'week' in chunk.columns else np.nan
+    if 'provider' not in chunk.columns:
+        chunk['provider'] = 'consensus'
+    for column in NUMERIC_COLUMNS:
+        chunk[column] = pd.to_numeric(chunk[column], errors='coerce') if column in chunk.columns else np.nan
+
+    chunk = chunk.dropna(subset=['home_team', 'away_team', 'week'])
+    chunk = chunk.astype({'season': int, 'week': int})
+    chunk['provider'] = chunk['provider'].fillna('consensus').astype(str)
+    return chunk
+
+def ingest_file(store, path, registry, default_season=CURRENT_SEASON, chunk_rows=CHUNK_ROWS):
+    """Upsert one file's lines chunk by chunk; returns the number of rows read"""
+    team_ids = {}
+    total = 0
+
+    for chunk in read_line_chunks(path, chunk_rows):
+        chunk = normalize_chunk(chunk, default_season)
+
+        # Resolve each distinct spelling once per file, then map whole columns
+        names = pd.unique(pd.concat([chunk['home_team'], chunk['away_team']]).astype(str))
+        new_names = [name for name in names if name not in team_ids]
+        canonical = [registry.canonical_name(name) for name in new_names]
+        new_ids = store.team_ids(canonical)
+        team_ids.update(zip(new_names, new_ids))
+        store.note_unknown_teams([name for name, team_id in zip(new_names, new_ids) if team_id is None])
+
+        # Lines for teams the store does not know (it has no games for them) are skipped
+        home_ids = chunk['home_team'].astype(str).map(team_ids)
+        away_ids = chunk['away_team'].astype(str).map(team_ids)
+        known = (home_ids.notna() & away_ids.notna()).to_numpy()
+        chunk, home_ids, away_ids = chunk[known], home_ids[known].astype(int), away_ids[known].astype(int)
+        numeric = chunk[NUMERIC_COLUMNS].astype(object).where(chunk[NUMERIC_COLUMNS].notna(), None)
+
+        store.upsert_lines(zip(
+            chunk['season'].tolist(), chunk['week'].tolist(),
+            home_ids.tolist(), away_ids.tolist(), chunk['provider'].tolist(),
+            *(numeric[column].tolist() for column in NUMERIC_COLUMNS)
+        ))
+        total += len(chunk)
+
+    return total
+
+def ingest_directory(store, lines_dir=LINES_DIR, default_season=CURRENT_SEASON, force=False):
+    """Ingest every new or changed line file in lines_dir"""
+    registry = TeamRegistry()
+    if not os.path.isdir(lines_dir):
+        print(f"✗ {lines_dir} not found")
+        return 0
+
+    total = 0
+    for name in sorted(os.listdir(lines_dir)):
+        path = os.path.join(lines_dir, name)
+        if not name.endswith(('.csv', '.json', '.jsonl', '.ndjson')):
+            continue
+
+        stat = os.stat(path)
+        if not force and store.line_file_unchanged(path, stat.st_size, stat.st_mtime_ns):
+            print(f"⏩ {name}: unchanged")
+            continue
+
+        try:
+            rows = ingest_file(store, path, registry, default_season)
+        except ValueError as e:
+            print(f"✗ {name}: {e}")
+            continue
+        store.mark_line_file(path, stat.st_size, stat.st_mtime_ns, rows)
+        print(f"✅ {name}: {rows:,} lines")
+        total += rows
+
+    registry.print_unresolved(lines_dir)
+    store.print_unknown_teams(lines_dir)
+    return total
+
+def normal_cdf(x):
+    """Standard normal CDF (Abramowitz-Stegun 7.1.26, |error| < 1.5e-7)"""
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+def american_to_decimal(odds):
+    """Decimal payout per unit stake for American odds (NaN stays NaN)"""
+    odds = np.asarray(odds, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(odds > 0, 1.0 + odds / 100.0, 1.0 + 100.0 / -odds)
+
+def compute_edges(lines, model_home_prob, model_margin):
+    """Model edge for every line, in one vectorized pass
+
+    lines holds parallel arrays (spread, home_moneyline, away_moneyline);
+    model_home_prob / model_margin are aligned with them. Spreads follow the
+    CFBD convention (negative = home favored); model_margin is home points
+    minus away points. The bet side is whichever side the model prefers
+    relative to the market.
+    """
+    spread = np.asarray(lines['spread'], dtype=float)
+    home_decimal = american_to_decimal(lines['home_moneyline'])
+    away_decimal = american_to_decimal(lines['away_moneyline'])
+
+    # Moneylines give implied probabilities with the bookmaker's margin removed;
+    # without them fall back to the spread under a normal margin distribution
+    raw_home, raw_away = 1.0 / home_decimal, 1.0 / away_decimal
+    has_moneyline = np.isfinite(raw_home) & np.isfinite(raw_away)
+    with np.errstate(invalid='ignore'):
+        market_home_prob = np.where(has_moneyline, raw_home / (raw_home + raw_away),
+                                    normal_cdf(-spread / MARGIN_STDDEV))
+
+    probability_edge = model_home_prob - market_home_prob
+    bet_home = probability_edge >= 0
+    bet_prob = np.where(bet_home, model_home_prob, 1.0 - model_home_prob)
+    bet_decimal = np.where(bet_home, home_decimal, away_decimal)
+    expected_value = np.where(has_moneyline, bet_prob * bet_decimal - 1.0, np.nan)
+
+    return {
+        'market_home_probability': market_home_prob,
+        'probability_edge': probability_edge,
+        'bet_side': np.where(bet_home, 'home', 'away'),
+        'expected_value': expected_value,
+        'market_margin': -spread,
+        'spread_edge': model_margin - (-spread),
+    }
+
+def week_edges(predictor, store, season=CURRENT_SEASON, week=None):
+    """Predict every game that has lines and compare it with every book's line
+
+    Returns columns aligned with the store's line rows (week=None: whole season).
+    """
+    rows = store.lines(season, week)
+    if not rows:
+        return {}
+
+    # One prediction per distinct game, broadcast back to each book's row
+    games = {}
+    inverse = np.array([games.setdefault((row['home_team'], row['away_team'], row['week']), len(games))
+                        for row in rows])
+    predictions = predictor.predict_games_columnar(list(games), season)
+
+    home_prob = predictions.get('model_home_win_probability', predictions['home_win_probability'])[inverse]
+    margin = np.asarray(predictions['spread_estimate'])[inverse]
+
+    lines = {key: np.array([row[key] if row[key] is not None else np.nan for row in rows], dtype=float)
+             for key in ('spread', 'home_moneyline', 'away_moneyline')}
+    columns = {key: np.array([row[key] for row in rows], dtype=object)
+               for key in ('week', 'home_team', 'away_team', 'provider')}
+    columns.update(lines)
+    columns['model_home_probability'] = home_prob
+    columns['model_margin'] = margin
+    columns.update(compute_edges(lines, home_prob, margin))
+    return columns
+
+def top_edges(columns, limit=20, sort='expected_value', min_edge=0.0):
+    """The largest edges as row dicts, best first (NaN sort keys last)"""
+    if not columns:
+        return []
+
+    key = np.abs(columns['probability_edge']) if sort == 'probability_edge' else \
+        np.abs(columns['spread_edge']) if sort == 'spread_edge' else columns['expected_value']
+    keep = np.flatnonzero(np.abs(columns['probability_edge']) >= min_edge)
+    order = keep[np.argsort(-np.nan_to_num(key[keep], nan=-np.inf), kind='stable')][:limit]
+
+    def clean(value):
+        value = value.item() if isinstance(value, np.generic) else value
+        return None if isinstance(value, float) and np.isnan(value) else value
+
+    return [{name: clean(values[i]) for name, values in columns.items()} for i in order]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Betting-line ingestion and edge detection")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH)
+    parser.add_argument('--season', type=int, default=CURRENT_SEASON)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    ingest = subparsers.add_parser('ingest')
+    ingest.add_argument('--dir', default=LINES_DIR)
+    ingest.add_argument('--force', action='store_true', help="re-read unchanged files")
+    edges = subparsers.add_parser('edges')
+    edges.add_argument('--week', type=int)
+    edges.add_argument('--limit', type=int, default=20)
+    edges.add_argument('--sort', default='expected_value',
+                       choices=['expected_value', 'probability_edge', 'spread_edge'])
+    args = parser.parse_args()
+
+    data_store = CFBDataStore(args.db)
+    if args.command == 'ingest':
+        ingest_directory(data_store, args.dir, args.season, args.force)
+    else:
+        from app import predictor
+        for edge in top_edges(week_edges(predictor, data_store, args.season, args.week), args.limit, args.sort):
+            ev = 'n/a' if edge['expected_value'] is None else f"{edge['expected_value']:+.3f}"
+            print(f"Week {edge['week']:>2} {edge['away_team']} @ {edge['home_team']} ({edge['provider']}): "
+                  f"bet {edge['bet_side']}, edge {edge['probability_edge']:+.3f}, EV {ev}, "
+                  f"spread edge {edge['spread_edge']:+.1f}")
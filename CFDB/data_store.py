@@ -0,0 +1,670 @@
+#!/usr/bin/env python3
+"""
+Embedded SQLite store for teams, games, weekly team stats, predictions and betting lines
+
+Replaces scanning teams.json, current_season_stats.json, schedule_data.js and
+pickles on every load: the loaders below import those files once, and the
+repository methods answer questions like "all of Utah's games" or "week 7
+Big 12 matchups" with index lookups. The database runs in WAL mode so the
+Flask threads can read while a loader writes; each thread gets its own
+connection, reused across calls.
+
+Any number of seasons can live side by side. Conference memberships are kept
+per season (team_seasons) for seasons imported from CFBD games exports, since
+teams change conferences; seasons without them use the teams table's.
+
+Usage: python3 data_store.py build [--db cfb.db] [--season 2025]
+       python3 data_store.py import-season cfbd_data/games_2023.csv --season 2023
+       python3 data_store.py games --team Utah | --week 7 [--conference "Big 12"]
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from schedule_check import enforce_schedule, read_schedule_js_games
+from team_registry import MAX_UNRESOLVED, TeamRegistry, normalize_team_name
+
+CFDB_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(CFDB_DIR)
+DEFAULT_DB_PATH = os.path.join(CFDB_DIR, 'cfb.db')
+CURRENT_SEASON = 2025
+
+# Same order as STAT_KEYS in app.py
+STAT_COLUMNS = ('ppg', 'papg', 'ypg', 'yapg', 'turnovers', 'takeaways')
+
+# CFBD-style names used in current_season_stats.json -> stat column
+CFBD_STAT_NAMES = {
+    'points_per_game': 'ppg',
+    'points_allowed_per_game': 'papg',
+    'total_yards': 'ypg',
+    'total_yards_allowed': 'yapg',
+    'turnovers': 'turnovers',
+    'takeaways': 'takeaways',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS teams (
+    team_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    conference TEXT
+);
+CREATE INDEX IF NOT EXISTS teams_conference ON teams (conference);
+
+CREATE TABLE IF NOT EXISTS team_aliases (
+    alias_key TEXT PRIMARY KEY,
+    team_id INTEGER NOT NULL REFERENCES teams (team_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS games (
+    game_id INTEGER PRIMARY KEY,
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    home_team_id INTEGER NOT NULL REFERENCES teams (team_id),
+    away_team_id INTEGER NOT NULL REFERENCES teams (team_id),
+    neutral INTEGER NOT NULL DEFAULT 0,
+    home_points REAL,
+    away_points REAL,
+    UNIQUE (season, week, home_team_id, away_team_id)
+);
+CREATE INDEX IF NOT EXISTS games_week ON games (season, week);
+CREATE INDEX IF NOT EXISTS games_home ON games (home_team_id, season, week);
+CREATE INDEX IF NOT EXISTS games_away ON games (away_team_id, season, week);
+
+CREATE TABLE IF NOT EXISTS team_seasons (
+    season INTEGER NOT NULL,
+    team_id INTEGER NOT NULL REFERENCES teams (team_id),
+    conference TEXT,
+    classification TEXT,
+    PRIMARY KEY (season, team_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS team_week_stats (
+    team_id INTEGER NOT NULL REFERENCES teams (team_id),
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    ppg REAL, papg REAL, ypg REAL, yapg REAL, turnovers REAL, takeaways REAL,
+    extra TEXT,
+    PRIMARY KEY (team_id, season, week)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS team_week_stats_season ON team_week_stats (season, week);
+
+CREATE TABLE IF NOT EXISTS predictions (
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    home_team_id INTEGER NOT NULL REFERENCES teams (team_id),
+    away_team_id INTEGER NOT NULL REFERENCES teams (team_id),
+    model_version TEXT NOT NULL,
+    home_win_probability REAL NOT NULL,
+    spread_estimate REAL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (season, week, home_team_id, away_team_id, model_version)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS lines (
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    home_team_id INTEGER NOT NULL REFERENCES teams (team_id),
+    away_team_id INTEGER NOT NULL REFERENCES teams (team_id),
+    provider TEXT NOT NULL,
+    spread REAL,
+    over_under REAL,
+    home_moneyline REAL,
+    away_moneyline REAL,
+    PRIMARY KEY (season, week, home_team_id, away_team_id, provider)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS line_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    rows INTEGER NOT NULL
+);
+"""
+
+GAME_COLUMNS = """
+    g.game_id, g.season, g.week, h.name AS home_team, a.name AS away_team,
+    g.neutral, g.home_points, g.away_points
+"""
+
+class CFBDataStore:
+    """Repository over the SQLite database at path"""
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._unknown_lock = threading.Lock()
+        self.unknown_teams = Counter()
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def connection(self):
+        """This thread's connection, opened on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # Teams
+
+    def load_teams(self, registry):
+        """Insert every registry team and index every spelling it knows"""
+        with self._write_lock, self.connection() as conn:
+            conn.executemany(
+                'INSERT INTO teams (name, conference) VALUES (?, ?) '
+                'ON CONFLICT (name) DO UPDATE SET conference = COALESCE(excluded.conference, conference)',
+                [(name, registry.conferences.get(name)) for name in registry.names]
+            )
+            ids = {row['name']: row['team_id'] for row in conn.execute('SELECT team_id, name FROM teams')}
+            conn.executemany(
+                'INSERT OR REPLACE INTO team_aliases (alias_key, team_id) VALUES (?, ?)',
+                [(normalize_team_name(spelling), ids[registry.names[team_id]])
+                 for spelling, team_id in registry.index.items()]
+            )
+
+    def team_id(self, name):
+        """Team id for any known spelling, or None"""
+        row = self.connection().execute(
+            'SELECT team_id FROM team_aliases WHERE alias_key = ?', (normalize_team_name(name),)
+        ).fetchone()
+        return row['team_id'] if row else None
+
+    def team_ids(self, names):
+        """Ids for names, None for names the store does not know"""
+        return [self.team_id(name) for name in names]
+
+    def register_team_ids(self, names, conn):
+        """Ids for names, registering names the store has never seen as new teams
+
+        Only the schedule loaders (load_teams, load_games) add teams; every
+        other writer skips rows naming a team the store does not know.
+        """
+        ids = []
+        for name in names:
+            team_id = self.team_id(name)
+            if team_id is None:
+                conn.execute('INSERT OR IGNORE INTO teams (name) VALUES (?)', (name,))
+                team_id = conn.execute('SELECT team_id FROM teams WHERE name = ?', (name,)).fetchone()['team_id']
+                conn.execute('INSERT OR IGNORE INTO team_aliases (alias_key, team_id) VALUES (?, ?)',
+                             (normalize_team_name(name), team_id))
+            ids.append(team_id)
+        return ids
+
+    def known_team_ids(self, names):
+        """Ids for names, or None (noting the unknown names) if any of them is not in the store"""
+        ids = self.team_ids(names)
+        unknown = [name for name, team_id in zip(names, ids) if team_id is None]
+        if unknown:
+            self.note_unknown_teams(unknown)
+            return None
+        return ids
+
+    def note_unknown_teams(self, names):
+        """Remember names a writer skipped, keeping at most MAX_UNRESOLVED (least common evicted)"""
+        with self._unknown_lock:
+            for name in names:
+                if name not in self.unknown_teams and len(self.unknown_teams) >= MAX_UNRESOLVED:
+                    del self.unknown_teams[min(self.unknown_teams, key=self.unknown_teams.get)]
+                self.unknown_teams[name] += 1
+
+    def print_unknown_teams(self, source):
+        with self._unknown_lock:
+            report, self.unknown_teams = self.unknown_teams.most_common(), Counter()
+        if report:
+            print(f"⚠️  {len(report)} team name(s) in {source} not in the store (rows skipped):")
+            for name, count in report:
+                print(f"  - {name} ({count})")
+
+    def teams(self, conference=None):
+        """(name, conference) rows, optionally for one conference"""
+        if conference is None:
+            rows = self.connection().execute('SELECT name, conference FROM teams ORDER BY team_id')
+        else:
+            rows = self.connection().execute(
+                'SELECT name, conference FROM teams WHERE conference = ? ORDER BY team_id', (conference,))
+        return [(row['name'], row['conference']) for row in rows]
+
+    def load_season_conferences(self, season, memberships):
+        """Upsert {team: (conference, classification)} for one season; unknown teams are skipped"""
+        with self._write_lock, self.connection() as conn:
+            rows = []
+            for team, (conference, classification) in memberships.items():
+                ids = self.known_team_ids([team])
+                if ids is not None:
+                    rows.append((season, ids[0], conference, classification))
+            conn.executemany('INSERT OR REPLACE INTO team_seasons VALUES (?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def season_conferences(self, season):
+        """{team: (conference, classification)} for a season, empty if it has no memberships"""
+        rows = self.connection().execute("""
+            SELECT t.name, s.conference, s.classification FROM team_seasons s
+            JOIN teams t ON t.team_id = s.team_id
+            WHERE s.season = ? ORDER BY t.team_id
+        """, (season,))
+        return {row['name']: (row['conference'], row['classification']) for row in rows}
+
+    # Games
+
+    def load_games(self, season, games):
+        """Insert (week, home, away[, neutral]) games, keeping the first listing of each pairing per week"""
+        with self._write_lock, self.connection() as conn:
+            seen = set()
+            rows = []
+            for game in games:
+                week, home_team, away_team = int(game[0]), game[1], game[2]
+                neutral = bool(game[3]) if len(game) > 3 else False
+                home_id, away_id = self.register_team_ids([home_team, away_team], conn)
+                key = (week, frozenset((home_id, away_id)))
+                if key not in seen:
+                    seen.add(key)
+                    rows.append((season, week, home_id, away_id, int(neutral)))
+            conn.executemany(
+                'INSERT OR IGNORE INTO games (season, week, home_team_id, away_team_id, neutral) '
+                'VALUES (?, ?, ?, ?, ?)', rows
+            )
+        return len(rows)
+
+    def record_scores(self, season, scores):
+        """Set final scores from (week, home, away, home_points, away_points) tuples
+
+        Returns the number of games each row updated (0 when no game of that
+        week has those home and away teams). Rows naming a team the store
+        does not know update nothing and are noted in unknown_teams.
+        """
+        matched = []
+        with self._write_lock, self.connection() as conn:
+            for week, home_team, away_team, home_points, away_points in scores:
+                ids = self.known_team_ids([home_team, away_team])
+                if ids is None:
+                    matched.append(0)
+                    continue
+                home_id, away_id = ids
+                matched.append(conn.execute(
+                    'UPDATE games SET home_points = ?, away_points = ? '
+                    'WHERE season = ? AND week = ? AND home_team_id = ? AND away_team_id = ?',
+                    (home_points, away_points, season, week, home_id, away_id)
+                ).rowcount)
+        return matched
+
+    def week_scores(self, season, week):
+        """(home, away, home_points, away_points, neutral) for a week's games that have final scores"""
+        rows = self.connection().execute("""
+            SELECT h.name AS home_team, a.name AS away_team, g.home_points, g.away_points, g.neutral FROM games g
+            JOIN teams h ON h.team_id = g.home_team_id
+            JOIN teams a ON a.team_id = g.away_team_id
+            WHERE g.season = ? AND g.week = ? AND g.home_points IS NOT NULL AND g.away_points IS NOT NULL
+            ORDER BY g.game_id
+        """, (season, week))
+        return [tuple(row) for row in rows]
+
+    def results_summary(self, season):
+        """{week: (scores digest, stat snapshots digest)}, to spot weeks whose results changed
+
+        Each digest covers the week's rows in a fixed order, so a corrected
+        score or a rewritten snapshot changes it even when counts and totals stay
+        the same. A week without scores or snapshots has None in that slot.
+        """
+        scores, snapshots = {}, {}
+        for row in self.connection().execute(
+                'SELECT week, home_team_id, away_team_id, neutral, home_points, away_points FROM games '
+                'WHERE season = ? AND home_points IS NOT NULL AND away_points IS NOT NULL ORDER BY week, game_id',
+                (season,)):
+            scores.setdefault(row[0], hashlib.sha1()).update(repr(tuple(row[1:])).encode())
+        for row in self.connection().execute(
+                f'SELECT week, team_id, {", ".join(STAT_COLUMNS)}, extra FROM team_week_stats '
+                'WHERE season = ? ORDER BY week, team_id', (season,)):
+            snapshots.setdefault(row[0], hashlib.sha1()).update(repr(tuple(row[1:])).encode())
+        return {week: (scores[week].hexdigest() if week in scores else None,
+                       snapshots[week].hexdigest() if week in snapshots else None)
+                for week in set(scores) | set(snapshots)}
+
+    def seasons(self):
+        return [row['season'] for row in self.connection().execute('SELECT DISTINCT season FROM games ORDER BY season')]
+
+    def has_games(self, season):
+        return self.connection().execute(
+            'SELECT 1 FROM games WHERE season = ? LIMIT 1', (season,)).fetchone() is not None
+
+    def season_weeks(self, season):
+        return [row['week'] for row in self.connection().execute(
+            'SELECT DISTINCT week FROM games WHERE season = ? ORDER BY week', (season,))]
+
+    def week_games(self, season, week, conference=None):
+        """Games of one week in insertion order; with conference, only games between its members
+
+        Membership is the season's own (team_seasons) where it has one, else
+        the team's current conference.
+        """
+        joins, where, params = '', '', [season, week]
+        if conference is not None:
+            joins = """
+            LEFT JOIN team_seasons hs ON hs.season = g.season AND hs.team_id = g.home_team_id
+            LEFT JOIN team_seasons aws ON aws.season = g.season AND aws.team_id = g.away_team_id
+            """
+            where = 'AND COALESCE(hs.conference, h.conference) = ? AND COALESCE(aws.conference, a.conference) = ?'
+            params += [conference, conference]
+        sql = f"""
+            SELECT {GAME_COLUMNS} FROM games g
+            JOIN teams h ON h.team_id = g.home_team_id
+            JOIN teams a ON a.team_id = g.away_team_id
+            {joins}
+            WHERE g.season = ? AND g.week = ? {where}
+            ORDER BY g.game_id
+        """
+        return [dict(row) for row in self.connection().execute(sql, params)]
+
+    def team_games(self, team, season):
+        """Every game a team plays in a season, by week"""
+        team_id = self.team_id(team)
+        if team_id is None:
+            return []
+        sql = f"""
+            SELECT {GAME_COLUMNS} FROM games g
+            JOIN teams h ON h.team_id = g.home_team_id
+            JOIN teams a ON a.team_id = g.away_team_id
+            WHERE g.home_team_id = ? AND g.season = ?
+            UNION ALL
+            SELECT {GAME_COLUMNS} FROM games g
+            JOIN teams h ON h.team_id = g.home_team_id
+            JOIN teams a ON a.team_id = g.away_team_id
+            WHERE g.away_team_id = ? AND g.season = ?
+            ORDER BY week, game_id
+        """
+        return [dict(row) for row in self.connection().execute(sql, (team_id, season, team_id, season))]
+
+    # Team stats
+
+    def load_team_stats(self, season, week, stats_by_team):
+        """Upsert per-game stats ({team: {stat: value}}) as of a week
+
+        Keys may be STAT_COLUMNS or CFBD names; everything else is kept in extra.
+        Teams the store does not know are skipped and noted in unknown_teams.
+        """
+        rows = []
+        with self._write_lock, self.connection() as conn:
+            for team, stats in stats_by_team.items():
+                values = {column: None for column in STAT_COLUMNS}
+                extra = {}
+                for key, value in stats.items():
+                    column = key if key in STAT_COLUMNS else CFBD_STAT_NAMES.get(key)
+                    if column is not None and isinstance(value, (int, float)):
+                        values[column] = float(value)
+                    else:
+                        extra[key] = value
+                ids = self.known_team_ids([team])
+                if ids is None:
+                    continue
+                rows.append((ids[0], season, week, *values.values(), json.dumps(extra) if extra else None))
+
+            conn.executemany(
+                f'INSERT OR REPLACE INTO team_week_stats (team_id, season, week, {", ".join(STAT_COLUMNS)}, extra) '
+                f'VALUES ({", ".join("?" * (len(STAT_COLUMNS) + 4))})', rows
+            )
+        return len(rows)
+
+    def clear_team_stats(self, season, team, from_week=0):
+        """Delete a team's stats rows for weeks >= from_week; returns the rows deleted"""
+        team_id = self.team_id(team)
+        if team_id is None:
+            return 0
+        with self._write_lock, self.connection() as conn:
+            return conn.execute('DELETE FROM team_week_stats WHERE team_id = ? AND season = ? AND week >= ?',
+                                (team_id, season, from_week)).rowcount
+
+    def team_stats(self, season, week=None):
+        """Latest stats row per team (at or before week), as {team: {stat: value}} without nulls"""
+        week_filter = '' if week is None else 'AND week <= ?'
+        params = [season] + ([] if week is None else [week])
+        sql = f"""
+            SELECT t.name, s.* FROM team_week_stats s
+            JOIN teams t ON t.team_id = s.team_id
+            WHERE s.season = ? {week_filter}
+              AND s.week = (SELECT MAX(week) FROM team_week_stats
+                            WHERE team_id = s.team_id AND season = s.season {week_filter})
+            ORDER BY t.team_id
+        """
+        stats = {}
+        for row in self.connection().execute(sql, params + params[1:]):
+            stats[row['name']] = {column: row[column] for column in STAT_COLUMNS if row[column] is not None}
+        return stats
+
+    def week_team_stats(self, season, week):
+        """Stats rows stamped exactly at week, as {team: {stat: value}} without nulls"""
+        sql = """
+            SELECT t.name, s.* FROM team_week_stats s
+            JOIN teams t ON t.team_id = s.team_id
+            WHERE s.season = ? AND s.week = ?
+            ORDER BY t.team_id
+        """
+        return {row['name']: {column: row[column] for column in STAT_COLUMNS if row[column] is not None}
+                for row in self.connection().execute(sql, (season, week))}
+
+    # Predictions
+
+    def record_predictions(self, season, predictions, model_version):
+        """Upsert prediction dicts (home_team, away_team, week, home_win_probability[, spread_estimate])
+
+        Predictions naming a team the store does not know are skipped and noted in unknown_teams.
+        """
+        now = time.time()
+        with self._write_lock, self.connection() as conn:
+            rows = []
+            for prediction in predictions:
+                ids = self.known_team_ids([prediction['home_team'], prediction['away_team']])
+                if ids is None:
+                    continue
+                home_id, away_id = ids
+                rows.append((season, int(prediction.get('week', 1)), home_id, away_id, model_version,
+                             float(prediction['home_win_probability']), prediction.get('spread_estimate'), now))
+            conn.executemany('INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def predictions(self, season, week, model_version=None):
+        sql = """
+            SELECT p.season, p.week, h.name AS home_team, a.name AS away_team, p.model_version,
+                   p.home_win_probability, p.spread_estimate, p.created_at
+            FROM predictions p
+            JOIN teams h ON h.team_id = p.home_team_id
+            JOIN teams a ON a.team_id = p.away_team_id
+            WHERE p.season = ? AND p.week = ?
+        """
+        params = [season, week]
+        if model_version is not None:
+            sql += ' AND p.model_version = ?'
+            params.append(model_version)
+        return [dict(row) for row in self.connection().execute(sql, params)]
+
+    # Betting lines
+
+    def upsert_lines(self, rows):
+        """Insert or update (season, week, home_id, away_id, provider, spread, over_under,
+        home_moneyline, away_moneyline) rows; the last row per game and provider wins"""
+        with self._write_lock, self.connection() as conn:
+            conn.executemany(
+                'INSERT INTO lines VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (season, week, home_team_id, away_team_id, provider) DO UPDATE SET '
+                'spread = excluded.spread, over_under = excluded.over_under, '
+                'home_moneyline = excluded.home_moneyline, away_moneyline = excluded.away_moneyline',
+                rows
+            )
+
+    def lines(self, season, week=None):
+        """Every provider's line for a season (or one week), with team names"""
+        sql = """
+            SELECT l.season, l.week, h.name AS home_team, a.name AS away_team, l.provider,
+                   l.spread, l.over_under, l.home_moneyline, l.away_moneyline
+            FROM lines l
+            JOIN teams h ON h.team_id = l.home_team_id
+            JOIN teams a ON a.team_id = l.away_team_id
+            WHERE l.season = ?
+        """
+        params = [season]
+        if week is not None:
+            sql += ' AND l.week = ?'
+            params.append(week)
+        return [dict(row) for row in self.connection().execute(sql + ' ORDER BY l.week, l.home_team_id', params)]
+
+    def line_file_unchanged(self, path, size, mtime_ns):
+        row = self.connection().execute(
+            'SELECT size, mtime_ns FROM line_files WHERE path = ?', (path,)).fetchone()
+        return row is not None and row['size'] == size and row['mtime_ns'] == mtime_ns
+
+    def mark_line_file(self, path, size, mtime_ns, rows):
+        with self._write_lock, self.connection() as conn:
+            conn.execute('INSERT OR REPLACE INTO line_files VALUES (?, ?, ?, ?)', (path, size, mtime_ns, rows))
+
+# Loaders for the existing data files
+
+def read_current_season_stats(path):
+    """{team: stats} from current_season_stats.json"""
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+def read_teams_json_stats(path):
+    """{team: currentSeasonStats} from teams.json, for teams that have them"""
+    with open(path, 'r', encoding='utf-8') as file:
+        teams = json.load(file)
+    return {name: team['currentSeasonStats'] for name, team in teams.items() if team.get('currentSeasonStats')}
+
+# CFBD games export (camelCase or snake_case) -> field
+CFBD_GAME_FIELDS = {
+    'week': 'week', 'seasonType': 'season_type', 'season_type': 'season_type',
+    'homeTeam': 'home_team', 'home_team': 'home_team', 'awayTeam': 'away_team', 'away_team': 'away_team',
+    'homePoints': 'home_points', 'home_points': 'home_points',
+    'awayPoints': 'away_points', 'away_points': 'away_points',
+    'neutralSite': 'neutral', 'neutral_site': 'neutral',
+    'homeConference': 'home_conference', 'home_conference': 'home_conference',
+    'awayConference': 'away_conference', 'away_conference': 'away_conference',
+    'homeClassification': 'home_classification', 'home_classification': 'home_classification',
+    'home_division': 'home_classification',
+    'awayClassification': 'away_classification', 'away_classification': 'away_classification',
+    'away_division': 'away_classification',
+}
+
+# CFBD conference names that differ from the registry's
+CFBD_CONFERENCE_NAMES = {
+    'American Athletic': 'American',
+    'Mid-American': 'MAC',
+    'FBS Independents': 'Independents',
+}
+
+def read_cfbd_games(path):
+    """Game dicts from a CFBD games CSV; postseason weeks are numbered after the regular season"""
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        games = [{CFBD_GAME_FIELDS[key]: value for key, value in row.items() if key in CFBD_GAME_FIELDS}
+                 for row in csv.DictReader(file)]
+    games = [game for game in games if game.get('home_team') and game.get('away_team') and game.get('week')]
+
+    def number(value):
+        return float(value) if value not in (None, '') else None
+
+    regular_weeks = [int(game['week']) for game in games if game.get('season_type', 'regular') != 'postseason']
+    last_regular_week = max(regular_weeks, default=0)
+    for game in games:
+        game['week'] = int(game['week'])
+        if game.get('season_type') == 'postseason':
+            game['week'] += last_regular_week
+        game['neutral'] = str(game.get('neutral', '')).lower() in ('true', '1', 'yes')
+        game['home_points'] = number(game.get('home_points'))
+        game['away_points'] = number(game.get('away_points'))
+    return games
+
+def import_season_games(store, season, path, registry=None):
+    """Load a season's schedule, final scores and conference memberships from a CFBD games CSV"""
+    registry = registry or TeamRegistry()
+    games = read_cfbd_games(path)
+    for game in games:
+        game['home_team'] = registry.canonical_name(game['home_team'])
+        game['away_team'] = registry.canonical_name(game['away_team'])
+
+    memberships = {}
+    for game in games:
+        for side in ('home', 'away'):
+            if game.get(f'{side}_conference'):
+                conference = CFBD_CONFERENCE_NAMES.get(game[f'{side}_conference'], game[f'{side}_conference'])
+                memberships[game[f'{side}_team']] = (conference,
+                                                     (game.get(f'{side}_classification') or '').lower() or None)
+
+    loaded = store.load_games(season, [(game['week'], game['home_team'], game['away_team'], game['neutral'])
+                                       for game in games])
+    store.record_scores(season, [(game['week'], game['home_team'], game['away_team'],
+                                  game['home_points'], game['away_points'])
+                                 for game in games
+                                 if game['home_points'] is not None and game['away_points'] is not None])
+    store.load_season_conferences(season, memberships)
+    return loaded
+
+def build_store(store, season=CURRENT_SEASON, schedule_js=None, stats_json=None, teams_json=None, week=0):
+    """Load the repo's data files into the store; week stamps the stats snapshots"""
+    registry = TeamRegistry()
+    store.load_teams(registry)
+    print(f"✓ {len(registry)} teams, {len(registry.index)} spellings")
+
+    if schedule_js and os.path.exists(schedule_js):
+        listings = [dict(game, home=registry.canonical_name(game['home']), away=registry.canonical_name(game['away']))
+                    for game in read_schedule_js_games(schedule_js)]
+        games, _ = enforce_schedule(listings, schedule_js, registry)
+        games = [(game['week'], game['home'], game['away']) for game in games]
+        print(f"✓ {store.load_games(season, games)} games from {schedule_js}")
+
+    # teams.json first so current_season_stats.json wins where both have a team
+    for path, reader in ((teams_json, read_teams_json_stats), (stats_json, read_current_season_stats)):
+        if path and os.path.exists(path):
+            stats = {registry.canonical_name(team): values for team, values in reader(path).items()}
+            print(f"✓ {store.load_team_stats(season, week, stats)} team stat rows from {path}")
+
+    registry.print_unresolved("the data files")
+    store.print_unknown_teams("the data files")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SQLite data store")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH)
+    parser.add_argument('--season', type=int, default=CURRENT_SEASON)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help="load the repo's data files")
+    build.add_argument('--schedule-js', default=os.path.join(REPO_DIR, 'schedule_data.js'))
+    build.add_argument('--stats-json', default=os.path.join(REPO_DIR, 'current_season_stats.json'))
+    build.add_argument('--teams-json', default=os.path.join(REPO_DIR, 'teams.json'))
+    build.add_argument('--week', type=int, default=0, help="week the stats snapshot is as of")
+    import_season = subparsers.add_parser('import-season', help="load a CFBD games CSV as one season")
+    import_season.add_argument('path')
+    games = subparsers.add_parser('games', help="query games by team or week")
+    games.add_argument('--team')
+    games.add_argument('--week', type=int)
+    games.add_argument('--conference')
+    args = parser.parse_args()
+
+    data_store = CFBDataStore(args.db)
+    if args.command == 'build':
+        build_store(data_store, args.season, args.schedule_js, args.stats_json, args.teams_json, args.week)
+    elif args.command == 'import-season':
+        registry = TeamRegistry()
+        data_store.load_teams(registry)
+        print(f"✓ {import_season_games(data_store, args.season, args.path, registry)} games from {args.path}")
+        registry.print_unresolved(args.path)
+    else:
+        if args.team:
+            rows = data_store.team_games(args.team, args.season)
+        else:
+            rows = data_store.week_games(args.season, args.week or 1, args.conference)
+        for row in rows:
+            print(f"Week {row['week']:>2}: {row['away_team']} @ {row['home_team']}")
+        print(f"{len(rows)} game(s)")
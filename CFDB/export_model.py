@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Export trained models to plain NumPy arrays so the Flask app can serve them
+without importing scikit-learn or pandas
+
+Usage: python3 export_model.py [cfb_prediction_model_2025_updated.pkl] [output.npz]
+       python3 export_model.py --check-trees
+       python3 export_model.py --check-explain
+"""
+
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+def fold_linear_model(model, scaler=None):
+    """Fold StandardScaler into the logistic coefficients
+
+    sigmoid(((x - mean) / scale) @ coef + intercept) == sigmoid(x @ w + b)
+    with w = coef / scale and b = intercept - (mean / scale) @ coef.
+    """
+    coef = np.asarray(model.coef_, dtype=float).ravel()
+    intercept = float(np.asarray(model.intercept_, dtype=float).ravel()[0])
+
+    if scaler is None:
+        return coef, intercept
+
+    mean = scaler.mean_ if getattr(scaler, 'mean_', None) is not None else np.zeros_like(coef)
+    scale = scaler.scale_ if getattr(scaler, 'scale_', None) is not None else np.ones_like(coef)
+    weights = coef / scale
+    bias = intercept - float(np.dot(mean / scale, coef))
+    return weights, bias
+
+def export_linear_model(model, scaler, feature_columns, model_name, path):
+    """Write the folded model as an .npz the app's LinearModelKernel can load
+
+    The scaler's feature means are kept too: weights * (x - mean) is each
+    feature's coef x scaled feature, which the app returns as explanations.
+    """
+    weights, bias = fold_linear_model(model, scaler)
+    mean = getattr(scaler, 'mean_', None) if scaler is not None else None
+    np.savez(
+        path,
+        kind=np.array('linear'),
+        weights=weights,
+        bias=np.array([bias]),
+        mean=np.zeros_like(weights) if mean is None else np.asarray(mean, dtype=float),
+        feature_columns=np.array(list(feature_columns)),
+        model_name=np.array(model_name),
+    )
+    return path
+
+def flatten_trees(trees):
+    """Concatenate fitted sklearn trees into contiguous node arrays
+    
+    Child indices are offset so every tree lives in the same arrays; leaves
+    have left == right == -1. Returns the arrays and the raw tree_.value rows.
+    """
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+
+    for tree in trees:
+        t = tree.tree_
+        is_leaf = t.children_left == -1
+        roots.append(offset)
+        features.append(np.where(is_leaf, 0, t.feature))
+        thresholds.append(t.threshold)
+        lefts.append(np.where(is_leaf, -1, t.children_left + offset))
+        rights.append(np.where(is_leaf, -1, t.children_right + offset))
+        values.append(t.value[:, 0, :])
+        offset += t.node_count
+        max_depth = max(max_depth, t.max_depth)
+
+    arrays = {
+        'feature': np.concatenate(features).astype(np.int32),
+        'threshold': np.concatenate(thresholds).astype(np.float64),
+        'left': np.concatenate(lefts).astype(np.int32),
+        'right': np.concatenate(rights).astype(np.int32),
+        'roots': np.array(roots, dtype=np.int32),
+        'max_depth': np.array(max_depth),
+    }
+    return arrays, np.concatenate(values)
+
+def export_tree_ensemble(model, feature_columns, model_name, path):
+    """Write a fitted RandomForest or GradientBoosting classifier for the app's TreeEnsembleKernel"""
+    from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+
+    if isinstance(model, RandomForestClassifier):
+        arrays, values = flatten_trees(model.estimators_)
+        # Leaf value = class-1 fraction; the forest averages these
+        arrays['value'] = values[:, 1] / values.sum(axis=1)
+        arrays['kind'] = np.array('forest')
+        arrays['init_score'] = np.array(0.0)
+        arrays['learning_rate'] = np.array(1.0)
+    elif isinstance(model, GradientBoostingClassifier):
+        arrays, values = flatten_trees(model.estimators_[:, 0])
+        # Leaf value = regression output; log-odds = init + learning_rate * sum.
+        # The init estimator ('prior' by default) ignores X; 'zero' starts at log-odds 0
+        if model.init_ == 'zero':
+            init_score = 0.0
+        else:
+            init_prob = model.init_.predict_proba(np.zeros((1, model.n_features_in_)))[0, 1]
+            init_score = np.log(init_prob / (1 - init_prob))
+        arrays['value'] = values[:, 0]
+        arrays['kind'] = np.array('boosting')
+        arrays['init_score'] = np.array(float(init_score))
+        arrays['learning_rate'] = np.array(float(model.learning_rate))
+    else:
+        raise ValueError(f"Unsupported tree model: {type(model).__name__}")
+
+    np.savez(path, feature_columns=np.array(list(feature_columns)),
+             model_name=np.array(model_name), **arrays)
+    return path
+
+def export_model_package(package, path):
+    """Export a saved model package dict (as written by save_model_files)"""
+    model = package['model']
+    model_name = package.get('model_name', 'Unknown')
+    if hasattr(model, 'estimators_'):
+        return export_tree_ensemble(model, package['feature_columns'], model_name, path)
+    return export_linear_model(model, package.get('scaler'), package['feature_columns'], model_name, path)
+
+def per_call(fn, repeats=2000):
+    """Microseconds per call of fn"""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+def verify_tree_export(n_features=44, samples=2000, slate_size=80):
+    """Fit RandomForest and GradientBoosting as train_models_new_approach does,
+    export them and check the flattened kernel against sklearn"""
+    from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from app import load_model_kernel
+
+    rng = np.random.default_rng(42)
+    X = rng.standard_normal((samples, n_features)) * 10
+    y = (X[:, 0] - X[:, 1] + rng.standard_normal(samples) * 10 > 0).astype(int)
+    X_test = rng.standard_normal((samples, n_features)) * 10
+    columns = [f'feature_{i}' for i in range(n_features)]
+
+    models = {
+        'Random Forest': RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42),
+        'Gradient Boosting': GradientBoostingClassifier(n_estimators=100, max_depth=6, random_state=42),
+    }
+
+    errors = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, model in models.items():
+            model.fit(X, y)
+            path = export_tree_ensemble(model, columns, name, os.path.join(tmp_dir, 'trees.npz'))
+            kernel = load_model_kernel(path)
+
+            errors[name] = float(np.max(np.abs(model.predict_proba(X_test)[:, 1] - kernel.predict_proba(X_test))))
+            print(f"🧪 {name}: max |sklearn - kernel| over {samples} samples: {errors[name]:.2e}")
+
+            row, slate = X_test[:1], X_test[:slate_size]
+            print(f"⏱️  {name} single game: sklearn {per_call(lambda: model.predict_proba(row), 200):.0f} µs, "
+                  f"kernel {per_call(lambda: kernel.predict_proba(row), 200):.0f} µs")
+            print(f"⏱️  {name} {slate_size}-game slate: sklearn {per_call(lambda: model.predict_proba(slate), 200):.0f} µs, "
+                  f"kernel {per_call(lambda: kernel.predict_proba(slate), 200):.0f} µs")
+
+    return errors
+
+def verify_export(pkl_path, npz_path, samples=1000):
+    """Check the exported kernel against sklearn and time startup and latency"""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from app import load_model_kernel
+
+    with open(pkl_path, 'rb') as f:
+        package = pickle.load(f)
+    model, scaler = package['model'], package['scaler']
+    kernel = load_model_kernel(npz_path)
+
+    rng = np.random.default_rng(42)
+    X = scaler.mean_ + rng.standard_normal((samples, len(kernel.weights))) * scaler.scale_ * 2
+
+    expected = model.predict_proba(scaler.transform(X))[:, 1]
+    actual = kernel.predict_proba(X)
+    max_error = float(np.max(np.abs(expected - actual)))
+    print(f"🧪 Max |sklearn - kernel| over {samples} samples: {max_error:.2e}")
+
+    contribution_error = float(np.max(np.abs(scaler.transform(X) * model.coef_.ravel() - kernel.contributions(X))))
+    print(f"🧪 Max |coef x scaled feature - kernel contribution|: {contribution_error:.2e}")
+
+    row = X[:1]
+    print(f"⏱️  Single game: sklearn {per_call(lambda: model.predict_proba(scaler.transform(row))):.1f} µs, "
+          f"kernel {per_call(lambda: kernel.predict_proba(row)):.1f} µs")
+    slate = X[:80]
+    print(f"⏱️  80-game slate: sklearn {per_call(lambda: model.predict_proba(scaler.transform(slate))):.1f} µs, "
+          f"kernel {per_call(lambda: kernel.predict_proba(slate)):.1f} µs")
+
+    def startup(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True, capture_output=True)
+        return time.perf_counter() - start
+
+    pickle_startup = startup(f"import pickle; pickle.load(open({pkl_path!r}, 'rb'))")
+    kernel_startup = startup(f"import numpy as np; dict(np.load({npz_path!r}))")
+    print(f"🚀 Cold start to loaded model: pickle+sklearn {pickle_startup:.2f}s, numpy kernel {kernel_startup:.2f}s")
+
+    return max_error
+
+def verify_explanations(week=1, explain_top=5):
+    """Explain a week's slate with the served model; returns the number of failures
+    
+    Without every trained feature built the app must refuse explain (400);
+    otherwise every contribution is checked against the kernel's weights.
+    """
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from app import app, predictor
+
+    kernel = predictor.kernel
+    if not predictor.can_explain():
+        response = app.test_client().post('/predict_single', json={
+            'home_team': 'Alabama', 'away_team': 'Georgia', 'week': week, 'explain': True})
+        status = '✅' if response.status_code == 400 else '❌'
+        reason = 'no linear kernel loaded' if kernel is None else 'model features not all built'
+        print(f"{status} explain refused with {response.status_code} ({reason})")
+        return 0 if response.status_code == 400 else 1
+
+    matchups = [(game['home_team'], game['away_team'], week) for game in predictor.get_week_matchups(week)]
+    rows = predictor.predict_games_batch(matchups, explain_top=explain_top)
+    index = {col: j for j, col in enumerate(kernel.feature_columns)}
+
+    errors = 0
+    for row in rows:
+        explanation = row.get('explanation')
+        if explanation is None or 'model_home_win_probability' not in row:
+            errors += 1
+            continue
+        for feature, value, contribution in zip(explanation['features'], explanation['values'],
+                                                explanation['contributions']):
+            j = index[feature]
+            if abs(contribution - (value - kernel.mean[j]) * kernel.weights[j]) > 1e-9:
+                errors += 1
+
+    status = '✅' if errors == 0 else '❌'
+    print(f"{status} explanations for {len(rows)} week {week} games: {errors} mismatches")
+    return errors
+
+if __name__ == "__main__":
+    if '--check-trees' in sys.argv:
+        verify_tree_export()
+        sys.exit(0)
+
+    if '--check-explain' in sys.argv:
+        sys.exit(1 if verify_explanations() else 0)
+
+    pkl_file = sys.argv[1] if len(sys.argv) > 1 else 'cfb_prediction_model_2025_updated.pkl'
+    npz_file = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(pkl_file)[0] + '.npz'
+
+    with open(pkl_file, 'rb') as f:
+        model_package = pickle.load(f)
+
+    export_model_package(model_package, npz_file)
+    print(f"✅ Exported {model_package.get('model_name', 'model')} to {npz_file}")
+
+    verify_export(pkl_file, npz_file)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Point-in-time weekly team features
+
+Row [team, week] of WeeklyFeatureStore.features holds what was known about a
+team before that week's games: season-to-date and rolling-window values of
+the STAT_COLUMNS stats, built from final scores and in-season stat snapshots
+of earlier weeks only. An as-of prediction is then two row lookups plus a
+diff, and a week-3 prediction never sees week-5 results.
+
+Weeks are folded in as their results arrive. Folding week w recomputes only
+the columns after w, each from the previous column's running totals, so
+earlier weeks are never rescanned.
+
+Usage: python3 feature_store.py [--team Utah]   (print a team's weekly features)
+"""
+
+import argparse
+
+import numpy as np
+
+from data_store import CURRENT_SEASON, DEFAULT_DB_PATH, STAT_COLUMNS, CFBDataStore
+
+MAX_WEEK = 20
+# Rolling window length in weeks
+ROLLING_WEEKS = 3
+# Preseason stats count as this many games when averaging in real scores
+PRIOR_GAMES = 2
+
+PPG = STAT_COLUMNS.index('ppg')
+PAPG = STAT_COLUMNS.index('papg')
+
+class WeeklyFeatureStore:
+    """Per-team, per-week feature vectors in one contiguous (teams, weeks, 2 * stats) array
+
+    The last axis is season-to-date stats followed by rolling-window stats,
+    both in STAT_COLUMNS order. prior holds each team's preseason stat row;
+    week 0 (and any week with no earlier results) equals it.
+    """
+    def __init__(self, prior, max_week=MAX_WEEK, rolling_weeks=ROLLING_WEEKS, prior_games=PRIOR_GAMES):
+        teams, stats = prior.shape
+        self.prior = np.asarray(prior, dtype=float)
+        self.max_week = max_week
+        self.rolling_weeks = rolling_weeks
+        self.prior_games = prior_games
+        self.stats = stats
+
+        # Observations of each week (inputs)
+        self.week_points = np.zeros((teams, max_week + 1, 2))
+        self.week_games = np.zeros((teams, max_week + 1))
+        self.week_snapshots = np.full((teams, max_week + 1, stats), np.nan)
+
+        # Running totals of everything before each week (column w excludes week w)
+        self.cum_points = np.zeros((teams, max_week + 1, 2))
+        self.cum_games = np.zeros((teams, max_week + 1))
+        self.latest_snapshot = np.full((teams, max_week + 1, stats), np.nan)
+
+        self.features = np.empty((teams, max_week + 1, 2 * stats))
+        self.features[:, :, :stats] = self.prior[:, None, :]
+        self.features[:, :, stats:] = self.prior[:, None, :]
+
+        self.summary = {}
+
+    def week_index(self, weeks):
+        return np.clip(np.asarray(weeks, dtype=int), 0, self.max_week)
+
+    def rows(self, team_idx, weeks):
+        """Season-to-date stat rows as of each (team, week)"""
+        return self.features[team_idx, self.week_index(weeks), :self.stats]
+
+    def rolling_rows(self, team_idx, weeks):
+        return self.features[team_idx, self.week_index(weeks), self.stats:]
+
+    def record_week(self, week, home_idx, away_idx, home_points, away_points,
+                    snapshot_idx=(), snapshot_values=None, refresh=True):
+        """Replace week's results (scores, optional stat snapshot rows) and refresh later columns"""
+        if not 0 <= week <= self.max_week:
+            raise ValueError(f"Week {week} outside 0..{self.max_week}")
+
+        home_idx = np.asarray(home_idx, dtype=np.intp)
+        away_idx = np.asarray(away_idx, dtype=np.intp)
+        home_points = np.asarray(home_points, dtype=float)
+        away_points = np.asarray(away_points, dtype=float)
+
+        self.week_points[:, week] = 0.0
+        self.week_games[:, week] = 0.0
+        np.add.at(self.week_points[:, week], home_idx, np.column_stack([home_points, away_points]))
+        np.add.at(self.week_points[:, week], away_idx, np.column_stack([away_points, home_points]))
+        np.add.at(self.week_games[:, week], home_idx, 1.0)
+        np.add.at(self.week_games[:, week], away_idx, 1.0)
+
+        # Week-0 snapshots are the preseason prior, not in-season results
+        self.week_snapshots[:, week] = np.nan
+        if week > 0 and len(snapshot_idx):
+            self.week_snapshots[np.asarray(snapshot_idx, dtype=np.intp), week] = snapshot_values
+
+        if refresh:
+            self.refresh(week)
+
+    def refresh(self, week):
+        """Recompute the columns after week from the running totals at week"""
+        for column in range(week + 1, self.max_week + 1):
+            previous = column - 1
+            self.cum_points[:, column] = self.cum_points[:, previous] + self.week_points[:, previous]
+            self.cum_games[:, column] = self.cum_games[:, previous] + self.week_games[:, previous]
+            snapshot = self.week_snapshots[:, previous]
+            self.latest_snapshot[:, column] = np.where(np.isnan(snapshot), self.latest_snapshot[:, previous], snapshot)
+            self.features[:, column] = self.column_features(column)
+
+    def column_features(self, column):
+        """Season-to-date and rolling stats from everything before week column"""
+        games = self.cum_games[:, column]
+        points = self.cum_points[:, column]
+        snapshot = self.latest_snapshot[:, column]
+
+        # In-season snapshots replace the prior; real scores then decide ppg/papg,
+        # shrunk toward the preseason value while the sample is small
+        season = np.where(np.isnan(snapshot), self.prior, snapshot)
+        pace = (self.prior[:, [PPG, PAPG]] * self.prior_games + points) / (self.prior_games + games[:, None])
+        season[:, [PPG, PAPG]] = np.where(games[:, None] > 0, pace, season[:, [PPG, PAPG]])
+
+        start = max(column - self.rolling_weeks, 0)
+        window_games = games - self.cum_games[:, start]
+        window_points = points - self.cum_points[:, start]
+        rolling = season.copy()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rolling[:, [PPG, PAPG]] = np.where(window_games[:, None] > 0, window_points / window_games[:, None],
+                                               season[:, [PPG, PAPG]])
+
+        return np.concatenate([season, rolling], axis=1)
+
+    def catch_up(self, store, season, team_row):
+        """Fold weeks whose results in store changed since the last call; returns the weeks folded
+
+        team_row maps a team name to its row in prior, or None for teams the
+        table does not know (their results are skipped).
+        """
+        summary = store.results_summary(season)
+        changed = sorted(week for week in set(summary) | set(self.summary)
+                         if summary.get(week) != self.summary.get(week) and 0 <= week <= self.max_week)
+
+        def rows(names):
+            return np.array([-1 if team_row(name) is None else team_row(name) for name in names], dtype=np.intp)
+
+        for week in changed:
+            scores = store.week_scores(season, week)
+            home_idx = rows([score[0] for score in scores])
+            away_idx = rows([score[1] for score in scores])
+            points = np.array([score[2:4] for score in scores], dtype=float).reshape(-1, 2)
+            scored = (home_idx >= 0) & (away_idx >= 0)
+
+            snapshots = store.week_team_stats(season, week) if week > 0 else {}
+            snapshot_idx = rows(snapshots)
+            snapshot_values = np.array([[stats.get(stat, np.nan) for stat in STAT_COLUMNS]
+                                        for stats in snapshots.values()], dtype=float).reshape(-1, self.stats)
+            known = snapshot_idx >= 0
+
+            self.record_week(week, home_idx[scored], away_idx[scored], points[scored, 0], points[scored, 1],
+                             snapshot_idx[known], snapshot_values[known], refresh=False)
+
+        # One pass over the columns after the earliest changed week
+        if changed:
+            self.refresh(changed[0])
+        self.summary = summary
+        return changed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Point-in-time weekly team features")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH)
+    parser.add_argument('--season', type=int, default=CURRENT_SEASON)
+    parser.add_argument('--team', default='Utah')
+    args = parser.parse_args()
+
+    from app import predictor
+    if args.db != DEFAULT_DB_PATH:
+        predictor.store = CFBDataStore(args.db)
+        predictor.seasons.clear()
+
+    features = predictor.season_data(args.season).features
+    row = predictor.team_row(args.team, args.season)
+    print(f"📈 {args.team}: season-to-date | rolling {ROLLING_WEEKS} weeks  ({', '.join(STAT_COLUMNS)})")
+    for week in range(1, max(predictor.store.season_weeks(args.season) or [1]) + 1):
+        season_row = features.rows(row, week)
+        rolling_row = features.rolling_rows(row, week)
+        print(f"  Week {week:>2}: " + ' '.join(f'{value:6.1f}' for value in season_row) +
+              ' | ' + ' '.join(f'{value:6.1f}' for value in rolling_row))
@@ -1,50 +1,34 @@
 #!/usr/bin/env python3
-import csv
 import json
 from datetime import datetime, timedelta
 
-def parse_csv_schedule():
-    """Parse the CSV file and organize games by week"""
+from schedule_check import enforce_schedule, read_schedule_csv
+from team_registry import TeamRegistry
+
+def parse_csv_schedule(csv_path='2025_college_football_schedules.csv', registry=None):
+    """Parse the CSV file and organize games by week, with canonical team names
+    
+    Each game appears once per team in the CSV; the schedule check keeps the
+    first listing and drops double bookings and repeated matchups.
+    """
     schedule = {}
+    registry = registry or TeamRegistry()
+    listings = [dict(game, home=registry.canonical_name(game['home']), away=registry.canonical_name(game['away']))
+                for game in read_schedule_csv(csv_path)]
+    games, _ = enforce_schedule(listings, csv_path, registry, listed_by_both=True)
     
-    with open('2025_college_football_schedules.csv', 'r') as file:
-        reader = csv.DictReader(file)
-        
-        for row in reader:
-            team = row['Team']
-            week = int(row['Week'])
-            opponent = row['Opponent']
-            home_away = row['Home_Away']
-            
-            if week not in schedule:
-                schedule[week] = []
-            
-            # Determine home and away teams
-            if home_away == 'Home':
-                home_team = team
-                away_team = opponent
-            else:  # Away
-                home_team = opponent
-                away_team = team
-            
-            # Check if this game is already added (avoid duplicates)
-            game_exists = any(
-                (g['home'] == home_team and g['away'] == away_team) or
-                (g['home'] == away_team and g['away'] == home_team)
-                for g in schedule[week]
-            )
-            
-            if not game_exists:
-                # Generate game details
-                game = {
-                    'home': home_team,
-                    'away': away_team,
-                    'location': f'{home_team} Stadium',
-                    'time': 'TBD',
-                    'tv': 'TBD',
-                    'date': f'Saturday, Week {week}, 2025'
-                }
-                schedule[week].append(game)
+    for game in games:
+        week = game['week']
+        if week not in schedule:
+            schedule[week] = []
+        schedule[week].append({
+            'home': game['home'],
+            'away': game['away'],
+            'location': f"{game['home']} Stadium",
+            'time': 'TBD',
+            'tv': 'TBD',
+            'date': f'Saturday, Week {week}, 2025'
+        })
     
     return schedule
 
@@ -200,9 +184,11 @@ def generate_times_and_tv():
     
     return times, tv_networks
 
-def generate_complete_schedule():
+def generate_complete_schedule(csv_path='2025_college_football_schedules.csv'):
     """Generate the complete schedule for all weeks"""
-    schedule = parse_csv_schedule()
+    registry = TeamRegistry()
+    schedule = parse_csv_schedule(csv_path, registry)
+    registry.print_unresolved(csv_path)
     stadiums = generate_stadium_names()
     times, tv_networks = generate_times_and_tv()
     
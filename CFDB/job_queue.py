@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Local background jobs for long-running work
+
+Season simulations, backtests and retrains run in a process pool instead of a
+Flask request thread. Jobs wait in a priority queue (higher priority first,
+then oldest first) and at most max_workers run at once. Submitting a job with
+the same kind, parameters and inputs as one that is still queued or running
+returns the existing job instead of starting another.
+
+Every job has a directory under jobs_dir holding job.json (status),
+inputs.json, progress.json (written by the worker as it goes) and, once it
+has finished, result.json. Finished jobs survive a restart; jobs that were
+queued or running when the process stopped are queued again.
+
+Cancelling a queued job removes it from the queue. A running job is asked to
+stop through a flag file that it checks whenever it reports progress.
+
+Parameters are checked against a per-kind whitelist when a job is submitted.
+Data directories and worker counts are fixed here, never taken from a
+request: jobs read cfbd_data and run single-process inside their worker.
+
+Usage: python3 job_queue.py [--jobs-dir jobs] list
+       python3 job_queue.py run backtest --params '{"years": [2023, 2024]}'
+"""
+
+import argparse
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+import numpy as np
+
+DEFAULT_JOBS_DIR = 'jobs'
+DEFAULT_MAX_WORKERS = 2
+SIMULATION_CHUNK = 1000
+BOWL_ELIGIBLE_WINS = 6
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+# Bounds on submitted job parameters
+MAX_SIMULATIONS = 1_000_000
+MIN_YEAR, MAX_YEAR = 2000, 2100
+
+class JobCancelled(Exception):
+    pass
+
+def write_json(path, data):
+    """Write JSON through a temporary file so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp_')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def read_json(path, default=None):
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+def timestamp():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+class JobProgress:
+    """Progress callback handed to a job; raises JobCancelled once a cancel is requested"""
+    def __init__(self, job_dir):
+        self.path = os.path.join(job_dir, 'progress.json')
+        self.cancel_path = os.path.join(job_dir, 'cancel')
+
+    def __call__(self, fraction, message=''):
+        if os.path.exists(self.cancel_path):
+            raise JobCancelled()
+        write_json(self.path, {'fraction': round(float(fraction), 4), 'message': message,
+                               'updated_at': timestamp()})
+
+def check_int(name, value, low, high):
+    if isinstance(value, bool) or not isinstance(value, int) or not low <= value <= high:
+        raise ValueError(f"{name} must be an integer from {low} to {high}, got {value!r}")
+    return value
+
+def check_choices(name, values, choices):
+    if not isinstance(values, list) or not all(isinstance(value, str) and value in choices for value in values):
+        raise ValueError(f"{name} must be a list drawn from {', '.join(choices)}, got {values!r}")
+    return values
+
+def check_years(name, years):
+    if not isinstance(years, list) or not years:
+        raise ValueError(f"{name} must be a non-empty list of seasons, got {years!r}")
+    return [check_int(name, year, MIN_YEAR, MAX_YEAR) for year in years]
+
+def check_training(name, training):
+    """Overrides of training_pipeline.TRAINING_PARAMS, typed like the defaults"""
+    from training_pipeline import TRAINING_PARAMS
+
+    if not isinstance(training, dict):
+        raise ValueError(f"{name} must be an object of training parameters, got {training!r}")
+    for key, value in training.items():
+        if key not in TRAINING_PARAMS:
+            raise ValueError(f"Unknown training parameter {key!r} (choose from {', '.join(TRAINING_PARAMS)})")
+        default = TRAINING_PARAMS[key]
+        if isinstance(default, int):
+            check_int(f"{name}.{key}", value, 1, 10_000)
+        elif isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 < value < 1:
+            raise ValueError(f"{name}.{key} must be a number between 0 and 1, got {value!r}")
+    return training
+
+def check_stages(name, stages):
+    from training_pipeline import STAGES
+    return check_choices(name, stages, STAGES)
+
+def check_models(name, models):
+    from backtest import MODEL_NAMES
+    return check_choices(name, models, MODEL_NAMES)
+
+def check_flag(name, value):
+    if not isinstance(value, bool):
+        raise ValueError(f"{name} must be true or false, got {value!r}")
+    return value
+
+# The parameters each job kind accepts and how each is checked
+JOB_PARAMS = {
+    'season_simulation': {
+        'season': lambda name, value: check_int(name, value, MIN_YEAR, MAX_YEAR),
+        'simulations': lambda name, value: check_int(name, value, 1, MAX_SIMULATIONS),
+        'seed': lambda name, value: check_int(name, value, 0, 2 ** 32 - 1),
+    },
+    'backtest': {
+        'years': check_years,
+        'models': check_models,
+        'min_train_games': lambda name, value: check_int(name, value, 1, 1_000_000),
+    },
+    'retrain': {
+        'years': check_years,
+        'predict_year': lambda name, value: check_int(name, value, MIN_YEAR, MAX_YEAR),
+        'training': check_training,
+        'force': check_stages,
+        'save_model': check_flag,
+    },
+}
+
+def validate_params(kind, params):
+    """Raise ValueError unless params is an object holding only known, in-range parameters for kind"""
+    if not isinstance(params, dict):
+        raise ValueError(f"params must be an object, got {params!r}")
+    allowed = JOB_PARAMS[kind]
+    for name, value in params.items():
+        if name not in allowed:
+            raise ValueError(f"Unknown parameter {name!r} for {kind} (choose from {', '.join(allowed)})")
+        allowed[name](name, value)
+    return params
+
+def simulate_season(params, inputs, progress):
+    """Monte Carlo win totals from each game's home win probability
+
+    inputs['games'] holds {home_team, away_team, week, home_win_probability}
+    for every game of the season.
+    """
+    games = inputs.get('games') or []
+    if not games:
+        raise ValueError("No games to simulate")
+    simulations = int(params.get('simulations', 10000))
+    rng = np.random.default_rng(params.get('seed', 42))
+
+    teams = sorted({game['home_team'] for game in games} | {game['away_team'] for game in games})
+    index = {team: i for i, team in enumerate(teams)}
+    home = np.array([index[game['home_team']] for game in games])
+    away = np.array([index[game['away_team']] for game in games])
+    home_prob = np.array([game['home_win_probability'] for game in games], dtype=float)
+
+    # Each game listed once per team, grouped by team, so a chunk's win totals are one reduceat
+    team_of = np.concatenate([home, away])
+    order = np.argsort(team_of, kind='stable')
+    columns = np.concatenate([np.arange(len(games))] * 2)[order]
+    is_away = (np.arange(2 * len(games)) >= len(games))[order]
+    games_played = np.bincount(team_of, minlength=len(teams))
+    starts = np.concatenate([[0], np.cumsum(games_played)[:-1]])
+
+    max_games = int(games_played.max())
+    distribution = np.zeros((len(teams), max_games + 1), dtype=np.int64)
+    win_totals = np.zeros(len(teams))
+    done = 0
+    while done < simulations:
+        size = min(SIMULATION_CHUNK, simulations - done)
+        home_won = rng.random((size, len(games))) < home_prob
+        won = (home_won[:, columns] != is_away).astype(np.int16)
+        wins = np.add.reduceat(won, starts, axis=1)
+        win_totals += wins.sum(axis=0)
+        offsets = wins + np.arange(len(teams)) * (max_games + 1)
+        distribution += np.bincount(offsets.ravel(), minlength=distribution.size).reshape(distribution.shape)
+        done += size
+        progress(done / simulations, f"{done:,} of {simulations:,} seasons simulated")
+
+    results = []
+    for i, team in enumerate(teams):
+        shares = distribution[i, :games_played[i] + 1] / simulations
+        results.append({
+            'team': team,
+            'games': int(games_played[i]),
+            'expected_wins': round(win_totals[i] / simulations, 3),
+            'win_distribution': [round(float(share), 4) for share in shares],
+            'undefeated_probability': round(float(shares[-1]), 4),
+            'bowl_eligible_probability': round(float(shares[BOWL_ELIGIBLE_WINS:].sum()), 4)
+        })
+    results.sort(key=lambda row: -row['expected_wins'])
+    return {'season': params.get('season'), 'simulations': simulations, 'games': len(games), 'teams': results}
+
+def backtest_job(params, inputs, progress):
+    """Walk-forward backtest (backtest.py) of the candidate models"""
+    import backtest
+
+    years = params.get('years') or [2020, 2021, 2022, 2023, 2024]
+    models = params.get('models') or backtest.MODEL_NAMES
+    games = backtest.load_games(years, backtest.DATA_DIR)
+    if games.empty:
+        raise ValueError("No games data available")
+
+    progress(0, f"{len(games):,} games loaded")
+    # One season at a time, so a job stays within its own worker
+    results = backtest.run_backtest(
+        games, models, int(params.get('min_train_games', 200)), 1,
+        lambda done, total: progress(done / total, f"{done} of {total} seasons")
+    )
+
+    weekly = [row for result in results for row in result['rows']]
+    summary = {}
+    for name in models:
+        rows = [row for row in weekly if row['model'] == name]
+        weights = [row['games'] for row in rows]
+        if rows:
+            summary[name] = {metric: round(float(np.average([row[metric] for row in rows], weights=weights)), 4)
+                             for metric in ('accuracy', 'brier', 'log_loss')}
+    return {'years': years, 'summary': summary, 'weekly': weekly}
+
+def retrain_job(params, inputs, progress):
+    """Cached training pipeline (training_pipeline.py); the model package is written to the job directory"""
+    import training_pipeline
+
+    years = params.get('years') or [2022, 2023, 2024]
+    predict_year = int(params.get('predict_year', 2025))
+    data_dir = training_pipeline.DATA_DIR
+    stages = training_pipeline.STAGES
+
+    def on_stage(stage, cached):
+        progress((stages.index(stage) + 1) / len(stages), f"{stage} {'cached' if cached else 'computed'}")
+
+    cache = training_pipeline.StageCache(os.path.join(data_dir, '.pipeline_cache'))
+    outputs = training_pipeline.run_pipeline(
+        years, data_dir, predict_year, params.get('training'), cache,
+        params.get('force', ()), ['train', 'predict'], on_stage
+    )
+
+    predictions_path = os.path.join(inputs['job_dir'], f'predictions_{predict_year}.csv')
+    outputs['predict'].to_csv(predictions_path, index=False)
+    result = {
+        'model_name': outputs['train']['model_name'],
+        'model_results': outputs['train']['model_results'],
+        'predictions': len(outputs['predict']),
+        'predictions_path': predictions_path
+    }
+    if params.get('save_model'):
+        model_path = os.path.join(inputs['job_dir'], 'cfb_prediction_model.pkl')
+        result['model_paths'] = list(training_pipeline.save_model_package(outputs['train'], model_path))
+    return result
+
+JOB_KINDS = {
+    'season_simulation': simulate_season,
+    'backtest': backtest_job,
+    'retrain': retrain_job,
+}
+
+def run_job(kind, params, job_dir):
+    """Run one job and write its result.json (runs in a worker process)"""
+    progress = JobProgress(job_dir)
+    inputs = read_json(os.path.join(job_dir, 'inputs.json'), {})
+    inputs['job_dir'] = job_dir
+    start = time.perf_counter()
+    result = JOB_KINDS[kind](params, inputs, progress)
+    write_json(os.path.join(job_dir, 'result.json'), result)
+    return time.perf_counter() - start
+
+class JobQueue:
+    """Priority queue of jobs run on a bounded process pool, persisted under jobs_dir"""
+    def __init__(self, jobs_dir=DEFAULT_JOBS_DIR, max_workers=DEFAULT_MAX_WORKERS):
+        self.jobs_dir = jobs_dir
+        self.max_workers = max_workers
+        self.jobs = {}         # job_id -> record
+        self.pending = []      # heap of (-priority, sequence, job_id)
+        self.in_flight = {}    # dedup key -> job_id of a queued or running job
+        self.running = {}      # job_id -> future
+        self.sequence = itertools.count()
+        self.lock = threading.Condition()
+        self.pool = None
+        self.started = False
+
+    def start(self):
+        """Load persisted jobs and start dispatching (idempotent)
+
+        Deferred until the queue is first used, so importing a module that
+        creates a JobQueue (e.g. in a spawned worker) never starts a pool.
+        """
+        with self.lock:
+            if self.started:
+                return
+            self.started = True
+            os.makedirs(self.jobs_dir, exist_ok=True)
+            records = [read_json(os.path.join(self.jobs_dir, name, 'job.json'))
+                       for name in os.listdir(self.jobs_dir)]
+            for record in sorted(filter(None, records), key=lambda record: record['submitted_at']):
+                self.jobs[record['id']] = record
+                if record['status'] in ACTIVE_STATUSES:
+                    record.update(status='queued', started_at=None)
+                    self.enqueue(record)
+            threading.Thread(target=self.dispatch_loop, name='job-dispatcher', daemon=True).start()
+
+    def job_dir(self, job_id):
+        return os.path.join(self.jobs_dir, job_id)
+
+    def save(self, record):
+        write_json(os.path.join(self.job_dir(record['id']), 'job.json'), record)
+
+    def enqueue(self, record):
+        self.in_flight[record['key']] = record['id']
+        heapq.heappush(self.pending, (-record['priority'], next(self.sequence), record['id']))
+        self.save(record)
+        self.lock.notify_all()
+
+    def submit(self, kind, params=None, priority=0, inputs=None):
+        """Queue a job; returns (record, created) where created is False for a duplicate of an active job"""
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind} (choose from {', '.join(JOB_KINDS)})")
+        params = validate_params(kind, params or {})
+        self.start()
+
+        digest = hashlib.sha256(json.dumps([kind, params, inputs], sort_keys=True, default=str).encode())
+        key = digest.hexdigest()[:32]
+        with self.lock:
+            if key in self.in_flight:
+                return self.status(self.in_flight[key]), False
+
+            job_id = uuid.uuid4().hex[:12]
+            os.makedirs(self.job_dir(job_id))
+            if inputs is not None:
+                write_json(os.path.join(self.job_dir(job_id), 'inputs.json'), inputs)
+            record = {
+                'id': job_id, 'kind': kind, 'params': params, 'priority': int(priority), 'key': key,
+                'status': 'queued', 'submitted_at': timestamp(), 'started_at': None,
+                'finished_at': None, 'error': None
+            }
+            self.jobs[job_id] = record
+            self.enqueue(record)
+            return self.status(job_id), True
+
+    def dispatch_loop(self):
+        """Hand the highest-priority queued job to the pool whenever a worker is free"""
+        with self.lock:
+            while True:
+                while not (self.pending and len(self.running) < self.max_workers):
+                    self.lock.wait()
+                _, _, job_id = heapq.heappop(self.pending)
+                record = self.jobs[job_id]
+                if record['status'] != 'queued':
+                    continue  # cancelled while waiting
+
+                if self.pool is None:
+                    self.pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                record.update(status='running', started_at=timestamp())
+                self.save(record)
+                future = self.pool.submit(run_job, record['kind'], record['params'], self.job_dir(job_id))
+                self.running[job_id] = future
+                future.add_done_callback(lambda future, job_id=job_id: self.finished(job_id, future))
+
+    def finished(self, job_id, future):
+        with self.lock:
+            record = self.jobs[job_id]
+            self.running.pop(job_id, None)
+            self.in_flight.pop(record['key'], None)
+            error = future.exception()
+            if error is None:
+                record.update(status='done', seconds=round(future.result(), 3))
+            elif isinstance(error, JobCancelled):
+                record['status'] = 'cancelled'
+            else:
+                record.update(status='failed', error=str(error) or type(error).__name__)
+                if isinstance(error, BrokenProcessPool):
+                    self.pool = None  # a worker died; the next job gets a fresh pool
+            record['finished_at'] = timestamp()
+            self.save(record)
+            self.lock.notify_all()
+
+    def status(self, job_id):
+        """Job record plus its latest progress, or None for an unknown id"""
+        self.start()
+        with self.lock:
+            record = self.jobs.get(job_id)
+            if record is None:
+                return None
+            status = dict(record)
+        status.pop('key')
+        if status['status'] == 'done':
+            status['progress'] = {'fraction': 1.0, 'message': 'done'}
+        else:
+            status['progress'] = read_json(os.path.join(self.job_dir(job_id), 'progress.json'),
+                                           {'fraction': 0.0, 'message': ''})
+        return status
+
+    def list(self, status=None):
+        self.start()
+        with self.lock:
+            job_ids = [job_id for job_id, record in self.jobs.items()
+                       if status is None or record['status'] == status]
+        return sorted((self.status(job_id) for job_id in job_ids),
+                      key=lambda record: record['submitted_at'], reverse=True)
+
+    def result(self, job_id):
+        return read_json(os.path.join(self.job_dir(job_id), 'result.json'))
+
+    def cancel(self, job_id):
+        """Cancel a queued job now, or ask a running one to stop; returns the updated status"""
+        self.start()
+        with self.lock:
+            record = self.jobs.get(job_id)
+            if record is None:
+                return None
+            if record['status'] == 'queued':
+                self.in_flight.pop(record['key'], None)
+                record.update(status='cancelled', finished_at=timestamp())
+                self.save(record)
+            elif record['status'] == 'running':
+                with open(os.path.join(self.job_dir(job_id), 'cancel'), 'w', encoding='utf-8') as file:
+                    file.write(timestamp())
+                record['cancel_requested'] = True
+                self.save(record)
+        return self.status(job_id)
+
+    def wait(self, job_id, timeout=None):
+        """Block until a job has finished; returns its status"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.lock:
+            while self.jobs[job_id]['status'] in ACTIVE_STATUSES:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self.lock.wait(remaining)
+        return self.status(job_id)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Background job queue")
+    parser.add_argument('--jobs-dir', default=DEFAULT_JOBS_DIR)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('list', help="show every job and its status")
+    run = subparsers.add_parser('run', help="run a job through the queue and wait for it")
+    run.add_argument('kind', choices=list(JOB_KINDS))
+    run.add_argument('--params', default='{}', help="job parameters as JSON")
+    args = parser.parse_args()
+
+    queue = JobQueue(args.jobs_dir)
+    if args.command == 'list':
+        for job in queue.list():
+            print(f"{job['id']}  {job['kind']:<18} {job['status']:<10} "
+                  f"{job['progress']['fraction']:>6.1%}  {job['submitted_at']}  {job['error'] or ''}")
+    else:
+        job, _ = queue.submit(args.kind, json.loads(args.params))
+        print(f"⏳ Job {job['id']} queued")
+        job = queue.wait(job['id'])
+        if job['status'] == 'done':
+            print(f"✅ Job {job['id']} finished in {job['seconds']:.2f}s: "
+                  f"{os.path.join(queue.job_dir(job['id']), 'result.json')}")
+        else:
+            print(f"❌ Job {job['id']} {job['status']}: {job['error'] or ''}")
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Live in-game win probability pushed to clients as server-sent events
+
+A score/clock feed (a JSON-lines file being appended to, or a TCP socket that
+accepts the same lines) updates each game's in-game win probability, which
+starts from the pregame home_win_probability and moves with the score margin
+and time remaining. Clients subscribe with GET /live (optionally
+?team=Utah&team=BYU) and receive an SSE "update" event per batch of changed
+games; GET /snapshot returns the current state of every game as JSON.
+
+Everything runs on one asyncio event loop. Each subscriber holds at most one
+pending update per game (newer updates replace older ones), so a slow client
+costs bounded memory instead of an ever-growing queue.
+
+Feed line: {"home_team": "Utah", "away_team": "BYU", "home_score": 14,
+            "away_score": 10, "period": 2, "clock": "4:31", "possession": "home"}
+(or "seconds_remaining" instead of period/clock, "status": "final" at the end)
+
+Usage: python3 live_games.py --week 5 --feed live_feed.jsonl [--feed-port 5002] [--port 5001]
+       python3 live_games.py --week 5 --feed /tmp/feed.jsonl --simulate
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+GAME_SECONDS = 3600
+QUARTER_SECONDS = 900
+
+# Logistic approximation to the normal CDF: Φ(x) ≈ sigmoid(1.702 x)
+LOGISTIC_SCALE = 1.702
+# Final-margin standard deviation for a full game, shrinking with sqrt(time left)
+MARGIN_STDDEV = 13.5
+# Expected points of having the ball
+POSSESSION_POINTS = 2.0
+HEARTBEAT_SECONDS = 15
+
+def parse_clock(clock):
+    """Seconds left in the period from "MM:SS" or a number of seconds"""
+    if isinstance(clock, str) and ':' in clock:
+        minutes, seconds = clock.split(':', 1)
+        return int(minutes) * 60 + float(seconds)
+    return float(clock)
+
+def seconds_remaining(event):
+    if 'seconds_remaining' in event:
+        return float(event['seconds_remaining'])
+    period = int(event.get('period', 1))
+    clock = parse_clock(event.get('clock', QUARTER_SECONDS))
+    return max(4 - period, 0) * QUARTER_SECONDS + clock if period <= 4 else 0.0
+
+def live_win_probability(pregame_margin, margin, seconds_left, possession, final):
+    """Home win probability for arrays of games
+
+    The pregame expected margin is spread over the game: with a fraction r of
+    the game left, the final margin is modelled as
+    current margin + r * pregame margin + possession value, with standard
+    deviation MARGIN_STDDEV * sqrt(r). At kickoff this returns the pregame
+    probability exactly.
+    """
+    remaining = np.clip(seconds_left / GAME_SECONDS, 1e-4, 1.0)
+    expected = margin + remaining * pregame_margin + possession * POSSESSION_POINTS
+    z = expected / (MARGIN_STDDEV * np.sqrt(remaining))
+    prob = 1.0 / (1.0 + np.exp(-LOGISTIC_SCALE * z))
+    return np.where(final, np.where(margin > 0, 1.0, np.where(margin < 0, 0.0, 0.5)), prob)
+
+class Subscriber:
+    """One SSE client: the latest pending update (pre-encoded JSON) per game plus a wake-up event"""
+    def __init__(self, slots=None):
+        self.slots = slots
+        self.pending = {}
+        self.ready = asyncio.Event()
+
+    def push(self, updates):
+        for slot, game in updates:
+            if self.slots is None or slot in self.slots:
+                self.pending[slot] = game
+        if self.pending:
+            self.ready.set()
+
+    async def next_batch(self, timeout):
+        """Pending games' JSON in arrival order, or [] after timeout"""
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self.ready.clear()
+        batch, self.pending = self.pending, {}
+        return list(batch.values())
+
+class LiveGameHub:
+    """Per-game live state for one week's slate, stored as parallel arrays"""
+    def __init__(self, predictor, week):
+        matchups = [(game['home_team'], game['away_team'], week) for game in predictor.get_week_matchups(week)]
+        columns = predictor.predict_games_columnar(matchups) if matchups else {
+            'home_team': np.array([]), 'away_team': np.array([]), 'home_win_probability': np.array([])}
+
+        self.registry = predictor.registry
+        self.week = week
+        self.home_teams = list(columns['home_team'])
+        self.away_teams = list(columns['away_team'])
+        self.pregame_prob = np.asarray(columns['home_win_probability'], dtype=float)
+        # Invert the logistic at kickoff so the pregame probability is reproduced exactly
+        clipped = np.clip(self.pregame_prob, 1e-6, 1 - 1e-6)
+        self.pregame_margin = MARGIN_STDDEV * np.log(clipped / (1 - clipped)) / LOGISTIC_SCALE
+
+        games = len(self.home_teams)
+        self.home_score = np.zeros(games, dtype=int)
+        self.away_score = np.zeros(games, dtype=int)
+        self.seconds_left = np.full(games, float(GAME_SECONDS))
+        self.possession = np.zeros(games)
+        self.final = np.zeros(games, dtype=bool)
+        self.live_prob = self.pregame_prob.copy()
+        self.updated = np.zeros(games, dtype=int)
+
+        # A team plays once a week, so either name identifies its game
+        self.slots = {}
+        for slot, (home, away) in enumerate(zip(self.home_teams, self.away_teams)):
+            self.slots[(home, away)] = slot
+            self.slots.setdefault(home, slot)
+            self.slots.setdefault(away, slot)
+
+        self.subscribers = set()
+        self.events_applied = 0
+
+    def slot_for(self, event):
+        home = self.registry.canonical_name(event['home_team']) if event.get('home_team') else None
+        away = self.registry.canonical_name(event['away_team']) if event.get('away_team') else None
+        return self.slots.get((home, away), self.slots.get(home, self.slots.get(away)))
+
+    def game(self, slot):
+        return {
+            'home_team': self.home_teams[slot],
+            'away_team': self.away_teams[slot],
+            'home_score': int(self.home_score[slot]),
+            'away_score': int(self.away_score[slot]),
+            'seconds_remaining': float(self.seconds_left[slot]),
+            'final': bool(self.final[slot]),
+            'pregame_home_win_probability': round(float(self.pregame_prob[slot]), 4),
+            'home_win_probability': round(float(self.live_prob[slot]), 4),
+            'updates': int(self.updated[slot])
+        }
+
+    def snapshot(self, slots=None):
+        return [self.game(slot) for slot in (sorted(slots) if slots is not None else range(len(self.home_teams)))]
+
+    def apply(self, events):
+        """Apply a batch of feed events and push the changed games; returns the changed slots"""
+        latest = {}
+        for event in events:
+            slot = self.slot_for(event)
+            if slot is not None:
+                latest[slot] = event
+        if not latest:
+            return []
+
+        # Only the affected games are recomputed, in one vectorized pass
+        slots = np.fromiter(latest, dtype=int, count=len(latest))
+        batch = list(latest.values())
+        self.home_score[slots] = [int(event.get('home_score', self.home_score[slot])) for slot, event in latest.items()]
+        self.away_score[slots] = [int(event.get('away_score', self.away_score[slot])) for slot, event in latest.items()]
+        self.seconds_left[slots] = [seconds_remaining(event) for event in batch]
+        self.possession[slots] = [{'home': 1.0, 'away': -1.0}.get(event.get('possession'), 0.0) for event in batch]
+        self.final[slots] = [event.get('status') == 'final' for event in batch]
+        self.updated[slots] += 1
+
+        self.live_prob[slots] = live_win_probability(
+            self.pregame_margin[slots], self.home_score[slots] - self.away_score[slots],
+            self.seconds_left[slots], self.possession[slots], self.final[slots]
+        )
+        self.events_applied += len(events)
+
+        # Encode each changed game once, however many subscribers receive it
+        updates = [(slot, json.dumps(self.game(slot))) for slot in slots.tolist()]
+        for subscriber in self.subscribers:
+            subscriber.push(updates)
+        return slots
+
+    def subscribe(self, teams=None):
+        slots = None
+        if teams:
+            slots = {self.slot_for({'home_team': team}) for team in teams} - {None}
+        subscriber = Subscriber(slots)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.discard(subscriber)
+
+def parse_event(event):
+    """A feed event with its numeric fields coerced; raises ValueError if it cannot be applied"""
+    if not isinstance(event, dict):
+        raise ValueError("not a JSON object")
+    if not any(isinstance(event.get(side), str) and event[side] for side in ('home_team', 'away_team')):
+        raise ValueError("no home_team or away_team")
+
+    event = dict(event)
+    for side in ('home_team', 'away_team'):
+        if side in event and not isinstance(event[side], str):
+            del event[side]
+    try:
+        for field in ('home_score', 'away_score'):
+            if field in event:
+                event[field] = int(event[field])
+        event['seconds_remaining'] = seconds_remaining(event)
+    except (TypeError, ValueError, OverflowError) as e:
+        raise ValueError(f"bad score or clock ({e})")
+    return event
+
+def parse_feed_lines(lines):
+    """Events from feed lines; malformed lines and events are skipped with a warning"""
+    events = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            events.append(parse_event(json.loads(line)))
+        except json.JSONDecodeError:
+            print(f"⚠️  Skipping malformed feed line: {line[:80]}")
+        except ValueError as e:
+            print(f"⚠️  Skipping feed event, {e}: {line[:80]}")
+    return events
+
+async def tail_feed(hub, path, poll_seconds=0.25):
+    """Follow a JSON-lines file like tail -f, applying whatever arrived since the last poll"""
+    while not os.path.exists(path):
+        await asyncio.sleep(poll_seconds)
+
+    partial = ''
+    with open(path, 'r', encoding='utf-8') as feed:
+        while True:
+            chunk = feed.read()
+            if not chunk:
+                await asyncio.sleep(poll_seconds)
+                continue
+            # Keep an incomplete trailing line until the writer finishes it
+            lines = (partial + chunk).split('\n')
+            partial = lines.pop()
+            hub.apply(parse_feed_lines(lines))
+
+async def serve_feed(hub, host, port):
+    """Accept feed connections that send the same JSON lines over TCP"""
+    async def handle(reader, writer):
+        try:
+            while line := await reader.readline():
+                hub.apply(parse_feed_lines([line.decode('utf-8')]))
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    async with server:
+        await server.serve_forever()
+
+async def simulate_feed(hub, path, interval=1.0, game_seconds_per_tick=60, seed=0):
+    """Append random scoring updates for every game to path (a stand-in for a real feed)"""
+    rng = random.Random(seed)
+    games = len(hub.home_teams)
+    scores = [[0, 0] for _ in range(games)]
+    elapsed = 0
+    with open(path, 'a', encoding='utf-8') as feed:
+        while elapsed < GAME_SECONDS:
+            elapsed = min(elapsed + game_seconds_per_tick, GAME_SECONDS)
+            for slot in range(games):
+                if rng.random() < 0.15:
+                    scores[slot][rng.random() < 0.5] += rng.choice([3, 7, 7])
+                feed.write(json.dumps({
+                    'home_team': hub.home_teams[slot], 'away_team': hub.away_teams[slot],
+                    'home_score': scores[slot][0], 'away_score': scores[slot][1],
+                    'seconds_remaining': GAME_SECONDS - elapsed,
+                    'possession': rng.choice(['home', 'away']),
+                    'status': 'final' if elapsed == GAME_SECONDS else 'in_progress'
+                }) + '\n')
+            feed.flush()
+            await asyncio.sleep(interval)
+
+def sse_event(name, data):
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n".encode('utf-8')
+
+async def write_response(writer, status, content_type, body):
+    writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                 f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('utf-8') + body)
+    await writer.drain()
+
+async def handle_client(hub, reader, writer):
+    """Minimal HTTP/1.1: GET /live streams SSE, GET /snapshot returns JSON"""
+    subscriber = None
+    try:
+        request_line = (await reader.readline()).decode('latin-1').split()
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+        if len(request_line) < 2 or request_line[0] != 'GET':
+            await write_response(writer, '405 Method Not Allowed', 'text/plain', b'GET only\n')
+            return
+
+        url = urlsplit(request_line[1])
+        if url.path == '/snapshot':
+            body = json.dumps({'week': hub.week, 'games': hub.snapshot()}).encode('utf-8')
+            await write_response(writer, '200 OK', 'application/json', body)
+            return
+        if url.path != '/live':
+            await write_response(writer, '404 Not Found', 'text/plain', b'Not found\n')
+            return
+
+        subscriber = hub.subscribe(parse_qs(url.query).get('team'))
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\nConnection: keep-alive\r\n"
+                     b"Access-Control-Allow-Origin: *\r\n\r\n")
+        writer.write(sse_event('snapshot', hub.snapshot(subscriber.slots)))
+        await writer.drain()
+
+        while True:
+            games = await subscriber.next_batch(HEARTBEAT_SECONDS)
+            writer.write(f"event: update\ndata: [{','.join(games)}]\n\n".encode('utf-8') if games
+                         else b": keepalive\n\n")
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        if subscriber is not None:
+            hub.unsubscribe(subscriber)
+        writer.close()
+
+async def run(hub, args):
+    server = await asyncio.start_server(lambda r, w: handle_client(hub, r, w), args.host, args.port)
+    tasks = [asyncio.create_task(server.serve_forever())]
+    if args.feed:
+        tasks.append(asyncio.create_task(tail_feed(hub, args.feed)))
+    if args.feed_port:
+        tasks.append(asyncio.create_task(serve_feed(hub, args.host, args.feed_port)))
+    if args.simulate:
+        tasks.append(asyncio.create_task(simulate_feed(hub, args.feed)))
+
+    print(f"📡 Live win probability for week {hub.week} ({len(hub.home_teams)} games)")
+    print(f"🌐 SSE: http://{args.host}:{args.port}/live  Snapshot: http://{args.host}:{args.port}/snapshot")
+    await asyncio.gather(*tasks)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Live in-game win probability over SSE")
+    parser.add_argument('--week', type=int, required=True)
+    parser.add_argument('--feed', help="JSON-lines feed file to follow")
+    parser.add_argument('--feed-port', type=int, help="also accept feed lines on this TCP port")
+    parser.add_argument('--simulate', action='store_true', help="write a random feed to --feed")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5001)
+    args = parser.parse_args()
+    if args.simulate and not args.feed:
+        parser.error('--simulate needs --feed')
+
+    from app import predictor
+    asyncio.run(run(LiveGameHub(predictor, args.week), args))
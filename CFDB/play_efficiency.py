@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Out-of-core success rate and explosiveness from play-by-play files
+
+Reads CFBD play exports (plays_{year}*.csv, either column style) in chunks of
+CHUNK_ROWS plays, so memory stays bounded by the chunk size plus one row per
+team-game however large the files are. Each chunk is reduced to per
+team-game sums with vectorized group reductions; files are spread across a
+process pool and their partial sums are added together at the end.
+
+A scrimmage play is successful when it gains 50% of the distance on first
+down, 70% on second and 100% on third or fourth. Explosiveness is the mean
+PPA of successful plays (yards gained when the export has no ppa column).
+Offensive metrics come from a team's plays on offense, defensive metrics from
+its opponents' plays against it; season rates are weighted by plays.
+
+Usage: python3 play_efficiency.py --years 2023 2024 [--workers 4] [--stats-json ../current_season_stats.json --season 2024]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from team_registry import TeamRegistry
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+from build_utils import atomic_write_text
+
+DATA_DIR = 'cfbd_data'
+CHUNK_ROWS = 250_000
+
+# CFBD camelCase -> snake_case
+PLAY_COLUMNS = {
+    'gameId': 'game_id', 'game_id': 'game_id',
+    'season': 'season', 'week': 'week',
+    'offense': 'offense', 'defense': 'defense',
+    'down': 'down', 'distance': 'distance',
+    'yardsGained': 'yards_gained', 'yards_gained': 'yards_gained',
+    'playType': 'play_type', 'play_type': 'play_type',
+    'ppa': 'ppa',
+}
+
+SCRIMMAGE_PLAY_TYPES = {
+    'Rush', 'Rushing Touchdown', 'Pass', 'Pass Reception', 'Pass Completion', 'Pass Incompletion',
+    'Passing Touchdown', 'Sack', 'Pass Interception', 'Pass Interception Return',
+    'Interception Return Touchdown', 'Fumble Recovery (Own)', 'Fumble Recovery (Opponent)',
+    'Fumble Return Touchdown', 'Safety',
+}
+
+# Share of the distance a play must gain to count as a success, by down
+SUCCESS_THRESHOLDS = np.array([np.nan, 0.5, 0.7, 1.0, 1.0])
+
+SUM_COLUMNS = ['plays', 'successes', 'explosive_sum', 'explosive_plays']
+
+def play_files(years, data_dir=DATA_DIR):
+    """plays_{year}.csv and plays_{year}_*.csv (e.g. per-week exports) for each year"""
+    paths = []
+    for year in years:
+        found = sorted(glob.glob(os.path.join(data_dir, f'plays_{year}.csv')) +
+                       glob.glob(os.path.join(data_dir, f'plays_{year}_*.csv')))
+        if not found:
+            print(f"✗ No play files for {year} in {data_dir}")
+        paths.extend(found)
+    return paths
+
+def season_from_path(path):
+    match = re.search(r'plays_(\d{4})', os.path.basename(path))
+    return int(match.group(1)) if match else None
+
+def chunk_sums(chunk, season):
+    """Per (season, game, offense, defense) play, success and explosiveness sums for one chunk"""
+    chunk = chunk.rename(columns=PLAY_COLUMNS)
+    if 'season' not in chunk.columns:
+        chunk['season'] = season
+
+    down = pd.to_numeric(chunk['down'], errors='coerce').to_numpy()
+    distance = pd.to_numeric(chunk['distance'], errors='coerce').to_numpy()
+    gained = pd.to_numeric(chunk['yards_gained'], errors='coerce').to_numpy()
+    scrimmage = (chunk['play_type'].isin(SCRIMMAGE_PLAY_TYPES).to_numpy()
+                 & (down >= 1) & (down <= 4) & (distance > 0) & ~np.isnan(gained))
+
+    threshold = SUCCESS_THRESHOLDS[np.where(scrimmage, down, 0).astype(int)]
+    success = scrimmage & (gained >= threshold * distance)
+    if 'ppa' in chunk.columns:
+        value = pd.to_numeric(chunk['ppa'], errors='coerce').to_numpy()
+    else:
+        value = gained
+    explosive = success & ~np.isnan(value)
+
+    frame = pd.DataFrame({
+        'season': chunk['season'].to_numpy(),
+        'game_id': chunk['game_id'].to_numpy(),
+        'offense': chunk['offense'].to_numpy(),
+        'defense': chunk['defense'].to_numpy(),
+        'plays': scrimmage.astype(np.int64),
+        'successes': success.astype(np.int64),
+        'explosive_sum': np.where(explosive, value, 0.0),
+        'explosive_plays': explosive.astype(np.int64),
+    })[scrimmage]
+    return frame.groupby(['season', 'game_id', 'offense', 'defense'], sort=False)[SUM_COLUMNS].sum()
+
+def aggregate_file(path, chunk_rows=CHUNK_ROWS):
+    """Team-game sums for one play file, read chunk by chunk (runs in a worker process)"""
+    start = time.perf_counter()
+    season = season_from_path(path)
+    usecols = lambda column: column in PLAY_COLUMNS
+
+    totals = None
+    rows = 0
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunk_rows, low_memory=False):
+        rows += len(chunk)
+        sums = chunk_sums(chunk, season)
+        totals = sums if totals is None else totals.add(sums, fill_value=0)
+
+    return {
+        'path': path,
+        'plays_read': rows,
+        'seconds': time.perf_counter() - start,
+        'sums': totals if totals is not None else pd.DataFrame(columns=SUM_COLUMNS),
+    }
+
+def efficiency_rates(sums, prefix):
+    return pd.DataFrame({
+        f'{prefix}_plays': sums['plays'],
+        f'{prefix}_success_rate': sums['successes'] / sums['plays'],
+        f'{prefix}_explosiveness': sums['explosive_sum'] / sums['explosive_plays'].where(sums['explosive_plays'] > 0),
+    })
+
+def team_tables(sums):
+    """Per team-game and per team-season offensive and defensive metrics from offense/defense sums"""
+    offense = sums.groupby(level=['season', 'game_id', 'offense']).sum()
+    defense = sums.groupby(level=['season', 'game_id', 'defense']).sum()
+    offense.index = offense.index.set_names('team', level=2)
+    defense.index = defense.index.set_names('team', level=2)
+
+    team_game = efficiency_rates(offense, 'off').join(efficiency_rates(defense, 'def'), how='outer')
+    team_season = efficiency_rates(offense.groupby(level=['season', 'team']).sum(), 'off').join(
+        efficiency_rates(defense.groupby(level=['season', 'team']).sum(), 'def'), how='outer')
+    return team_game.reset_index(), team_season.reset_index()
+
+def run_aggregation(paths, workers=None, chunk_rows=CHUNK_ROWS):
+    """Aggregate every file across a process pool; returns (team_game, team_season, per-file results)"""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(aggregate_file, paths, [chunk_rows] * len(paths)))
+
+    partials = [result['sums'] for result in results if len(result['sums'])]
+    if not partials:
+        return pd.DataFrame(), pd.DataFrame(), results
+
+    # A game split across files (per-week exports) just adds up
+    sums = pd.concat(partials).groupby(level=['season', 'game_id', 'offense', 'defense']).sum()
+    team_game, team_season = team_tables(sums)
+    return team_game, team_season, results
+
+def update_stats_json(team_season, season, stats_json, registry=None):
+    """Write a season's four efficiency metrics into current_season_stats.json (other keys untouched)
+
+    CFBD team names are resolved through TeamRegistry and written under every
+    spelling the file already uses for the team (the canonical name for a new team).
+    """
+    stats = {}
+    if os.path.exists(stats_json):
+        with open(stats_json, 'r', encoding='utf-8') as file:
+            stats = json.load(file)
+
+    registry = registry or TeamRegistry()
+    stats_keys = registry.keys_by_team(stats)
+    metrics = ['off_success_rate', 'def_success_rate', 'off_explosiveness', 'def_explosiveness']
+    rows = team_season[team_season['season'] == season]
+    for row in rows.itertuples(index=False):
+        values = {metric: round(float(getattr(row, metric)), 4) for metric in metrics
+                  if pd.notna(getattr(row, metric))}
+        team = registry.canonical_name(row.team)
+        for key in stats_keys.get(team, [team]):
+            stats.setdefault(key, {}).update(values)
+
+    atomic_write_text(stats_json, json.dumps(stats, indent=2))
+    return len(rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Success rate and explosiveness from play-by-play files")
+    parser.add_argument('--years', type=int, nargs='+', default=[2024])
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--output', default=os.path.join(DATA_DIR, 'team_game_efficiency.csv'))
+    parser.add_argument('--stats-json', help="merge one season's team metrics into this file")
+    parser.add_argument('--season', type=int, help="season written to --stats-json (default: latest)")
+    args = parser.parse_args()
+
+    paths = play_files(args.years, args.data_dir)
+    if not paths:
+        print("❌ No play-by-play data available!")
+    else:
+        start = time.perf_counter()
+        team_game, team_season, results = run_aggregation(paths, args.workers, args.chunk_rows)
+        for result in results:
+            print(f"✓ {os.path.basename(result['path'])}: {result['plays_read']:,} plays "
+                  f"in {result['seconds']:.2f}s")
+
+        if team_game.empty:
+            print("❌ No scrimmage plays found")
+        else:
+            team_game.to_csv(args.output, index=False)
+            print(f"✅ {len(team_game):,} team-games saved to {args.output}")
+            if args.stats_json:
+                season = args.season or int(team_season['season'].max())
+                registry = TeamRegistry()
+                count = update_stats_json(team_season, season, args.stats_json, registry)
+                print(f"✅ {count} teams' {season} efficiency written to {args.stats_json}")
+                registry.print_unresolved(args.stats_json)
+        print(f"Total wall time: {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Margin-based team ratings (Massey / simple rating system) from game results
+
+Every scored game, FBS or FCS, is one row of a sparse games x teams design:
++1 in the home team's column, -1 in the away team's and 1 in a shared
+home-field column unless the site is neutral, against the home margin
+(capped at MARGIN_CAP). solve_ratings() finds the least-squares ratings by
+preconditioned conjugate gradient on the normal equations. The design is
+applied through index gathers and bincount, so neither it nor the teams x
+teams normal matrix is ever built. A ridge term pulls each team toward a
+prior rating, which keeps teams with few games (FCS opponents, early weeks)
+sensible and the system solvable.
+
+WeeklyRatings keeps point-in-time ratings per (team, week) like the weekly
+feature store: column w is solved from the games before week w,
+warm-started from column w - 1, so folding in a new week of results costs a
+few iterations instead of a fresh solve.
+
+Usage: python3 ratings.py [--season 2025] [--top 25] [--teams-json ../teams.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+from data_store import CURRENT_SEASON, DEFAULT_DB_PATH, REPO_DIR, CFBDataStore
+from feature_store import MAX_WEEK, PRIOR_GAMES
+
+sys.path.insert(0, REPO_DIR)
+from build_utils import atomic_write_text
+
+# Blowouts past this margin (typically against FCS opponents) count as this margin
+MARGIN_CAP = 28
+# Conjugate gradient stops once the residual is this fraction of the right-hand side
+TOLERANCE = 1e-6
+MAX_ITERATIONS = 200
+
+def solve_ratings(home_idx, away_idx, margin, neutral, teams, prior=None, ridge=PRIOR_GAMES,
+                  initial=None, tol=TOLERANCE, max_iter=MAX_ITERATIONS):
+    """Least-squares ratings of teams 0..teams-1 and the home-field advantage, in points
+
+    Minimizes sum((r[home] - r[away] + hfa * (1 - neutral) - margin) ** 2)
+    + ridge * (|r - prior| ** 2 + hfa ** 2). initial is a previous
+    (ratings, home_field) to warm-start from. Returns (ratings, home_field,
+    iterations).
+    """
+    home_idx = np.asarray(home_idx, dtype=np.intp)
+    away_idx = np.asarray(away_idx, dtype=np.intp)
+    margin = np.clip(np.asarray(margin, dtype=float), -MARGIN_CAP, MARGIN_CAP)
+    site = 1.0 - np.asarray(neutral, dtype=float)
+
+    def design(x):
+        """A x: predicted home margins"""
+        return x[home_idx] - x[away_idx] + x[teams] * site
+
+    def design_t(residual):
+        """A^T residual, one entry per team plus the home-field term"""
+        out = (np.bincount(home_idx, residual, teams + 1) -
+               np.bincount(away_idx, residual, teams + 1))
+        out[teams] = residual @ site
+        return out
+
+    def normal(x):
+        return design_t(design(x)) + ridge * x
+
+    # Solve for the offset from the prior so the ridge pulls toward it
+    center = np.zeros(teams + 1)
+    if prior is not None:
+        center[:teams] = prior
+    rhs = design_t(margin - design(center))
+
+    # Jacobi preconditioner: games played (home-site games for the home-field term) plus the ridge
+    diagonal = np.bincount(home_idx, minlength=teams + 1) + np.bincount(away_idx, minlength=teams + 1) + ridge
+    diagonal = diagonal.astype(float)
+    diagonal[teams] = site.sum() + ridge
+
+    offset = np.zeros(teams + 1)
+    if initial is not None:
+        offset[:teams] = initial[0]
+        offset[teams] = initial[1]
+        offset -= center
+
+    residual = rhs - normal(offset)
+    preconditioned = residual / diagonal
+    direction = preconditioned.copy()
+    rz = residual @ preconditioned
+    stop = tol * np.linalg.norm(rhs)
+
+    iterations = 0
+    while iterations < max_iter and np.linalg.norm(residual) > stop:
+        product = normal(direction)
+        step = rz / (direction @ product)
+        offset += step * direction
+        residual -= step * product
+        preconditioned = residual / diagonal
+        rz_next = residual @ preconditioned
+        direction = preconditioned + (rz_next / rz) * direction
+        rz = rz_next
+        iterations += 1
+
+    solution = center + offset
+    return solution[:teams], float(solution[teams]), iterations
+
+class WeeklyRatings:
+    """Ratings per (team, week) in one (teams, weeks) array; column w excludes week w's games
+
+    prior holds each team's preseason rating; week 0 (and any week with no
+    earlier results) equals it.
+    """
+    def __init__(self, prior, max_week=MAX_WEEK, ridge=PRIOR_GAMES):
+        self.prior = np.asarray(prior, dtype=float)
+        self.max_week = max_week
+        self.ridge = ridge
+        self.ratings = np.repeat(self.prior[:, None], max_week + 1, axis=1)
+        self.home_field = np.zeros(max_week + 1)
+        self.iterations = np.zeros(max_week + 1, dtype=int)
+
+        # week -> (home_idx, away_idx, home margin, neutral) of its scored games
+        self.week_games = {}
+        self.summary = {}
+
+    def week_index(self, weeks):
+        return np.clip(np.asarray(weeks, dtype=int), 0, self.max_week)
+
+    def rows(self, team_idx, weeks):
+        """Ratings as of each (team, week)"""
+        return self.ratings[team_idx, self.week_index(weeks)]
+
+    def latest(self):
+        """Every team's rating from all results so far"""
+        return self.ratings[:, self.max_week]
+
+    def record_week(self, week, home_idx, away_idx, margin, neutral, refresh=True):
+        """Replace week's results and re-solve the later columns"""
+        if not 0 <= week <= self.max_week:
+            raise ValueError(f"Week {week} outside 0..{self.max_week}")
+        self.week_games[week] = (np.asarray(home_idx, dtype=np.intp), np.asarray(away_idx, dtype=np.intp),
+                                 np.asarray(margin, dtype=float), np.asarray(neutral, dtype=bool))
+        if refresh:
+            self.refresh(week)
+
+    def refresh(self, week):
+        """Re-solve the columns after week, each warm-started from the one before"""
+        weeks = sorted(self.week_games)
+        home_idx, away_idx, margin, neutral = (np.concatenate([self.week_games[w][part] for w in weeks])
+                                               if weeks else np.array([]) for part in range(4))
+        game_weeks = np.concatenate([np.full(len(self.week_games[w][0]), w) for w in weeks]) if weeks else []
+        # Games before week c are the first ends[c] of the week-ordered arrays
+        ends = np.searchsorted(game_weeks, np.arange(self.max_week + 1), side='left')
+
+        teams = len(self.prior)
+        for column in range(week + 1, self.max_week + 1):
+            previous = column - 1
+            count = ends[column]
+            if count == ends[previous] and previous > week:
+                self.ratings[:, column] = self.ratings[:, previous]
+                self.home_field[column] = self.home_field[previous]
+                self.iterations[column] = 0
+                continue
+            self.ratings[:, column], self.home_field[column], self.iterations[column] = solve_ratings(
+                home_idx[:count], away_idx[:count], margin[:count], neutral[:count], teams,
+                self.prior, self.ridge, initial=(self.ratings[:, previous], self.home_field[previous]))
+
+    def catch_up(self, store, season, team_row):
+        """Re-solve from the earliest week whose scores changed in store; returns the weeks folded
+
+        team_row maps a team name to its row in prior, or None for teams
+        without one (their games are skipped).
+        """
+        summary = {week: digests[0] for week, digests in store.results_summary(season).items() if digests[0]}
+        changed = sorted(week for week in set(summary) | set(self.summary)
+                         if summary.get(week) != self.summary.get(week) and 0 <= week <= self.max_week)
+
+        def rows(names):
+            return np.array([-1 if team_row(name) is None else team_row(name) for name in names], dtype=np.intp)
+
+        for week in changed:
+            scores = store.week_scores(season, week)
+            home_idx = rows([score[0] for score in scores])
+            away_idx = rows([score[1] for score in scores])
+            points = np.array([score[2:4] for score in scores], dtype=float).reshape(-1, 2)
+            neutral = np.array([bool(score[4]) for score in scores], dtype=bool)
+            scored = (home_idx >= 0) & (away_idx >= 0)
+            self.record_week(week, home_idx[scored], away_idx[scored], points[scored, 0] - points[scored, 1],
+                             neutral[scored], refresh=False)
+
+        if changed:
+            self.refresh(changed[0])
+        self.summary = summary
+        return changed
+
+def write_teams_json_ratings(path, ratings):
+    """Set marginRating on every team of teams.json the ratings cover; returns how many were set"""
+    with open(path, 'r', encoding='utf-8') as file:
+        teams_data = json.load(file)
+
+    updated = 0
+    for team, block in teams_data.items():
+        if isinstance(block, dict) and team in ratings:
+            block['marginRating'] = round(float(ratings[team]), 2)
+            updated += 1
+
+    atomic_write_text(path, json.dumps(teams_data, indent=2))
+    return updated
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Margin-based team ratings")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH)
+    parser.add_argument('--season', type=int, default=CURRENT_SEASON)
+    parser.add_argument('--top', type=int, default=25)
+    parser.add_argument('--teams-json', help=f"write marginRating into this teams.json "
+                                             f"(e.g. {os.path.join(REPO_DIR, 'teams.json')})")
+    args = parser.parse_args()
+
+    from app import predictor
+    if args.db != DEFAULT_DB_PATH:
+        predictor.store = CFBDataStore(args.db)
+        predictor.seasons.clear()
+
+    data = predictor.season_data(args.season)
+    latest = data.ratings.latest()
+    names = predictor.registry.names[:data.unknown_team_id]
+    ratings = {name: latest[row] for row, name in enumerate(names)}
+    home_field = float(data.ratings.home_field[data.ratings.max_week])
+
+    print(f"🏈 {args.season} ratings (points vs an average team, home field {home_field:+.1f})")
+    for rank, row in enumerate(np.argsort(-latest[:len(names)])[:args.top], 1):
+        print(f"  {rank:3d}. {names[row]:<28} {latest[row]:+6.1f}")
+
+    if args.teams_json:
+        updated = write_teams_json_ratings(args.teams_json, ratings)
+        print(f"✅ marginRating written for {updated} teams in {args.teams_json}")
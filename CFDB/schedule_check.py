@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Schedule integrity checks shared by every schedule generator and loader
+
+check_schedule() makes one pass over a list of games, keeping hash indexes of
+canonical game keys (season, week, unordered pair), of (season, week, team)
+bookings and of (season, pair) meetings, so it stays linear in the number of
+games however many seasons are checked at once. It finds:
+
+    duplicate           the same game listed twice
+    mirrored_duplicate  the same game listed again with home and away swapped
+    double_booked       a team with a second opponent in the same week
+    self_game           a team scheduled against itself
+    rematch             a pair that already met earlier in the regular season
+    unknown_team        a name the team registry cannot resolve (kept as-is)
+    conference_mismatch a game's conference label that fits neither team
+
+The first listing of a game wins; later conflicting games are dropped and
+mismatched labels are replaced. enforce_schedule() applies that repair, or
+raises ScheduleError instead when repair is off.
+
+Usage: python3 schedule_check.py [--schedule-js ../schedule_data.js] [--csv schedule.csv] [--strict]
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+from collections import Counter
+
+from team_registry import TeamRegistry
+
+# Later meetings are championship games and bowls, where rematches are normal
+LAST_REGULAR_WEEK = 13
+
+# Label spellings used by the schedule sources -> registry conference names
+CONFERENCE_ALIASES = {
+    'AAC': 'American', 'American Athletic': 'American',
+    'C-USA': 'Conference USA', 'CUSA': 'Conference USA',
+    'Mid-American': 'MAC',
+    'Independent': 'Independents', 'FBS Independents': 'Independents',
+}
+UNLABELED = {'', 'Unknown', 'Other', 'Non-Conference', None}
+
+# Issues that make a schedule unusable as-is; unknown teams are only reported
+BLOCKING_ISSUES = {'duplicate', 'mirrored_duplicate', 'double_booked', 'self_game', 'rematch',
+                   'conference_mismatch'}
+
+class ScheduleError(ValueError):
+    pass
+
+def issue(kind, game, detail=''):
+    return {'type': kind, 'season': game.get('season'), 'week': game['week'],
+            'home': game['home'], 'away': game['away'], 'detail': detail}
+
+def check_schedule(games, registry=None, conferences=None, listed_by_both=False,
+                   last_regular_week=LAST_REGULAR_WEEK):
+    """Validate games ({week, home, away}, optional season/conference) in one pass
+
+    Returns (kept, issues): the repaired games with canonical team names (and
+    corrected conference labels) and every issue found. conferences maps a
+    team to its conference (default: the registry's). With listed_by_both,
+    a game appearing once per team in the same orientation is expected (as in
+    the per-team schedule CSV) and not reported.
+    """
+    registry = registry or TeamRegistry()
+    conference_of = conferences.get if conferences is not None else (lambda team: registry.conference(team, None))
+
+    kept, issues = [], []
+    game_keys = {}   # (season, week, pair) -> (home, away) of the listing kept
+    booked = {}      # (season, week, team) -> opponent
+    met = {}         # (season, pair) -> week of the first meeting
+    unknown = set()
+
+    for game in games:
+        game = dict(game, week=int(game['week']))
+        for side in ('home', 'away'):
+            team_id = registry.lookup(game[side])
+            if team_id is None:
+                if game[side] not in unknown:
+                    unknown.add(game[side])
+                    issues.append(issue('unknown_team', game, game[side]))
+            else:
+                game[side] = registry.names[team_id]
+        home, away, week, season = game['home'], game['away'], game['week'], game.get('season')
+
+        if home == away:
+            issues.append(issue('self_game', game))
+            continue
+
+        pair = frozenset((home, away))
+        listed = game_keys.get((season, week, pair))
+        if listed is not None:
+            if listed != (home, away):
+                issues.append(issue('mirrored_duplicate', game, f"kept {listed[1]} at {listed[0]}"))
+            elif not listed_by_both:
+                issues.append(issue('duplicate', game))
+            continue
+
+        conflicts = [f"{team} already plays {booked[season, week, team]}" for team in (home, away)
+                     if (season, week, team) in booked]
+        if conflicts:
+            issues.append(issue('double_booked', game, '; '.join(conflicts)))
+            continue
+
+        first_week = met.get((season, pair))
+        if first_week is not None and week <= last_regular_week:
+            issues.append(issue('rematch', game, f"already met in week {first_week}"))
+            continue
+
+        label = game.get('conference')
+        if label not in UNLABELED:
+            label = CONFERENCE_ALIASES.get(label, label)
+            home_conf, away_conf = conference_of(home), conference_of(away)
+            if (home_conf or away_conf) and label not in (home_conf, away_conf):
+                issues.append(issue('conference_mismatch', game,
+                                    f"labelled {game['conference']}, teams in {home_conf} / {away_conf}"))
+                label = home_conf or away_conf
+            game['conference'] = label
+
+        game_keys[season, week, pair] = (home, away)
+        booked[season, week, home] = away
+        booked[season, week, away] = home
+        met.setdefault((season, pair), week)
+        kept.append(game)
+
+    return kept, issues
+
+def summarize_issues(issues):
+    return dict(Counter(entry['type'] for entry in issues))
+
+def enforce_schedule(games, source, registry=None, conferences=None, repair=True, listed_by_both=False,
+                     verbose=True):
+    """check_schedule, then return the repaired games or (repair=False) raise on blocking issues"""
+    kept, issues = check_schedule(games, registry, conferences, listed_by_both)
+    if verbose and issues:
+        counts = ', '.join(f"{count} {kind}" for kind, count in sorted(summarize_issues(issues).items()))
+        print(f"⚠️  Schedule check for {source}: {counts}")
+
+    blocking = [entry for entry in issues if entry['type'] in BLOCKING_ISSUES]
+    if blocking and not repair:
+        first = blocking[0]
+        raise ScheduleError(f"{len(blocking)} schedule issue(s) in {source}, first: {first['type']} "
+                            f"week {first['week']} {first['away']} @ {first['home']} {first['detail']}".rstrip())
+    return kept, issues
+
+def read_schedule_csv(path):
+    """Games from the per-team schedule CSV (Team, Week, Opponent, Home_Away); every game is listed by both teams"""
+    games = []
+    with open(path, 'r', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            team, opponent = row['Team'].strip(), row['Opponent'].strip()
+            home_game = row['Home_Away'].strip() == 'Home'
+            games.append({'week': int(row['Week']),
+                          'home': team if home_game else opponent,
+                          'away': opponent if home_game else team})
+    return games
+
+def read_schedule_js_games(path):
+    """Games from schedule_data.js (REAL_SCHEDULE_DATA), with their conference labels"""
+    with open(path, 'r', encoding='utf-8') as file:
+        content = file.read()
+    games = []
+    for entry in re.findall(r'\{[^{}]*homeTeam[^{}]*\}', content):
+        fields = dict(re.findall(r'(\w+):\s*"([^"]*)"', entry))
+        week = re.search(r'week:\s*(\d+)', entry)
+        if week and 'homeTeam' in fields and 'awayTeam' in fields:
+            games.append({'week': int(week.group(1)), 'home': fields['homeTeam'], 'away': fields['awayTeam'],
+                          'conference': fields.get('conference')})
+    return games
+
+def check_sources(schedule_js=None, csv_path=None, repair=True):
+    """Check whichever schedule sources exist; returns {source: {'games', 'kept', 'issues'}}"""
+    registry = TeamRegistry()
+    report = {}
+    sources = [(schedule_js, read_schedule_js_games, False), (csv_path, read_schedule_csv, True)]
+    for path, reader, listed_by_both in sources:
+        if path and os.path.exists(path):
+            games = reader(path)
+            kept, issues = enforce_schedule(games, path, registry, repair=repair, listed_by_both=listed_by_both)
+            report[path] = {'games': len(games), 'kept': len(kept),
+                            'summary': summarize_issues(issues), 'issues': issues}
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Schedule integrity check")
+    parser.add_argument('--schedule-js', default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                              '..', 'schedule_data.js'))
+    parser.add_argument('--csv', help="per-team schedule CSV")
+    parser.add_argument('--strict', action='store_true', help="fail instead of repairing")
+    parser.add_argument('--report', help="write the issues as JSON")
+    args = parser.parse_args()
+
+    try:
+        report = check_sources(args.schedule_js, args.csv, repair=not args.strict)
+    except ScheduleError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+
+    for path, result in report.items():
+        print(f"✅ {path}: {result['kept']} of {result['games']} listings kept")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        print(f"✅ Issues written to {args.report}")
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Canonical team registry shared by the app and the data-ingest scripts
+
+Every source spells some schools differently ("App State" / "Appalachian
+State", "Ole Miss" / "Mississippi"). The registry maps any known spelling to
+one team id through a hash index on normalized names, and records the names
+it could not resolve so they can be reported instead of silently falling
+through to defaults.
+"""
+
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+
+# Distinct unresolved names kept for the report; past this the least common are evicted
+MAX_UNRESOLVED = 1000
+
+# Conference memberships - Complete 134 FBS teams for 2025 (canonical spellings)
+FBS_CONFERENCES = {
+    'SEC': ['Alabama', 'Arkansas', 'Auburn', 'Florida', 'Georgia', 'Kentucky',
+            'LSU', 'Mississippi', 'Mississippi State', 'Missouri', 'South Carolina',
+            'Tennessee', 'Texas A&M', 'Vanderbilt'],
+    'Big Ten': ['Illinois', 'Indiana', 'Iowa', 'Maryland', 'Michigan', 'Michigan State',
+               'Minnesota', 'Nebraska', 'Northwestern', 'Ohio State', 'Penn State',
+               'Purdue', 'Rutgers', 'Wisconsin', 'Oregon', 'UCLA', 'USC', 'Washington'],
+    'ACC': ['Boston College', 'Clemson', 'Duke', 'Florida State', 'Georgia Tech',
+            'Louisville', 'Miami', 'North Carolina', 'NC State', 'Pittsburgh',
+            'Syracuse', 'Virginia', 'Virginia Tech', 'Wake Forest', 'SMU', 'Stanford', 'California'],
+    'Big 12': ['Arizona', 'Arizona State', 'Baylor', 'BYU', 'Cincinnati', 'Colorado',
+              'Houston', 'Iowa State', 'Kansas', 'Kansas State', 'Oklahoma', 'Oklahoma State',
+              'TCU', 'Texas', 'Texas Tech', 'UCF', 'Utah', 'West Virginia'],
+    'Pac-12': ['Oregon State', 'Washington State'],
+    'Mountain West': ['Air Force', 'Boise State', 'Colorado State', 'Fresno State',
+                     'Hawaii', 'Nevada', 'New Mexico', 'San Diego State', 'San Jose State',
+                     'UNLV', 'Utah State', 'Wyoming'],
+    'American': ['Army', 'East Carolina', 'Memphis', 'Navy', 'North Texas', 'Rice',
+                'South Florida', 'Temple', 'Tulane', 'Tulsa', 'UTSA', 'Charlotte', 'Florida Atlantic'],
+    'Conference USA': ['Florida International', 'Louisiana Tech', 'Middle Tennessee',
+                      'Old Dominion', 'UAB', 'UTEP', 'Western Kentucky', 'Sam Houston', 'Kennesaw State'],
+    'MAC': ['Akron', 'Ball State', 'Bowling Green', 'Buffalo', 'Central Michigan',
+            'Eastern Michigan', 'Kent State', 'Miami (OH)', 'Northern Illinois',
+            'Ohio', 'Toledo', 'Western Michigan'],
+    'Sun Belt': ['Appalachian State', 'Arkansas State', 'Coastal Carolina', 'Georgia Southern',
+                'Georgia State', 'James Madison', 'Louisiana', 'Louisiana Monroe',
+                'Marshall', 'South Alabama', 'Southern Miss', 'Texas State', 'Troy'],
+    'Independents': ['Notre Dame', 'UConn', 'UMass', 'Liberty', 'New Mexico State']
+}
+
+# Other spellings seen in schedules, CFBD exports and teams.json -> canonical name.
+# Accents, case, punctuation and "Miami (OH)" vs "Miami OH" are handled by
+# normalize_team_name and need no entry here.
+TEAM_ALIASES = {
+    'App State': 'Appalachian State',
+    'Connecticut': 'UConn',
+    'Ole Miss': 'Mississippi',
+    'Nicholls State': 'Nicholls',
+    'Miami (FL)': 'Miami',
+    'Miami (Ohio)': 'Miami (OH)',
+    'FIU': 'Florida International',
+    'FAU': 'Florida Atlantic',
+    'UL Monroe': 'Louisiana Monroe',
+    'ULM': 'Louisiana Monroe',
+    'Louisiana-Lafayette': 'Louisiana',
+    'UL Lafayette': 'Louisiana',
+    'Southern Mississippi': 'Southern Miss',
+    'Sam Houston State': 'Sam Houston',
+    'Massachusetts': 'UMass',
+    'North Carolina State': 'NC State',
+    'Brigham Young': 'BYU',
+    'Southern California': 'USC',
+    'Southern Methodist': 'SMU',
+    'Texas Christian': 'TCU',
+    'Louisiana State': 'LSU',
+    'Central Florida': 'UCF',
+    'USF': 'South Florida',
+    'UT San Antonio': 'UTSA',
+    'Texas-San Antonio': 'UTSA',
+    'UT El Paso': 'UTEP',
+    'Texas-El Paso': 'UTEP',
+    'Alabama-Birmingham': 'UAB',
+    'Nevada-Las Vegas': 'UNLV',
+    'Pitt': 'Pittsburgh',
+    'Middle Tennessee State': 'Middle Tennessee',
+    'MTSU': 'Middle Tennessee',
+    'WKU': 'Western Kentucky',
+    'JMU': 'James Madison',
+    'Army West Point': 'Army',
+    'Cal': 'California',
+}
+
+def normalize_team_name(name):
+    """Lookup key for a team name: ASCII, lower case, no punctuation, single spaces"""
+    text = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    text = re.sub(r"['.]", '', text.lower()).replace('&', ' and ')
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', text).split())
+
+class TeamRegistry:
+    """Canonical team names with an O(1) alias index
+
+    Team ids are dense (0..len-1) in registration order, so they can index
+    per-team arrays directly.
+    """
+    def __init__(self, conferences=FBS_CONFERENCES, aliases=TEAM_ALIASES):
+        self.names = []
+        self.conferences = {}
+        self.index = {}
+        self.unresolved = Counter()
+        self._lock = threading.Lock()
+
+        for conference, teams in conferences.items():
+            for team in teams:
+                self.add_team(team, conference)
+        for alias, canonical in aliases.items():
+            self.add_alias(alias, canonical)
+
+    def __len__(self):
+        return len(self.names)
+
+    def add_team(self, name, conference=None):
+        """Register a canonical name (no-op if any spelling of it is known); returns its id"""
+        team_id = self.lookup(name)
+        if team_id is None:
+            team_id = len(self.names)
+            self.names.append(name)
+            self.index[name] = team_id
+            self.index[normalize_team_name(name)] = team_id
+        if conference and self.names[team_id] not in self.conferences:
+            self.conferences[self.names[team_id]] = conference
+        return team_id
+
+    def add_alias(self, alias, canonical):
+        team_id = self.add_team(canonical)
+        self.index[alias] = team_id
+        self.index[normalize_team_name(alias)] = team_id
+        return team_id
+
+    def lookup(self, name):
+        """Team id for any known spelling, or None"""
+        team_id = self.index.get(name)
+        if team_id is None and name is not None:
+            team_id = self.index.get(normalize_team_name(name))
+        return team_id
+
+    def resolve_id(self, name):
+        """Like lookup, but remembers names that could not be resolved
+        
+        At most MAX_UNRESOLVED names are kept: a new name evicts the least
+        common one, so request-supplied junk cannot grow the report unbounded.
+        """
+        team_id = self.lookup(name)
+        if team_id is None:
+            with self._lock:
+                if name not in self.unresolved and len(self.unresolved) >= MAX_UNRESOLVED:
+                    del self.unresolved[min(self.unresolved, key=self.unresolved.get)]
+                self.unresolved[name] += 1
+        return team_id
+
+    def canonical_name(self, name):
+        """Canonical spelling of name; unknown names are returned unchanged (and reported)"""
+        team_id = self.resolve_id(name)
+        return name if team_id is None else self.names[team_id]
+
+    def keys_by_team(self, keys):
+        """{canonical name: [the keys among keys that spell it]}; unknown keys map to themselves
+        
+        Lets a writer update a JSON file under the spellings it already uses.
+        """
+        by_team = {}
+        for key in keys:
+            team_id = self.lookup(key)
+            by_team.setdefault(key if team_id is None else self.names[team_id], []).append(key)
+        return by_team
+
+    def conference(self, name, default='Unknown'):
+        team_id = self.lookup(name)
+        return default if team_id is None else self.conferences.get(self.names[team_id], default)
+
+    def unresolved_report(self):
+        """Unresolved names, most frequent first"""
+        with self._lock:
+            return [{'name': name, 'count': count} for name, count in self.unresolved.most_common()]
+
+    def print_unresolved(self, source):
+        report = self.unresolved_report()
+        if not report:
+            print(f"✅ All team names in {source} resolved")
+            return
+        print(f"⚠️  {len(report)} team name(s) in {source} not in the registry (kept as-is):")
+        for entry in report:
+            print(f"  - {entry['name']} ({entry['count']})")
+
+def trigrams(key):
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class TeamSearchIndex:
+    """Type-ahead search over a registry's canonical names and aliases
+
+    Every prefix of every spelling (and of each word within it, so "state"
+    finds "Ohio State") maps to a precomputed, ranked result list, so a prefix
+    query is a single dict lookup. Queries that are not a prefix of anything
+    (typos, "mississipi") fall back to trigram similarity.
+    """
+    def __init__(self, registry, limit=10, min_similarity=0.3):
+        self.limit = limit
+        self.min_similarity = min_similarity
+        self.entries = [
+            {'team_id': team_id, 'name': name, 'conference': registry.conference(name)}
+            for team_id, name in enumerate(registry.names)
+        ]
+
+        self.keys = {}
+        for spelling, team_id in registry.index.items():
+            self.keys.setdefault(normalize_team_name(spelling), team_id)
+
+        # Rank tiers: 0 exact spelling, 1 start of a spelling, 2 start of a later word
+        best_tier = defaultdict(dict)
+        self.trigram_keys = defaultdict(list)
+        self.trigram_counts = {}
+        for key, team_id in self.keys.items():
+            words = key.split()
+            for start in range(len(words)):
+                tail = ' '.join(words[start:])
+                for end in range(1, len(tail) + 1):
+                    tier = 2 if start else (0 if end == len(tail) else 1)
+                    tiers = best_tier[tail[:end]]
+                    tiers[team_id] = min(tier, tiers.get(team_id, tier))
+            grams = trigrams(key)
+            self.trigram_counts[key] = len(grams)
+            for gram in grams:
+                self.trigram_keys[gram].append(key)
+
+        # FBS teams before others, then shorter and alphabetical names
+        def rank(team_id, tier):
+            entry = self.entries[team_id]
+            return (tier, entry['conference'] == 'Unknown', len(entry['name']), entry['name'])
+
+        self.prefixes = {
+            prefix: [self.entries[team_id] for team_id in
+                     sorted(tiers, key=lambda team_id: rank(team_id, tiers[team_id]))[:limit]]
+            for prefix, tiers in best_tier.items()
+        }
+
+    def search(self, query, limit=None):
+        """Ranked matches for query: dicts with team_id, name and conference"""
+        limit = min(limit or self.limit, self.limit)
+        key = normalize_team_name(query)
+        if not key:
+            return []
+
+        matches = self.prefixes.get(key)
+        if matches is not None:
+            return matches[:limit]
+        return self.fuzzy_search(key, limit)
+
+    def fuzzy_search(self, key, limit):
+        """Teams whose spellings share enough trigrams with key (Jaccard similarity)"""
+        query_grams = trigrams(key)
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self.trigram_keys.get(gram, ()))
+
+        scores = {}
+        for candidate, count in shared.items():
+            similarity = count / (len(query_grams) + self.trigram_counts[candidate] - count)
+            team_id = self.keys[candidate]
+            if similarity >= self.min_similarity and similarity > scores.get(team_id, 0):
+                scores[team_id] = similarity
+
+        ranked = sorted(scores, key=lambda team_id: (-scores[team_id], self.entries[team_id]['name']))
+        return [self.entries[team_id] for team_id in ranked[:limit]]
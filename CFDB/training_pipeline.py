@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""
+Headless training pipeline with cached stages
+
+The notebook's load_cfb_data -> create_training_features ->
+train_models_new_approach -> predict_2025_games steps as importable stages;
+the notebook imports them from here.
+Each stage's output is pickled under a key hashed from the stage's source
+code, its parameters, the content of the files it reads and the keys of the
+stages it depends on. All keys are computed before anything runs, and a
+stage's output is only unpickled when something downstream actually needs
+it: changing nothing loads just the final predictions, and changing a model
+hyperparameter retrains from the cached features.
+
+Data files are re-hashed only when their size or mtime changes. The cache is
+trimmed to --cache-size-mb after every write, least recently used first.
+
+Usage: python3 training_pipeline.py --years 2022 2023 2024 [--predict-year 2025]
+                                    [--set rf_n_estimators=200] [--force features] [--save-model]
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+from build_utils import atomic_write_bytes, atomic_write_text, file_sha256
+
+DATA_DIR = 'cfbd_data'
+DEFAULT_CACHE_DIR = os.path.join(DATA_DIR, '.pipeline_cache')
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+# Bump to invalidate every cached stage (e.g. after changing the pickle layout)
+CACHE_VERSION = 1
+
+DATA_TYPES = ['games', 'team_stats', 'advanced_stats', 'ratings_sp', 'ratings_elo', 'ratings_fpi']
+STAGES = ['load', 'features', 'train', 'predict']
+
+# Hyperparameters of train_models_new_approach; every one is part of the train key
+TRAINING_PARAMS = {
+    'test_size': 0.2,
+    'rf_n_estimators': 100,
+    'rf_max_depth': 10,
+    'gb_n_estimators': 100,
+    'gb_max_depth': 6,
+    'lr_max_iter': 1000,
+}
+
+def load_cfb_data(years, data_dir=DATA_DIR):
+    """Load and combine college football data from multiple years"""
+    data = {}
+    for data_type in DATA_TYPES:
+        combined_data = []
+        for year in years:
+            path = os.path.join(data_dir, f'{data_type}_{year}.csv')
+            if not os.path.exists(path):
+                print(f"✗ {data_type}_{year}.csv not found")
+                continue
+            df = pd.read_csv(path)
+            df['year'] = year
+            combined_data.append(df)
+            print(f"✓ Loaded {data_type} for {year}: {len(df)} rows")
+
+        data[data_type] = pd.concat(combined_data, ignore_index=True) if combined_data else pd.DataFrame()
+    return data
+
+def create_team_features(team_name, year, cfb_data):
+    """Create comprehensive features for a team in a given year"""
+    features = {}
+
+    team_stats = cfb_data['team_stats']
+    if not team_stats.empty:
+        team_data = team_stats[(team_stats['team'] == team_name) & (team_stats['year'] == year)]
+        if not team_data.empty:
+            if 'statName' in team_data.columns and 'stat' in team_data.columns:
+                # Long format - one row per stat
+                stats_dict = team_data.set_index('statName')['stat'].to_dict()
+                features.update({
+                    'points_per_game': stats_dict.get('pointsPerGame', 0),
+                    'total_yards': stats_dict.get('totalYards', 0),
+                    'passing_yards': stats_dict.get('passingYards', 0),
+                    'rushing_yards': stats_dict.get('rushingYards', 0),
+                    'turnovers': stats_dict.get('turnoversLost', 0),
+                    'third_down_conv': stats_dict.get('thirdDownConversions', 0),
+                    'penalties': stats_dict.get('penalties', 0),
+                })
+            else:
+                row = team_data.iloc[0]
+                features.update({
+                    'points_per_game': row.get('pointsPerGame', 0),
+                    'total_yards': row.get('totalYards', 0),
+                    'passing_yards': row.get('passingYards', 0),
+                    'rushing_yards': row.get('rushingYards', 0),
+                    'turnovers': row.get('turnoversLost', 0),
+                })
+
+    adv_stats = cfb_data['advanced_stats']
+    if not adv_stats.empty:
+        adv_data = adv_stats[(adv_stats['team'] == team_name) & (adv_stats['year'] == year)]
+        if not adv_data.empty:
+            row = adv_data.iloc[0]
+            features.update({
+                'off_success_rate': row.get('offense.successRate', 0),
+                'off_explosiveness': row.get('offense.explosiveness', 0),
+                'def_success_rate': row.get('defense.successRate', 0),
+                'def_explosiveness': row.get('defense.explosiveness', 0),
+            })
+
+    for rating_type in ['sp', 'elo', 'fpi']:
+        ratings = cfb_data.get(f'ratings_{rating_type}')
+        if ratings is not None and not ratings.empty:
+            rating_data = ratings[(ratings['team'] == team_name) & (ratings['year'] == year)]
+            if not rating_data.empty:
+                row = rating_data.iloc[0]
+                if rating_type == 'sp':
+                    features['sp_rating'] = row.get('rating', 0)
+                    features['sp_offense'] = row.get('offense.rating', 0)
+                    features['sp_defense'] = row.get('defense.rating', 0)
+                elif rating_type == 'elo':
+                    features['elo_rating'] = row.get('elo', 1500)
+                elif rating_type == 'fpi':
+                    features['fpi_rating'] = row.get('fpi', 0)
+
+    for key, value in features.items():
+        if pd.isna(value) or value is None:
+            features[key] = 1500 if 'elo' in key else 0
+    return features
+
+def matchup_features(home_features, away_features):
+    """home_*, away_* and diff_* columns for one game"""
+    game_features = {}
+    for key, value in home_features.items():
+        game_features[f'home_{key}'] = value
+    for key, value in away_features.items():
+        game_features[f'away_{key}'] = value
+    for key in home_features.keys():
+        if key in away_features:
+            game_features[f'diff_{key}'] = home_features[key] - away_features[key]
+    return game_features
+
+def create_training_features(cfb_data):
+    """Synthetic matchups between each year's teams, labelled from team strength
+
+    Same draws as the notebook (random.seed(42)); each team's features are
+    built once per year instead of once per matchup.
+    """
+    teams_by_year = {}
+    if not cfb_data['team_stats'].empty:
+        team_stats = cfb_data['team_stats']
+        for year in team_stats['year'].unique():
+            teams_by_year[year] = list(team_stats[team_stats['year'] == year]['team'].unique())
+
+    random.seed(42)
+    training_features = []
+    for year, teams in teams_by_year.items():
+        if len(teams) < 2:
+            continue
+        print(f"Creating training data for {year} with {len(teams)} teams...")
+
+        team_features = {}
+        for _ in range(min(500, len(teams) * 2)):
+            home_team, away_team = random.sample(teams, 2)
+            for team in (home_team, away_team):
+                if team not in team_features:
+                    team_features[team] = create_team_features(team, year, cfb_data)
+            home_features, away_features = team_features[home_team], team_features[away_team]
+            if not home_features or not away_features:
+                continue
+
+            home_strength = (home_features.get('sp_rating', 0) +
+                             home_features.get('elo_rating', 1500) / 1500 * 100 +
+                             home_features.get('points_per_game', 20)) + 3  # home field
+            away_strength = (away_features.get('sp_rating', 0) +
+                              away_features.get('elo_rating', 1500) / 1500 * 100 +
+                              away_features.get('points_per_game', 20))
+            win_probability = 1 / (1 + np.exp(-(home_strength - away_strength) / 10))
+            home_wins = 1 if random.random() < win_probability else 0
+
+            game_features = {
+                'year': year,
+                'week': random.randint(1, 12),
+                'neutral_site': 0,
+                'home_win': home_wins,
+            }
+            game_features.update(matchup_features(home_features, away_features))
+            training_features.append(game_features)
+
+    if not training_features:
+        print("❌ No training features could be created!")
+        return pd.DataFrame()
+
+    df = pd.DataFrame(training_features)
+    print(f"✅ Created {len(df)} training examples (home win rate {df['home_win'].mean():.3f})")
+    return df
+
+def training_matrix(training_df):
+    """(X_train, y_train, feature_columns): numeric home_/away_/diff_ columns plus week and neutral_site"""
+    if training_df.empty:
+        return None, None, []
+
+    numeric = ['int64', 'float64', 'int32', 'float32']
+    feature_columns = [col for col in training_df.columns
+                       if col.startswith(('home_', 'away_', 'diff_')) and col != 'home_win'
+                       and training_df[col].dtype in numeric]
+    feature_columns += [col for col in ['week', 'neutral_site']
+                        if col in training_df.columns and training_df[col].dtype in numeric]
+    if not feature_columns:
+        return None, None, []
+    return training_df[feature_columns].fillna(0), training_df['home_win'], feature_columns
+
+def train_models_new_approach(X_train, y_train, feature_columns, params=TRAINING_PARAMS):
+    """Fit the three candidate models, keep the one with the best validation AUC"""
+    from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.metrics import accuracy_score, roc_auc_score
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    print(f"Training models with {len(X_train)} examples and {len(feature_columns)} features...")
+    X_train_split, X_val_split, y_train_split, y_val_split = train_test_split(
+        X_train, y_train, test_size=params['test_size'], random_state=42, stratify=y_train
+    )
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train_split)
+    X_val_scaled = scaler.transform(X_val_split)
+
+    models = {
+        'Random Forest': RandomForestClassifier(n_estimators=params['rf_n_estimators'],
+                                                max_depth=params['rf_max_depth'], random_state=42),
+        'Gradient Boosting': GradientBoostingClassifier(n_estimators=params['gb_n_estimators'],
+                                                        max_depth=params['gb_max_depth'], random_state=42),
+        'Logistic Regression': LogisticRegression(random_state=42, max_iter=params['lr_max_iter'])
+    }
+
+    results = {}
+    for name, model in models.items():
+        if name == 'Logistic Regression':
+            model.fit(X_train_scaled, y_train_split)
+            y_pred = model.predict(X_val_scaled)
+            y_pred_proba = model.predict_proba(X_val_scaled)[:, 1]
+        else:
+            model.fit(X_train_split, y_train_split)
+            y_pred = model.predict(X_val_split)
+            y_pred_proba = model.predict_proba(X_val_split)[:, 1]
+
+        results[name] = {
+            'model': model,
+            'accuracy': accuracy_score(y_val_split, y_pred),
+            'auc': roc_auc_score(y_val_split, y_pred_proba)
+        }
+        print(f"  {name}: accuracy {results[name]['accuracy']:.3f}, AUC {results[name]['auc']:.3f}")
+
+    best_model_name = max(results.keys(), key=lambda k: results[k]['auc'])
+    print(f"✅ Best Model: {best_model_name}")
+    return results, results[best_model_name]['model'], best_model_name, scaler
+
+def load_schedule(year, data_dir=DATA_DIR):
+    """games_{year}.csv as (home_team, away_team, week, neutral_site) rows"""
+    path = os.path.join(data_dir, f'games_{year}.csv')
+    if not os.path.exists(path):
+        print(f"✗ {path} not found")
+        return pd.DataFrame(columns=['home_team', 'away_team', 'week', 'neutral_site'])
+
+    games = pd.read_csv(path).rename(columns={
+        'homeTeam': 'home_team', 'awayTeam': 'away_team', 'neutralSite': 'neutral_site'
+    })
+    if 'week' not in games.columns:
+        games['week'] = 1
+    if 'neutral_site' not in games.columns:
+        games['neutral_site'] = False
+    return games[['home_team', 'away_team', 'week', 'neutral_site']].dropna(subset=['home_team', 'away_team'])
+
+def predict_2025_games(games, best_model, best_model_name, scaler, feature_columns, cfb_data, feature_year):
+    """Predict every scheduled game from each team's feature_year features, in one batch"""
+    if games.empty:
+        return pd.DataFrame()
+
+    team_features = {}
+    rows = []
+    for game in games.itertuples(index=False):
+        for team in (game.home_team, game.away_team):
+            if team not in team_features:
+                team_features[team] = create_team_features(team, feature_year, cfb_data)
+        game_features = {'week': game.week, 'neutral_site': 0}
+        game_features.update(matchup_features(team_features[game.home_team], team_features[game.away_team]))
+        rows.append([game_features.get(col, 0) for col in feature_columns])
+
+    X_pred = pd.DataFrame(rows, columns=feature_columns, dtype=float)
+    if best_model_name == 'Logistic Regression':
+        X_pred = scaler.transform(X_pred)
+    probabilities = best_model.predict_proba(X_pred)
+    home_prob = probabilities[:, 1]
+    home_wins = home_prob > 0.5
+
+    return pd.DataFrame({
+        'home_team': games['home_team'].to_numpy(),
+        'away_team': games['away_team'].to_numpy(),
+        'week': games['week'].to_numpy(),
+        'predicted_home_win': home_wins.astype(int),
+        'home_win_probability': home_prob,
+        'away_win_probability': probabilities[:, 0],
+        'confidence': probabilities.max(axis=1),
+        'predicted_winner': np.where(home_wins, games['home_team'].to_numpy(), games['away_team'].to_numpy())
+    })
+
+class StageCache:
+    """Pickled stage outputs keyed by content hash, trimmed to max_bytes (least recently used first)"""
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self.hash_index_path = os.path.join(cache_dir, 'file_hashes.json')
+        self.hash_index = {}
+        if os.path.exists(self.hash_index_path):
+            with open(self.hash_index_path, 'r', encoding='utf-8') as file:
+                self.hash_index = json.load(file)
+        self.evict()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.pkl')
+
+    def __contains__(self, key):
+        return os.path.exists(self.path(key))
+
+    def get(self, key):
+        with open(self.path(key), 'rb') as file:
+            value = pickle.load(file)
+        os.utime(self.path(key))  # mark as recently used
+        return value
+
+    def put(self, key, value):
+        atomic_write_bytes(self.path(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        self.evict(keep=key)
+
+    def evict(self, keep=None):
+        """Delete the least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            # Skip other writers' in-flight temp files
+            if name.endswith('.pkl') and not name.startswith('.tmp_'):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == f'{keep}.pkl':
+                continue
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+            removed += 1
+        return removed
+
+    def file_hash(self, path):
+        """sha256 of a file, reusing the recorded hash while its size and mtime are unchanged"""
+        if not os.path.exists(path):
+            return None
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        recorded = self.hash_index.get(key)
+        if recorded and recorded[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return recorded[2]
+
+        digest = file_sha256(path)
+        self.hash_index[key] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def save_hash_index(self):
+        atomic_write_text(self.hash_index_path, json.dumps(self.hash_index))
+
+def stage_key(stage, functions, *parts):
+    """Hash of a stage's code, parameters and upstream keys / input file hashes"""
+    digest = hashlib.sha256(f'{CACHE_VERSION}|{stage}'.encode())
+    for function in functions:
+        digest.update(inspect.getsource(function).encode())
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:32]
+
+def pipeline_keys(cache, years, data_dir, predict_year, params):
+    """Cache key of every stage, computed from inputs alone (no stage output is loaded)"""
+    import sklearn
+
+    data_files = {os.path.basename(path): cache.file_hash(path)
+                  for path in (os.path.join(data_dir, f'{data_type}_{year}.csv')
+                               for data_type in DATA_TYPES for year in years)}
+    schedule_hash = cache.file_hash(os.path.join(data_dir, f'games_{predict_year}.csv'))
+    cache.save_hash_index()
+
+    keys = {}
+    keys['load'] = stage_key('load', [load_cfb_data], list(years), data_files)
+    keys['features'] = stage_key('features', [create_team_features, matchup_features,
+                                              create_training_features, training_matrix], keys['load'])
+    keys['train'] = stage_key('train', [train_models_new_approach], keys['features'],
+                              params, sklearn.__version__)
+    keys['predict'] = stage_key('predict', [load_schedule, create_team_features, matchup_features,
+                                            predict_2025_games], keys['train'], keys['load'],
+                                predict_year, schedule_hash)
+    return keys
+
+def run_pipeline(years, data_dir=DATA_DIR, predict_year=2025, params=None, cache=None, force=(),
+                 targets=('predict',), on_stage=None):
+    """Run (or fetch from cache) the stages targets need; returns {stage: output} for the stages touched
+
+    force lists stages to recompute together with everything after them.
+    on_stage(stage, cached) is called as each stage's output becomes available.
+    """
+    params = {**TRAINING_PARAMS, **(params or {})}
+    cache = cache or StageCache()
+    keys = pipeline_keys(cache, years, data_dir, predict_year, params)
+    forced = set(STAGES[min(STAGES.index(stage) for stage in force):]) if force else set()
+    outputs = {}
+
+    def compute(stage):
+        if stage == 'load':
+            return load_cfb_data(years, data_dir)
+        if stage == 'features':
+            return training_matrix(create_training_features(value('load')))
+        if stage == 'train':
+            X_train, y_train, feature_columns = value('features')
+            if X_train is None:
+                raise ValueError("No training data available")
+            results, best_model, best_model_name, scaler = train_models_new_approach(
+                X_train, y_train, feature_columns, params)
+            return {
+                'model': best_model,
+                'scaler': scaler,
+                'feature_columns': feature_columns,
+                'model_name': best_model_name,
+                'model_results': {name: {'accuracy': float(result['accuracy']), 'auc': float(result['auc'])}
+                                  for name, result in results.items()}
+            }
+        package = value('train')
+        return predict_2025_games(load_schedule(predict_year, data_dir), package['model'], package['model_name'],
+                                  package['scaler'], package['feature_columns'], value('load'), max(years))
+
+    def value(stage):
+        if stage in outputs:
+            return outputs[stage]
+
+        start = time.perf_counter()
+        key = keys[stage]
+        cached = stage not in forced and key in cache
+        if cached:
+            outputs[stage] = cache.get(key)
+            print(f"⏩ {stage}: cached ({time.perf_counter() - start:.2f}s)")
+        else:
+            outputs[stage] = compute(stage)
+            cache.put(key, outputs[stage])
+            print(f"✅ {stage}: computed ({time.perf_counter() - start:.2f}s)")
+        if on_stage:
+            on_stage(stage, cached)
+        return outputs[stage]
+
+    for target in targets:
+        value(target)
+    return outputs
+
+def save_model_package(package, path='cfb_prediction_model.pkl'):
+    """Write the app's model package (.pkl) and the matching NumPy kernel (.npz)"""
+    from datetime import datetime
+    from export_model import export_linear_model, export_tree_ensemble
+
+    package = {**package, 'training_timestamp': datetime.now().strftime("%Y%m%d_%H%M%S")}
+    with open(path, 'wb') as file:
+        pickle.dump(package, file)
+
+    npz_path = os.path.splitext(path)[0] + '.npz'
+    if package['model_name'] == 'Logistic Regression':
+        export_linear_model(package['model'], package['scaler'], package['feature_columns'],
+                            package['model_name'], npz_path)
+    else:
+        export_tree_ensemble(package['model'], package['feature_columns'], package['model_name'], npz_path)
+    return path, npz_path
+
+def parse_params(assignments):
+    """--set name=value overrides, typed like the TRAINING_PARAMS defaults"""
+    params = {}
+    for assignment in assignments:
+        name, _, raw = assignment.partition('=')
+        if name not in TRAINING_PARAMS:
+            raise SystemExit(f"Unknown parameter {name!r} (choose from {', '.join(TRAINING_PARAMS)})")
+        params[name] = type(TRAINING_PARAMS[name])(raw)
+    return params
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cached training and prediction pipeline")
+    parser.add_argument('--years', type=int, nargs='+', default=[2022, 2023, 2024])
+    parser.add_argument('--predict-year', type=int, default=2025)
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--cache-dir', default=None, help="default: <data-dir>/.pipeline_cache")
+    parser.add_argument('--cache-size-mb', type=float, default=DEFAULT_CACHE_BYTES / 1024 / 1024)
+    parser.add_argument('--set', dest='params', action='append', default=[], metavar='NAME=VALUE',
+                        help=f"override a training parameter ({', '.join(TRAINING_PARAMS)})")
+    parser.add_argument('--force', nargs='*', choices=STAGES, default=[],
+                        help="recompute these stages and everything after them")
+    parser.add_argument('--output', default=None, help="predictions CSV (default: <data-dir>/predictions_<year>.csv)")
+    parser.add_argument('--save-model', action='store_true', help="write cfb_prediction_model.pkl/.npz")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stage_cache = StageCache(args.cache_dir or os.path.join(args.data_dir, '.pipeline_cache'),
+                             int(args.cache_size_mb * 1024 * 1024))
+    outputs = run_pipeline(args.years, args.data_dir, args.predict_year, parse_params(args.params),
+                           stage_cache, args.force, ['predict', 'train'] if args.save_model else ['predict'])
+
+    predictions = outputs['predict']
+    output = args.output or os.path.join(args.data_dir, f'predictions_{args.predict_year}.csv')
+    predictions.to_csv(output, index=False)
+    print(f"✅ {len(predictions)} predictions saved to {output}")
+
+    if args.save_model:
+        for path in save_model_package(outputs['train']):
+            print(f"✅ Saved {path}")
+    print(f"Total wall time: {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Incremental build runner for the schedule and team data scripts
+
+Each stage declares the files it reads and writes. A stage is skipped when
+the content hashes of its inputs and outputs match the end of the last
+successful build; stages whose dependencies are finished run in parallel.
+
+Usage: python3 build_pipeline.py [--csv PATH] [--app-dir DIR] [--strict-schedule] [--force]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from build_utils import (REPO_DIR, CFDB_DIR, DEFAULT_APP_DIR, DEFAULT_SCHEDULE_CSV,
+                         atomic_write_text, file_sha256)
+
+import extract_teams_from_schedule
+import update_performance_tracker
+import update_schedule_from_csv
+from prediction_store import DEFAULT_LOG_PATH, PredictionStore
+
+sys.path.insert(0, CFDB_DIR)
+import generate_complete_schedule
+import schedule_check
+
+STATE_FILE = os.path.join(REPO_DIR, '.build_state.json')
+DEFAULT_SCHEDULE_JS = os.path.join(REPO_DIR, 'schedule_data.js')
+DEFAULT_SCHEDULE_REPORT = os.path.join(REPO_DIR, 'schedule_check.json')
+
+class Stage:
+    def __init__(self, name, inputs, outputs, action, deps=(), optional_inputs=()):
+        self.name = name
+        self.inputs = list(inputs) + list(optional_inputs)
+        self.optional_inputs = set(optional_inputs)
+        self.outputs = list(outputs)
+        self.action = action
+        self.deps = list(deps)
+
+def build_stages(csv_path, app_dir, complete_schedule_path, prediction_log=DEFAULT_LOG_PATH,
+                 schedule_js=DEFAULT_SCHEDULE_JS, schedule_report=DEFAULT_SCHEDULE_REPORT, strict_schedule=False):
+    """Declare the data-generation DAG
+
+    The schedule check runs first; with strict_schedule a defective schedule
+    fails it and blocks every stage that generates a schedule from the CSV.
+    """
+    app_js = os.path.join(app_dir, 'app.js')
+    tracker_js = os.path.join(app_dir, 'performance_tracker.js')
+    metrics_json = os.path.join(app_dir, 'performance_metrics.json')
+
+    def update_teams_list():
+        teams = extract_teams_from_schedule.extract_teams_from_app_js(app_js)
+        extract_teams_from_schedule.update_teams_list_in_app_js(app_js, teams)
+
+    def update_tracker():
+        store = PredictionStore(prediction_log)
+        games = update_performance_tracker.extract_week1_games_from_app_js(app_js, store)
+        update_performance_tracker.update_performance_tracker(tracker_js, games)
+        store.export_artifact(metrics_json)
+        store.save()
+
+    def check_schedules():
+        report = schedule_check.check_sources(schedule_js, csv_path, repair=not strict_schedule)
+        atomic_write_text(schedule_report, json.dumps(report, indent=2))
+
+    def write_complete_schedule():
+        schedule = generate_complete_schedule.generate_complete_schedule(csv_path)
+        atomic_write_text(complete_schedule_path, json.dumps(schedule, indent=2))
+
+    # teams.json is not generated here: the app's file holds hand-maintained
+    # ratings and season stats per team that update_teams_json cannot rebuild.
+    # Recorded separately per mode, so turning on strict_schedule re-checks an unchanged schedule
+    check_stage = 'schedule_check_strict' if strict_schedule else 'schedule_check'
+
+    return [
+        Stage(check_stage, [csv_path], [schedule_report], check_schedules, optional_inputs=[schedule_js]),
+        Stage('schedule_js', [csv_path, app_js], [app_js],
+              lambda: update_schedule_from_csv.update_app_js(csv_path, app_js), deps=[check_stage]),
+        Stage('teams_list_js', [app_js], [app_js], update_teams_list, deps=['schedule_js']),
+        Stage('performance_tracker', [app_js], [tracker_js, metrics_json], update_tracker,
+              deps=['teams_list_js'], optional_inputs=[prediction_log]),
+        Stage('complete_schedule', [csv_path], [complete_schedule_path], write_complete_schedule,
+              deps=[check_stage]),
+    ]
+
+def load_state(state_path):
+    if os.path.exists(state_path):
+        with open(state_path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    return {}
+
+def stage_hashes(stage):
+    return {
+        'inputs': {path: file_sha256(path) for path in stage.inputs},
+        'outputs': {path: file_sha256(path) for path in stage.outputs},
+    }
+
+def run_stage(stage, record, force):
+    """Run one stage unless its recorded hashes still match; returns 'built' or 'skipped'"""
+    hashes = stage_hashes(stage)
+    missing = [path for path, digest in hashes['inputs'].items()
+               if digest is None and path not in stage.optional_inputs]
+    if missing:
+        raise FileNotFoundError(f"missing input(s): {', '.join(missing)}")
+
+    if not force and record == hashes:
+        return 'skipped'
+
+    stage.action()
+    return 'built'
+
+def run_pipeline(stages, state_path=STATE_FILE, force=False, max_workers=4):
+    """Run stages in dependency order, in parallel where possible"""
+    state = load_state(state_path)
+    pending = {stage.name: stage for stage in stages}
+    succeeded, failed = set(), set()
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if any(dep in failed for dep in stage.deps):
+                    print(f"⏭️  {name}: blocked by a failed dependency")
+                    failed.add(name)
+                    del pending[name]
+                elif all(dep in succeeded for dep in stage.deps):
+                    running[pool.submit(run_stage, stage, state.get(name), force)] = stage
+                    del pending[name]
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                try:
+                    status = future.result()
+                    succeeded.add(stage.name)
+                    print(f"{'✅' if status == 'built' else '⏩'} {stage.name}: {status}")
+                except Exception as e:
+                    failed.add(stage.name)
+                    print(f"❌ {stage.name}: {e}")
+
+    # Record the tree as it stands after the build. Stages that share a file
+    # (app.js) then see their own and later stages' writes as up to date.
+    for stage in stages:
+        if stage.name in succeeded:
+            state[stage.name] = stage_hashes(stage)
+    atomic_write_text(state_path, json.dumps(state, indent=2, sort_keys=True))
+
+    return succeeded, failed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild generated schedule and team data")
+    parser.add_argument('--csv', default=DEFAULT_SCHEDULE_CSV, help="2025 schedule CSV")
+    parser.add_argument('--app-dir', default=DEFAULT_APP_DIR, help="web app directory to update")
+    parser.add_argument('--complete-schedule', default=os.path.join(REPO_DIR, 'CFDB', 'complete_schedule.json'))
+    parser.add_argument('--prediction-log', default=DEFAULT_LOG_PATH, help="prediction/result log")
+    parser.add_argument('--schedule-js', default=DEFAULT_SCHEDULE_JS, help="schedule_data.js to check")
+    parser.add_argument('--strict-schedule', action='store_true',
+                        help="fail the build on schedule defects instead of repairing them")
+    parser.add_argument('--force', action='store_true', help="rebuild every stage")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stages = build_stages(args.csv, args.app_dir, args.complete_schedule, args.prediction_log,
+                          args.schedule_js, strict_schedule=args.strict_schedule)
+    succeeded, failed = run_pipeline(stages, force=args.force)
+
+    print(f"\n🏁 {len(succeeded)} stage(s) up to date, {len(failed)} failed in {time.perf_counter() - start:.2f}s")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Shared file helpers for the data-generation scripts
+"""
+
+import hashlib
+import os
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+CFDB_DIR = os.path.join(REPO_DIR, 'CFDB')
+DEFAULT_APP_DIR = os.path.join(REPO_DIR, 'college-football-app')
+DEFAULT_SCHEDULE_CSV = os.path.join(REPO_DIR, '2025_college_football_schedules.csv')
+
+def file_sha256(path):
+    """Content hash of a file, or None if it does not exist"""
+    if not os.path.exists(path):
+        return None
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def atomic_write_bytes(path, content):
+    """Write a file via a temp file and rename so readers never see a partial file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def atomic_write_text(path, content):
+    """atomic_write_bytes for UTF-8 text"""
+    atomic_write_bytes(path, content.encode('utf-8'))
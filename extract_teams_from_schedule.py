@@ -3,8 +3,11 @@
 Script to extract all unique teams from the real 2025 schedule and update the teams list
 """
 
+import os
 import re
 
+from build_utils import DEFAULT_APP_DIR, atomic_write_text
+
 def extract_teams_from_app_js(app_js_path):
     """Extract all unique team names from the app.js schedule"""
     teams = set()
@@ -29,6 +32,8 @@ def extract_teams_from_app_js(app_js_path):
 
 def update_teams_list_in_app_js(app_js_path, teams):
     """Update the teams list in app.js with all teams from the schedule"""
+    if not teams:
+        raise ValueError(f"No teams found in the {app_js_path} schedule; the teams list was left unchanged")
     
     with open(app_js_path, 'r', encoding='utf-8') as file:
         content = file.read()
@@ -44,15 +49,16 @@ def update_teams_list_in_app_js(app_js_path, teams):
     
     # Find and replace the teams array
     pattern = r"\[\s*//.*?\];"
-    new_content = re.sub(pattern, teams_js, content, flags=re.DOTALL)
+    new_content, replaced = re.subn(pattern, lambda _: teams_js, content, flags=re.DOTALL)
+    if not replaced:
+        raise ValueError(f"No teams array found in {app_js_path}; it was left unchanged")
     
-    with open(app_js_path, 'w', encoding='utf-8') as file:
-        file.write(new_content)
+    atomic_write_text(app_js_path, new_content)
     
     return len(teams)
 
 if __name__ == "__main__":
-    app_js_file = "/Users/jeff/NCAA Stats/college-football-app/app.js"
+    app_js_file = os.path.join(DEFAULT_APP_DIR, "app.js")
     
     print("Extracting teams from 2025 schedule...")
     teams = extract_teams_from_app_js(app_js_file)
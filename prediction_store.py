@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Append-only prediction/result log with incrementally maintained accuracy metrics
+
+Every prediction (one per game per model version) and every final result is
+appended to a JSON-lines log. Accuracy, Brier score, log-loss and calibration
+buckets per week, conference and confidence band are kept in a state file next
+to the log, together with the log offset they cover, so opening the store only
+replays records added since the last save.
+
+Usage:
+    python3 prediction_store.py add-predictions predictions.ndjson --model NAME
+    python3 prediction_store.py add-results results.csv
+    python3 prediction_store.py export performance_metrics.json
+    python3 prediction_store.py recompute
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+from datetime import datetime, timezone
+
+import numpy as np
+
+from build_utils import CFDB_DIR, REPO_DIR, atomic_write_text
+
+sys.path.insert(0, CFDB_DIR)
+from team_registry import TeamRegistry
+
+DEFAULT_LOG_PATH = os.path.join(REPO_DIR, 'prediction_log.jsonl')
+
+CALIBRATION_BUCKETS = 10
+CONFIDENCE_BANDS = ['50-60%', '60-70%', '70-80%', '80-90%', '90-100%']
+DIMENSIONS = ['overall', 'week', 'conference', 'confidence']
+LOG_LOSS_EPSILON = 1e-15
+
+def game_id(season, week, home_team, away_team):
+    return f"{season}_{week}_{home_team}_{away_team}"
+
+def confidence_band(home_win_probability):
+    confidence = max(home_win_probability, 1 - home_win_probability)
+    return CONFIDENCE_BANDS[min(int((confidence - 0.5) * 10), len(CONFIDENCE_BANDS) - 1)]
+
+def calibration_bucket(home_win_probability):
+    return min(int(home_win_probability * CALIBRATION_BUCKETS), CALIBRATION_BUCKETS - 1)
+
+def prediction_keys(prediction):
+    """The (dimension, key) cells a prediction counts toward"""
+    return [
+        ('overall', 'all'),
+        ('week', str(prediction['week'])),
+        ('conference', prediction.get('conference') or 'Non-conference'),
+        ('confidence', confidence_band(prediction['home_win_probability'])),
+    ]
+
+def new_cell():
+    return {
+        'n': 0, 'correct': 0, 'brier': 0.0, 'log_loss': 0.0,
+        # Per bucket: [games, sum of predicted probability, home wins]
+        'calibration': [[0, 0.0, 0] for _ in range(CALIBRATION_BUCKETS)]
+    }
+
+def summarize_cell(cell):
+    n = cell['n']
+    if n == 0:
+        return {'games': 0}
+
+    return {
+        'games': n,
+        'accuracy': cell['correct'] / n,
+        'brier': cell['brier'] / n,
+        'log_loss': cell['log_loss'] / n,
+        'calibration': [
+            {
+                'bucket': f"{i / CALIBRATION_BUCKETS:.1f}-{(i + 1) / CALIBRATION_BUCKETS:.1f}",
+                'games': games,
+                'mean_probability': prob_sum / games,
+                'home_win_rate': wins / games
+            }
+            for i, (games, prob_sum, wins) in enumerate(cell['calibration']) if games
+        ]
+    }
+
+def summarize_cells(cells):
+    """Nest flat 'model|dimension|key' cells as {model: {dimension: {key: metrics}}}"""
+    metrics = {}
+    for cell_key, cell in sorted(cells.items()):
+        model, dimension, key = cell_key.split('|', 2)
+        if cell['n']:
+            metrics.setdefault(model, {}).setdefault(dimension, {})[key] = summarize_cell(cell)
+    return metrics
+
+class PredictionStore:
+    def __init__(self, log_path=DEFAULT_LOG_PATH):
+        self.log_path = log_path
+        self.state_path = log_path + '.state.json'
+        self.log_offset = 0
+        self.predictions = {}  # game_id -> {model_version: prediction}
+        self.results = {}      # game_id -> home_won
+        self.cells = {}        # 'model|dimension|key' -> running sums
+        self.load()
+
+    def load(self):
+        """Load saved aggregates, then replay only the log records written after them"""
+        if os.path.exists(self.state_path):
+            with open(self.state_path, 'r', encoding='utf-8') as file:
+                state = json.load(file)
+            self.log_offset = state['log_offset']
+            self.predictions = state['predictions']
+            self.results = state['results']
+            self.cells = state['cells']
+
+        if not os.path.exists(self.log_path):
+            return
+
+        with open(self.log_path, 'r', encoding='utf-8') as file:
+            file.seek(self.log_offset)
+            for line in iter(file.readline, ''):
+                if line.strip():
+                    self.apply_record(json.loads(line))
+            self.log_offset = file.tell()
+
+    def save(self):
+        state = {
+            'log_offset': self.log_offset,
+            'predictions': self.predictions,
+            'results': self.results,
+            'cells': self.cells
+        }
+        atomic_write_text(self.state_path, json.dumps(state))
+
+    def append(self, records):
+        with open(self.log_path, 'a', encoding='utf-8') as file:
+            for record in records:
+                file.write(json.dumps(record) + '\n')
+                self.apply_record(record)
+            self.log_offset = file.tell()
+
+    def record_predictions(self, predictions):
+        """Append predictions: dicts with season, week, home_team, away_team,
+        home_win_probability, model_version and optionally conference"""
+        recorded_at = datetime.now(timezone.utc).isoformat()
+        records = []
+        for prediction in predictions:
+            records.append({
+                'type': 'prediction',
+                'game_id': game_id(prediction['season'], prediction['week'],
+                                   prediction['home_team'], prediction['away_team']),
+                'season': prediction['season'],
+                'week': prediction['week'],
+                'home_team': prediction['home_team'],
+                'away_team': prediction['away_team'],
+                'conference': prediction.get('conference'),
+                'model_version': prediction['model_version'],
+                'home_win_probability': float(prediction['home_win_probability']),
+                'recorded_at': recorded_at
+            })
+        self.append(records)
+
+    def record_results(self, results):
+        """Append final results: (game_id, home_won) pairs. A second result for a
+        game replaces the first, so corrections are scored correctly."""
+        self.append([{'type': 'result', 'game_id': gid, 'home_won': bool(home_won)}
+                     for gid, home_won in results])
+
+    def apply_record(self, record):
+        gid = record['game_id']
+
+        if record['type'] == 'prediction':
+            model = record['model_version']
+            game_predictions = self.predictions.setdefault(gid, {})
+            if gid in self.results and model in game_predictions:
+                self.score(game_predictions[model], self.results[gid], -1)
+            game_predictions[model] = record
+            if gid in self.results:
+                self.score(record, self.results[gid], 1)
+
+        elif record['type'] == 'result':
+            game_predictions = self.predictions.get(gid, {})
+            if gid in self.results:
+                for prediction in game_predictions.values():
+                    self.score(prediction, self.results[gid], -1)
+            self.results[gid] = record['home_won']
+            for prediction in game_predictions.values():
+                self.score(prediction, record['home_won'], 1)
+
+    def score(self, prediction, home_won, sign):
+        """Add (sign=1) or remove (sign=-1) one scored prediction from its cells"""
+        p = prediction['home_win_probability']
+        y = 1 if home_won else 0
+        clipped = min(max(p, LOG_LOSS_EPSILON), 1 - LOG_LOSS_EPSILON)
+
+        correct = int((p > 0.5) == bool(y))
+        brier = (p - y) ** 2
+        log_loss = -(y * math.log(clipped) + (1 - y) * math.log(1 - clipped))
+        bucket = calibration_bucket(p)
+
+        for dimension, key in prediction_keys(prediction):
+            cell_key = f"{prediction['model_version']}|{dimension}|{key}"
+            cell = self.cells.setdefault(cell_key, new_cell())
+            cell['n'] += sign
+            cell['correct'] += sign * correct
+            cell['brier'] += sign * brier
+            cell['log_loss'] += sign * log_loss
+            calibration = cell['calibration'][bucket]
+            calibration[0] += sign
+            calibration[1] += sign * p
+            calibration[2] += sign * y
+
+    def metrics(self):
+        return summarize_cells(self.cells)
+
+    def scored_games(self, week=None, model_version=None):
+        """Predictions that have a result, for the tracker UI"""
+        games = []
+        for gid, home_won in self.results.items():
+            for model, prediction in self.predictions.get(gid, {}).items():
+                if model_version not in (None, model):
+                    continue
+                if week is not None and prediction['week'] != week:
+                    continue
+                p = prediction['home_win_probability']
+                games.append({
+                    'home': prediction['home_team'],
+                    'away': prediction['away_team'],
+                    'week': prediction['week'],
+                    'model': model,
+                    'homeWinProb': round(p, 3),
+                    'confidence': round(max(p, 1 - p), 3),
+                    'correct': (p > 0.5) == home_won
+                })
+        return games
+
+    def latest_model_version(self):
+        """The model version whose first prediction was recorded most recently
+        
+        Versions are dated by the recorded_at of their earliest prediction;
+        records from before timestamps were logged count as oldest.
+        """
+        created = {}
+        for game_predictions in self.predictions.values():
+            for model, prediction in game_predictions.items():
+                recorded_at = prediction.get('recorded_at', '')
+                created[model] = min(created.get(model, recorded_at), recorded_at)
+        return max(created, key=created.get) if created else None
+
+    def export_artifact(self, path):
+        """Write the compact metrics file the tracker UI reads"""
+        atomic_write_text(path, json.dumps({'models': self.metrics()}, separators=(',', ':')))
+
+def recompute_metrics(log_path=DEFAULT_LOG_PATH):
+    """Recompute every metric from the full log in one vectorized pass"""
+    predictions, results = {}, {}
+    with open(log_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record['type'] == 'prediction':
+                predictions[(record['game_id'], record['model_version'])] = record
+            else:
+                results[record['game_id']] = record['home_won']
+
+    scored = [record for (gid, _), record in predictions.items() if gid in results]
+    if not scored:
+        return {}
+
+    p = np.array([record['home_win_probability'] for record in scored])
+    y = np.array([1.0 if results[record['game_id']] else 0.0 for record in scored])
+    clipped = np.clip(p, LOG_LOSS_EPSILON, 1 - LOG_LOSS_EPSILON)
+    correct = ((p > 0.5) == (y == 1)).astype(float)
+    brier = (p - y) ** 2
+    log_loss = -(y * np.log(clipped) + (1 - y) * np.log(1 - clipped))
+    bucket = np.minimum((p * CALIBRATION_BUCKETS).astype(int), CALIBRATION_BUCKETS - 1)
+
+    cells = {}
+    keys_by_record = [prediction_keys(record) for record in scored]
+    for d, dimension in enumerate(DIMENSIONS):
+        labels = [f"{record['model_version']}|{dimension}|{keys[d][1]}"
+                  for record, keys in zip(scored, keys_by_record)]
+        names, group = np.unique(labels, return_inverse=True)
+        groups = len(names)
+
+        n = np.bincount(group, minlength=groups)
+        sums = {name: np.bincount(group, weights=values, minlength=groups)
+                for name, values in (('correct', correct), ('brier', brier), ('log_loss', log_loss))}
+        calibration_index = group * CALIBRATION_BUCKETS + bucket
+        size = groups * CALIBRATION_BUCKETS
+        cal_n = np.bincount(calibration_index, minlength=size).reshape(groups, -1)
+        cal_p = np.bincount(calibration_index, weights=p, minlength=size).reshape(groups, -1)
+        cal_y = np.bincount(calibration_index, weights=y, minlength=size).reshape(groups, -1)
+
+        for g, name in enumerate(names):
+            cells[name] = {
+                'n': int(n[g]),
+                'correct': int(sums['correct'][g]),
+                'brier': float(sums['brier'][g]),
+                'log_loss': float(sums['log_loss'][g]),
+                'calibration': [[int(cal_n[g, b]), float(cal_p[g, b]), int(cal_y[g, b])]
+                                for b in range(CALIBRATION_BUCKETS)]
+            }
+
+    return summarize_cells(cells)
+
+def read_ndjson_predictions(path, model_version, registry=None, season=2025):
+    """Read predictions streamed from the Flask /predict_season endpoint
+    
+    Team names are canonicalized like read_results_csv's. The rows carry no
+    conference, so a game between two teams of the same conference (per
+    TeamRegistry) is filed under it; any other game stays Non-conference.
+    """
+    registry = registry or TeamRegistry()
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                prediction = json.loads(line)
+                prediction.setdefault('season', season)
+                prediction['model_version'] = model_version
+                prediction['home_team'] = registry.canonical_name(prediction['home_team'])
+                prediction['away_team'] = registry.canonical_name(prediction['away_team'])
+                if not prediction.get('conference'):
+                    home_conference = registry.conference(prediction['home_team'], None)
+                    if home_conference and home_conference == registry.conference(prediction['away_team'], None):
+                        prediction['conference'] = home_conference
+                yield prediction
+
+def read_results_csv(path, registry=None):
+    """Read final scores: season, week, home_team, away_team, home_points, away_points
+    
+    Team names are mapped to the app's canonical spellings so results line up
+    with the game ids of the predictions.
+    """
+    registry = registry or TeamRegistry()
+    with open(path, 'r', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            home_team = registry.canonical_name(row['home_team'])
+            away_team = registry.canonical_name(row['away_team'])
+            gid = game_id(int(row['season']), int(row['week']), home_team, away_team)
+            yield gid, float(row['home_points']) > float(row['away_points'])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prediction accuracy store")
+    parser.add_argument('--log', default=DEFAULT_LOG_PATH)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    add_predictions = subparsers.add_parser('add-predictions')
+    add_predictions.add_argument('path')
+    add_predictions.add_argument('--model', required=True,
+                                 help="version the predictions are filed under (e.g. a model file hash)")
+    add_results = subparsers.add_parser('add-results')
+    add_results.add_argument('path')
+    export = subparsers.add_parser('export')
+    export.add_argument('path')
+    subparsers.add_parser('recompute')
+    args = parser.parse_args()
+
+    if args.command == 'recompute':
+        print(json.dumps(recompute_metrics(args.log), indent=2))
+    else:
+        store = PredictionStore(args.log)
+        if args.command == 'add-predictions':
+            registry = TeamRegistry()
+            store.record_predictions(read_ndjson_predictions(args.path, args.model, registry))
+            registry.print_unresolved(args.path)
+        elif args.command == 'add-results':
+            registry = TeamRegistry()
+            store.record_results(read_results_csv(args.path, registry))
+            registry.print_unresolved(args.path)
+        elif args.command == 'export':
+            store.export_artifact(args.path)
+        store.save()
+        print(f"✅ {args.command} complete ({len(store.results)} games with results)")
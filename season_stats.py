@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Incremental season-stats aggregator
+
+Box scores are appended to a JSON-lines log. Running sums and counts per team
+and week are kept in a state file next to the log (with the log offset they
+cover), so ingesting a week only touches the games it adds. A box score for a
+game that is already in the log replaces it, and a retraction removes it;
+either way the old game is subtracted before anything is added.
+
+emit() rebuilds the per-game averages of the teams whose games changed and
+writes current_season_stats.json, the currentSeasonStats blocks of teams.json
+and the SQLite team_week_stats rows (season-to-date as of every affected week)
+in one pass.
+
+Box score (JSON list or NDJSON, one game per entry):
+    {"season": 2025, "week": 5, "home_team": "Utah", "away_team": "BYU",
+     "home": {"points": 24, "total_yards": 410, "passing_yards": 250, "rushing_yards": 160,
+              "turnovers": 1, "success_rate": 0.46, "explosiveness": 1.2},
+     "away": {...}}
+
+Usage:
+    python3 season_stats.py add box_scores_week5.json
+    python3 season_stats.py retract 2025_5_Utah_BYU
+    python3 season_stats.py emit
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+from build_utils import CFDB_DIR, REPO_DIR, atomic_write_text
+from prediction_store import game_id
+
+sys.path.insert(0, CFDB_DIR)
+from data_store import CURRENT_SEASON, DEFAULT_DB_PATH, CFBDataStore
+from team_registry import TeamRegistry
+
+DEFAULT_LOG_PATH = os.path.join(REPO_DIR, 'season_stats_log.jsonl')
+DEFAULT_STATS_JSON = os.path.join(REPO_DIR, 'current_season_stats.json')
+DEFAULT_TEAMS_JSON = os.path.join(REPO_DIR, 'teams.json')
+
+# Output stat -> (side the box-score field is read from, field). 'own' is the
+# team's row, 'opponent' the other team's row in the same game.
+AGGREGATED_STATS = {
+    'points_per_game': ('own', 'points'),
+    'points_allowed_per_game': ('opponent', 'points'),
+    'total_yards': ('own', 'total_yards'),
+    'total_yards_allowed': ('opponent', 'total_yards'),
+    'passing_yards': ('own', 'passing_yards'),
+    'rushing_yards': ('own', 'rushing_yards'),
+    'turnovers': ('own', 'turnovers'),
+    'takeaways': ('opponent', 'turnovers'),
+    'off_success_rate': ('own', 'success_rate'),
+    'def_success_rate': ('opponent', 'success_rate'),
+    'off_explosiveness': ('own', 'explosiveness'),
+    'def_explosiveness': ('opponent', 'explosiveness'),
+}
+
+def team_lines(game):
+    """(team, {stat: value}) for both sides of a box score"""
+    sides = {'home': (game['home'], game['away']), 'away': (game['away'], game['home'])}
+    for side, (own, opponent) in sides.items():
+        rows = {'own': own or {}, 'opponent': opponent or {}}
+        values = {}
+        for stat, (source, field) in AGGREGATED_STATS.items():
+            value = rows[source].get(field)
+            if isinstance(value, (int, float)):
+                values[stat] = float(value)
+        yield game[f'{side}_team'], values
+
+def new_week():
+    # Per stat: [games with a value, sum of values]
+    return {stat: [0, 0.0] for stat in AGGREGATED_STATS}
+
+class SeasonStatsAggregator:
+    def __init__(self, log_path=DEFAULT_LOG_PATH):
+        self.log_path = log_path
+        self.state_path = log_path + '.state.json'
+        self.log_offset = 0
+        self.games = {}       # game_id -> box score
+        self.team_weeks = {}  # season -> team -> week -> running sums
+        self.dirty = {}       # 'season|team' -> earliest changed week
+        self.load()
+
+    def load(self):
+        """Load saved sums, then replay only the log records written after them"""
+        if os.path.exists(self.state_path):
+            with open(self.state_path, 'r', encoding='utf-8') as file:
+                state = json.load(file)
+            self.log_offset = state['log_offset']
+            self.games = state['games']
+            self.team_weeks = state['team_weeks']
+            self.dirty = state['dirty']
+
+        if not os.path.exists(self.log_path):
+            return
+
+        with open(self.log_path, 'r', encoding='utf-8') as file:
+            file.seek(self.log_offset)
+            for line in iter(file.readline, ''):
+                if line.strip():
+                    self.apply_record(json.loads(line))
+            self.log_offset = file.tell()
+
+    def save(self):
+        state = {
+            'log_offset': self.log_offset,
+            'games': self.games,
+            'team_weeks': self.team_weeks,
+            'dirty': self.dirty
+        }
+        atomic_write_text(self.state_path, json.dumps(state))
+
+    def append(self, records):
+        with open(self.log_path, 'a', encoding='utf-8') as file:
+            for record in records:
+                file.write(json.dumps(record) + '\n')
+                self.apply_record(record)
+            self.log_offset = file.tell()
+
+    def record_box_scores(self, games, registry=None):
+        """Append box scores; a game already in the log is replaced (a correction)"""
+        registry = registry or TeamRegistry()
+        records = []
+        for game in games:
+            home_team = registry.canonical_name(game['home_team'])
+            away_team = registry.canonical_name(game['away_team'])
+            records.append({
+                'type': 'box_score',
+                'game_id': game_id(game['season'], game['week'], home_team, away_team),
+                'season': int(game['season']),
+                'week': int(game['week']),
+                'home_team': home_team,
+                'away_team': away_team,
+                'home': game.get('home', {}),
+                'away': game.get('away', {})
+            })
+        self.append(records)
+        return len(records)
+
+    def retract(self, game_ids):
+        """Remove games from the aggregates (e.g. a result recorded against the wrong teams)"""
+        self.append([{'type': 'retract', 'game_id': gid} for gid in game_ids if gid in self.games])
+
+    def apply_record(self, record):
+        gid = record['game_id']
+        if gid in self.games:
+            self.accumulate(self.games.pop(gid), -1)
+        if record['type'] == 'box_score':
+            self.games[gid] = record
+            self.accumulate(record, 1)
+
+    def accumulate(self, game, sign):
+        """Add (sign=1) or remove (sign=-1) one game from both teams' week sums"""
+        season, week = str(game['season']), str(game['week'])
+        for team, values in team_lines(game):
+            cells = self.team_weeks.setdefault(season, {}).setdefault(team, {}).setdefault(week, new_week())
+            for stat, value in values.items():
+                cells[stat][0] += sign
+                cells[stat][1] += sign * value
+            if sign < 0 and not any(count for count, _ in cells.values()):
+                # The team has no games left that week (or at all)
+                del self.team_weeks[season][team][week]
+                if not self.team_weeks[season][team]:
+                    del self.team_weeks[season][team]
+
+            key = f'{season}|{team}'
+            self.dirty[key] = min(self.dirty.get(key, game['week']), game['week'])
+
+    def season_to_date(self, season, team):
+        """[(week, {stat: per-game average})] after each week the team has games in"""
+        totals = new_week()
+        snapshots = []
+        for week, cells in sorted(self.team_weeks.get(str(season), {}).get(team, {}).items(),
+                                  key=lambda item: int(item[0])):
+            for stat, (games, value) in cells.items():
+                totals[stat][0] += games
+                totals[stat][1] += value
+            snapshots.append((int(week), {stat: round(value / games, 4)
+                                          for stat, (games, value) in totals.items() if games > 0}))
+        return snapshots
+
+    def emit(self, stats_json=DEFAULT_STATS_JSON, teams_json=DEFAULT_TEAMS_JSON, store=None, registry=None):
+        """Write changed teams' averages to both JSON files and the store; returns the teams written
+
+        The JSON files only carry CURRENT_SEASON; the store gets every season.
+        Stats the box scores do not cover (sp_rating, ...) are kept from the
+        existing files, and a team is written under every spelling each file
+        already uses for it. A team left with no games loses its aggregated
+        stats and its store rows.
+        """
+        by_season = {}
+        for key, first_week in self.dirty.items():
+            season, team = key.split('|', 1)
+            by_season.setdefault(int(season), []).append((team, first_week))
+
+        season_stats = {}
+        for season, teams in by_season.items():
+            week_rows = {}
+            for team, first_week in teams:
+                snapshots = self.season_to_date(season, team)
+                for week, averages in snapshots:
+                    if week >= first_week and averages:
+                        week_rows.setdefault(week, {})[team] = averages
+                if season == CURRENT_SEASON:
+                    season_stats[team] = snapshots[-1][1] if snapshots else {}
+            if store is not None:
+                # Rows from first_week on are rewritten, so retracted weeks do not linger
+                for team, first_week in teams:
+                    store.clear_team_stats(season, team, first_week)
+                for week, rows in sorted(week_rows.items()):
+                    store.load_team_stats(season, week, rows)
+
+        if not season_stats:
+            self.dirty = {}
+            return []
+
+        stats_data = {}
+        if os.path.exists(stats_json):
+            with open(stats_json, 'r', encoding='utf-8') as file:
+                stats_data = json.load(file)
+        teams_data = {}
+        if os.path.exists(teams_json):
+            with open(teams_json, 'r', encoding='utf-8') as file:
+                teams_data = json.load(file)
+
+        registry = registry or TeamRegistry()
+        stats_keys = registry.keys_by_team(stats_data)
+        teams_keys = registry.keys_by_team(teams_data)
+
+        last_updated = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        for team, averages in season_stats.items():
+            for key in stats_keys.get(team, [team]):
+                if averages:
+                    stats_data.setdefault(key, {}).update(averages)
+                elif key in stats_data and not reset_aggregates(stats_data[key]):
+                    del stats_data[key]
+
+            for key in teams_keys.get(team, []):
+                block = teams_data[key].setdefault('currentSeasonStats', {})
+                if averages:
+                    block.update(averages)
+                else:
+                    reset_aggregates(block)
+                block['last_updated'] = last_updated
+
+        atomic_write_text(stats_json, json.dumps(stats_data, indent=2))
+        atomic_write_text(teams_json, json.dumps(teams_data, indent=2))
+        self.dirty = {}
+        return sorted(season_stats)
+
+def reset_aggregates(stats):
+    """Drop the stats the box scores produce from a team left with no games; returns the block"""
+    for stat in AGGREGATED_STATS:
+        stats.pop(stat, None)
+    return stats
+
+def read_box_scores(path):
+    """Box scores from a JSON list or NDJSON file"""
+    with open(path, 'r', encoding='utf-8') as file:
+        if path.endswith(('.jsonl', '.ndjson')):
+            return [json.loads(line) for line in file if line.strip()]
+        return json.load(file)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incremental season-stats aggregator")
+    parser.add_argument('--log', default=DEFAULT_LOG_PATH)
+    parser.add_argument('--stats-json', default=DEFAULT_STATS_JSON)
+    parser.add_argument('--teams-json', default=DEFAULT_TEAMS_JSON)
+    parser.add_argument('--db', default=DEFAULT_DB_PATH)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    add = subparsers.add_parser('add', help="ingest box scores and emit")
+    add.add_argument('path')
+    retract = subparsers.add_parser('retract', help="remove games by id and emit")
+    retract.add_argument('game_ids', nargs='+')
+    subparsers.add_parser('emit', help="write any pending changes")
+    args = parser.parse_args()
+
+    aggregator = SeasonStatsAggregator(args.log)
+    if args.command == 'add':
+        registry = TeamRegistry()
+        count = aggregator.record_box_scores(read_box_scores(args.path), registry)
+        registry.print_unresolved(args.path)
+        print(f"✓ {count} box scores from {args.path}")
+    elif args.command == 'retract':
+        aggregator.retract(args.game_ids)
+
+    store = CFBDataStore(args.db)
+    teams = aggregator.emit(args.stats_json, args.teams_json, store, TeamRegistry())
+    aggregator.save()
+    store.print_unknown_teams(args.log)
+    print(f"✅ {len(teams)} teams updated ({len(aggregator.games)} games in the season log)")
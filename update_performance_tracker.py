@@ -3,12 +3,27 @@
 Script to update performance_tracker.js with real Week 1 games from the 2025 schedule
 """
 
+import os
 import re
-import random
+import sys
 
-def extract_week1_games_from_app_js(app_js_path):
-    """Extract Week 1 games from app.js"""
+from build_utils import CFDB_DIR, DEFAULT_APP_DIR, atomic_write_text
+from prediction_store import PredictionStore, game_id
+
+sys.path.insert(0, CFDB_DIR)
+from team_registry import TeamRegistry
+
+SEASON = 2025
+
+def extract_week1_games_from_app_js(app_js_path, store, model_version=None, registry=None):
+    """Extract Week 1 games from app.js that have a logged prediction and result
+    
+    app.js spellings are mapped to canonical team names to build the game ids
+    the store logs predictions and results under.
+    """
     week1_games = []
+    model_version = model_version or store.latest_model_version()
+    registry = registry or TeamRegistry()
     
     with open(app_js_path, 'r', encoding='utf-8') as file:
         content = file.read()
@@ -25,17 +40,18 @@ def extract_week1_games_from_app_js(app_js_path):
         games = re.findall(game_pattern, week1_content, re.DOTALL)
         
         for home, away in games:
-            # Generate realistic prediction data
-            home_win_prob = round(random.uniform(0.2, 0.8), 2)
-            confidence = round(random.uniform(0.5, 0.9), 2)
-            correct = random.choice([True, False])
+            gid = game_id(SEASON, 1, registry.canonical_name(home), registry.canonical_name(away))
+            prediction = store.predictions.get(gid, {}).get(model_version)
+            if prediction is None or gid not in store.results:
+                continue
             
+            home_win_prob = prediction['home_win_probability']
             week1_games.append({
                 'home': home,
                 'away': away,
-                'homeWinProb': home_win_prob,
-                'confidence': confidence,
-                'correct': correct
+                'homeWinProb': round(home_win_prob, 2),
+                'confidence': round(max(home_win_prob, 1 - home_win_prob), 2),
+                'correct': (home_win_prob > 0.5) == store.results[gid]
             })
     
     return week1_games
@@ -57,19 +73,21 @@ def update_performance_tracker(performance_tracker_path, week1_games):
     
     # Find and replace the week1Games array
     pattern = r"const week1Games = \[.*?\];"
-    new_content = re.sub(pattern, games_js, content, flags=re.DOTALL)
+    new_content = re.sub(pattern, lambda _: games_js.lstrip(), content, flags=re.DOTALL)
     
-    with open(performance_tracker_path, 'w', encoding='utf-8') as file:
-        file.write(new_content)
+    atomic_write_text(performance_tracker_path, new_content)
     
     return len(week1_games)
 
 if __name__ == "__main__":
-    app_js_file = "/Users/jeff/NCAA Stats/college-football-app/app.js"
-    performance_tracker_file = "/Users/jeff/NCAA Stats/college-football-app/performance_tracker.js"
+    app_js_file = os.path.join(DEFAULT_APP_DIR, "app.js")
+    performance_tracker_file = os.path.join(DEFAULT_APP_DIR, "performance_tracker.js")
+    metrics_file = os.path.join(DEFAULT_APP_DIR, "performance_metrics.json")
+    
+    store = PredictionStore()
     
     print("Extracting Week 1 games from real 2025 schedule...")
-    week1_games = extract_week1_games_from_app_js(app_js_file)
+    week1_games = extract_week1_games_from_app_js(app_js_file, store)
     
     print(f"Found {len(week1_games)} Week 1 games")
     
@@ -77,3 +95,7 @@ if __name__ == "__main__":
     game_count = update_performance_tracker(performance_tracker_file, week1_games)
     
     print(f"✅ Successfully updated performance tracker with {game_count} real Week 1 games!")
+    
+    store.export_artifact(metrics_file)
+    store.save()
+    print(f"✅ Wrote accuracy metrics to {metrics_file}")
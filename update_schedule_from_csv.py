@@ -3,46 +3,42 @@
 Script to update app.js with the real 2025 college football schedule from CSV
 """
 
-import csv
 import json
+import os
+import random
 import re
+import sys
 from collections import defaultdict
 
-def parse_csv_schedule(csv_file_path):
-    """Parse the 2025 schedule CSV and organize by week"""
+from build_utils import CFDB_DIR, DEFAULT_APP_DIR, DEFAULT_SCHEDULE_CSV, atomic_write_text
+
+sys.path.insert(0, CFDB_DIR)
+from schedule_check import enforce_schedule, read_schedule_csv
+from team_registry import TeamRegistry
+
+def parse_csv_schedule(csv_file_path, registry=None):
+    """Parse the 2025 schedule CSV and organize by week, with canonical team names
+    
+    Every game is listed by both teams in the CSV; the schedule check keeps one
+    listing per game and drops double bookings and repeated matchups.
+    """
     schedule_by_week = defaultdict(list)
+    registry = registry or TeamRegistry()
     
-    with open(csv_file_path, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        
-        for row in reader:
-            team = row['Team'].strip()
-            week = int(row['Week'])
-            opponent = row['Opponent'].strip()
-            home_away = row['Home_Away'].strip()
-            location = row['Location'].strip()
-            
-            # Create game object
-            if home_away == 'Home':
-                game = {
-                    'home': team,
-                    'away': opponent,
-                    'location': f"{team} Stadium",  # We'll enhance this later
-                    'time': 'TBD',  # We'll add realistic times
-                    'tv': 'TBD',    # We'll add realistic TV networks
-                    'date': f'Week {week}'
-                }
-            else:  # Away
-                game = {
-                    'home': opponent,
-                    'away': team,
-                    'location': f"{opponent} Stadium",  # We'll enhance this later
-                    'time': 'TBD',  # We'll add realistic times
-                    'tv': 'TBD',    # We'll add realistic TV networks
-                    'date': f'Week {week}'
-                }
-            
-            schedule_by_week[week].append(game)
+    listings = [dict(game, home=registry.canonical_name(game['home']), away=registry.canonical_name(game['away']))
+                for game in read_schedule_csv(csv_file_path)]
+    games, _ = enforce_schedule(listings, csv_file_path, registry, listed_by_both=True)
+    
+    for game in games:
+        week = game['week']
+        schedule_by_week[week].append({
+            'home': game['home'],
+            'away': game['away'],
+            'location': f"{game['home']} Stadium",  # We'll enhance this later
+            'time': 'TBD',  # We'll add realistic times
+            'tv': 'TBD',    # We'll add realistic TV networks
+            'date': f'Week {week}'
+        })
     
     return schedule_by_week
 
@@ -117,7 +113,7 @@ def enhance_game_details(games):
         'Vanderbilt': 'FirstBank Stadium, Nashville, TN',
         'Missouri': 'Faurot Field, Columbia, MO',
         'Texas A&M': 'Kyle Field, College Station, TX',
-        'Ole Miss': 'Vaught-Hemingway Stadium, Oxford, MS',
+        'Mississippi': 'Vaught-Hemingway Stadium, Oxford, MS',
         'Mississippi State': 'Davis Wade Stadium, Starkville, MS',
         'Arkansas': 'Reynolds Razorback Stadium, Fayetteville, AR'
     }
@@ -132,10 +128,10 @@ def enhance_game_details(games):
         else:
             game['location'] = f"{game['home']} Stadium"
         
-        # Add realistic time and TV
-        import random
-        game['time'] = random.choice(game_times)
-        game['tv'] = random.choice(tv_networks)
+        # Add realistic time and TV, seeded per game so rebuilds are reproducible
+        rng = random.Random(f"{game['home']}_{game['away']}_{game['date']}")
+        game['time'] = rng.choice(game_times)
+        game['tv'] = rng.choice(tv_networks)
     
     return games
 
@@ -180,7 +176,11 @@ def update_app_js(csv_file_path, app_js_path):
     """Update app.js with the real schedule data"""
     
     print("Parsing 2025 schedule CSV...")
-    schedule_by_week = parse_csv_schedule(csv_file_path)
+    registry = TeamRegistry()
+    schedule_by_week = parse_csv_schedule(csv_file_path, registry)
+    registry.print_unresolved("the schedule CSV")
+    if not schedule_by_week:
+        raise ValueError(f"No games parsed from {csv_file_path}; {app_js_path} left unchanged")
     
     print(f"Found {len(schedule_by_week)} weeks of games")
     for week in sorted(schedule_by_week.keys()):
@@ -195,17 +195,21 @@ def update_app_js(csv_file_path, app_js_path):
     
     print("Replacing schedule function...")
     # Find and replace the generateDetailedSchedule function
-    pattern = r'generateDetailedSchedule\(\)\s*\{[^}]*\}'
-    new_content = re.sub(pattern, js_schedule_function, app_js_content, flags=re.DOTALL)
+    # Match through "return schedule; }" so a previously generated body (which
+    # contains nested braces) is replaced whole and reruns are idempotent
+    pattern = r'generateDetailedSchedule\(\)\s*\{.*?return schedule;\s*\}'
+    new_content, replaced = re.subn(pattern, lambda _: js_schedule_function.lstrip(), app_js_content, count=1,
+                                    flags=re.DOTALL)
+    if not replaced:
+        raise ValueError(f"No generateDetailedSchedule() function in {app_js_path}; it was left unchanged")
     
     print("Writing updated app.js...")
-    with open(app_js_path, 'w', encoding='utf-8') as file:
-        file.write(new_content)
+    atomic_write_text(app_js_path, new_content)
     
     print("✅ Successfully updated app.js with real 2025 schedule!")
 
 if __name__ == "__main__":
-    csv_file = "/Users/jeff/NCAA Stats/2025_college_football_schedules.csv"
-    app_js_file = "/Users/jeff/NCAA Stats/college-football-app/app.js"
+    csv_file = DEFAULT_SCHEDULE_CSV
+    app_js_file = os.path.join(DEFAULT_APP_DIR, "app.js")
     
     update_app_js(csv_file, app_js_file)
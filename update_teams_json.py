@@ -4,8 +4,11 @@ Script to update teams.json with the 2025 teams from the schedule
 """
 
 import json
+import os
 import re
 
+from build_utils import DEFAULT_APP_DIR, atomic_write_text
+
 def extract_teams_from_app_js(app_js_path):
     """Extract all unique team names from the app.js schedule"""
     teams = set()
@@ -29,7 +32,18 @@ def extract_teams_from_app_js(app_js_path):
     return teams
 
 def create_teams_json(teams, output_path):
-    """Create a new teams.json file with the 2025 teams"""
+    """Create a new teams.json file with the 2025 teams
+    
+    Refuses to write an empty list, and refuses to replace a teams.json in
+    the app's per-team format, whose ratings and stats would be lost.
+    """
+    if not teams:
+        raise ValueError(f"No teams to write; {output_path} left unchanged")
+    if os.path.exists(output_path):
+        with open(output_path, 'r', encoding='utf-8') as file:
+            existing = json.load(file)
+        if 'teams' not in existing:
+            raise ValueError(f"{output_path} holds per-team ratings and stats; not replacing it")
     
     # Create a simple structure with just team names
     teams_data = {
@@ -49,14 +63,13 @@ def create_teams_json(teams, output_path):
             }
         })
     
-    with open(output_path, 'w', encoding='utf-8') as file:
-        json.dump(teams_data, file, indent=2)
+    atomic_write_text(output_path, json.dumps(teams_data, indent=2))
     
     return len(teams)
 
 if __name__ == "__main__":
-    app_js_file = "/Users/jeff/NCAA Stats/college-football-app/app.js"
-    teams_json_file = "/Users/jeff/NCAA Stats/college-football-app/teams.json"
+    app_js_file = os.path.join(DEFAULT_APP_DIR, "app.js")
+    teams_json_file = os.path.join(DEFAULT_APP_DIR, "teams.json")
     
     print("Extracting teams from 2025 schedule...")
     teams = extract_teams_from_app_js(app_js_file)